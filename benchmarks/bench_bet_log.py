@@ -0,0 +1,87 @@
+"""
+Benchmarks bet log lookups: the old full read of logged_bets.txt per lookup against the per-day
+BetLog and SqliteBetLog.
+
+A cycle looks up every candidate bet twice (today and yesterday), as process_new_bet does. The
+history is spread over a year of days; only today's and yesterday's partitions are read.
+
+Run from the repository root: python -m benchmarks.bench_bet_log
+"""
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.bet_log import BetLog, SqliteBetLog
+
+CANDIDATES = 300
+DAYS = 365
+
+
+def is_bet_logged_old(log_file, date_game):
+    # main.is_bet_logged before the bet log: the whole file per lookup
+    if not os.path.exists(log_file):
+        return False
+    with open(log_file, 'r') as f:
+        logged_bets = f.read().splitlines()
+    return date_game in logged_bets
+
+
+def make_history(directory, bets_per_day):
+    days = [(date(2025, 1, 1) + timedelta(days=i)).strftime("%m/%d/%Y") for i in range(DAYS)]
+    log_file = os.path.join(directory, "logged_bets.txt")
+    with open(log_file, "w") as f:
+        for day in days:
+            f.write("".join(f"{day}-42.{i}:{i}\n" for i in range(bets_per_day)))
+    return days, log_file
+
+
+def cycle(is_logged, today, yesterday):
+    return sum(1 for i in range(CANDIDATES)
+               if not is_logged(today, f"42.{i}:{i}") and not is_logged(yesterday, f"42.{i}:{i}"))
+
+
+def main():
+    print(f"{CANDIDATES} candidates per cycle, {DAYS} days of history")
+    print(f"{'log lines':>10} {'old (ms)':>9} {'per day startup (ms)':>21} {'per day (ms)':>13} "
+          f"{'sqlite startup (ms)':>20} {'sqlite (ms)':>12}")
+    for bets_per_day in (10, 100):
+        with tempfile.TemporaryDirectory() as directory:
+            days, log_file = make_history(directory, bets_per_day)
+            yesterday, today = days[-2], days[-1]
+            with open(log_file) as f:
+                legacy = f.read()
+
+            start = time.perf_counter()
+            old_count = cycle(lambda day, key: is_bet_logged_old(log_file, f"{day}-{key}"), today, yesterday)
+            old = time.perf_counter() - start
+
+            BetLog(os.path.join(directory, "days"), legacy_file=log_file)  # one-time migration
+            start = time.perf_counter()
+            bet_log = BetLog(os.path.join(directory, "days"))
+            count = cycle(bet_log.is_logged, today, yesterday)
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            cycle(bet_log.is_logged, today, yesterday)
+            per_day = time.perf_counter() - start
+            assert count == old_count
+
+            with open(log_file, "w") as f:
+                f.write(legacy)
+            SqliteBetLog(os.path.join(directory, "bets.db"), legacy_file=log_file).close()
+            start = time.perf_counter()
+            sqlite_log = SqliteBetLog(os.path.join(directory, "bets.db"))
+            count = cycle(sqlite_log.is_logged, today, yesterday)
+            sqlite_first = time.perf_counter() - start
+            start = time.perf_counter()
+            cycle(sqlite_log.is_logged, today, yesterday)
+            sqlite = time.perf_counter() - start
+            sqlite_log.close()
+            assert count == old_count
+
+            print(f"{DAYS * bets_per_day:>10} {old * 1e3:>9.1f} {first * 1e3:>21.2f} {per_day * 1e3:>13.2f} "
+                  f"{sqlite_first * 1e3:>20.2f} {sqlite * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmarks a league's scan cycle after matching: devigging, filtering (is_good_bet) and materializing its bets.
+
+Compares rank_good_bets, which does it for every row on every cycle, with DeltaEngine.apply, which
+only does it for the rows whose prices moved since the last cycle. Each cycle moves the FanDuel odds
+of a share of the rows (the churn); the slate is NCAAB totals, most of them positive EV.
+
+Run from the repository root: python -m benchmarks.bench_delta_engine
+"""
+import random
+import time
+
+from goodbets import good_bet_rows, rank_good_bets
+from src.delta_engine import DeltaEngine
+from src.wager import OverUnder
+from src.wager_table import WagerTable
+
+CYCLES = 20
+
+
+def make_table(fanduel_odds):
+    table = WagerTable()
+    for i, odds in enumerate(fanduel_odds):
+        table.add_total_points(f"Away {i} @ Home {i}", odds, -130, 2000, OverUnder.OVER, 140.5 + i % 40,
+                               100, f"42.{i}", 1000 + i, "NCAAB")
+    return table
+
+
+def make_cycles(n, churn):
+    rng = random.Random(n)
+    odds = [rng.choice((-120, 105, 110, 115)) for _ in range(n)]
+    cycles = []
+    for _ in range(CYCLES):
+        for i in rng.sample(range(n), int(n * churn)):
+            odds[i] = rng.choice((-120, 105, 110, 115))
+        cycles.append(make_table(odds))
+    return cycles
+
+
+def main():
+    print(f"{'rows':>6} {'churn':>6} {'full (ms/cycle)':>16} {'delta (ms/cycle)':>17}")
+    for n in (1000, 5000):
+        for churn in (0.01, 0.05, 0.25):
+            cycles = make_cycles(n, churn)
+
+            start = time.perf_counter()
+            for table in cycles[1:]:
+                rank_good_bets(table, good_only=True)
+            full = (time.perf_counter() - start) / (CYCLES - 1)
+
+            # The first cycle evaluates every row; the rest are what a running scan pays
+            engine = DeltaEngine()
+            engine.apply("NCAAB", cycles[0], select=good_bet_rows)
+            start = time.perf_counter()
+            for table in cycles[1:]:
+                engine.apply("NCAAB", table, select=good_bet_rows)
+            delta = (time.perf_counter() - start) / (CYCLES - 1)
+
+            print(f"{n:>6} {churn:>6.0%} {full * 1e3:>16.2f} {delta * 1e3:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmarks process_fanduel_markets with and without the consumer's market type filter on the NHL
+and NBA fixtures.
+
+The fixtures are processed results, so the raw markets are rebuilt from them: every market entry
+becomes a market with its runners' odds nested the way FanDuel sends them. Events can be
+multiplied to get a slate-sized payload. Reports the time per call and the memory held by the
+processed result, and checks that match_wagers sees the same markets either way.
+
+Run from the repository root: python -m benchmarks.bench_fanduel_filter
+"""
+import json
+import time
+import tracemalloc
+
+from src.scrape import MarketTypeFilter, process_fanduel_markets
+
+FIXTURES = ("nhl", "nba")
+RUNS = 50
+
+# Mirrors goodbets.FANDUEL_MARKET_TYPES; goodbets can't be imported without Sheets credentials
+MARKET_TYPES = MarketTypeFilter(
+    names=["MONEY_LINE", "MATCH_BETTING", "WIN-DRAW-WIN", "MATCH_HANDICAP_(2-WAY)", "TOTAL_POINTS_(OVER/UNDER)",
+           "ANY_TIME_GOAL_SCORER", "FIRST_TOUCHDOWN_SCORER", "ANY_TIME_TOUCHDOWN_SCORER"],
+    patterns=[r"TO_RECORD_\d+\+_ASSISTS", r"\d+\+_MADE_THREES", r"TO_SCORE_\d+\+_POINTS",
+              r"TO_SCORE_\d+\+_REBOUNDS", r"PLAYERS_WITH_\d+\+_YARDS_RECEPTION"],
+)
+
+
+def rebuild_payload(processed, multiplier=1):
+    markets = {}
+    events = {}
+    for copy in range(multiplier):
+        for event_id, entry in processed.items():
+            event_id = int(event_id) + copy * 10 ** 9
+            events[event_id] = {"name": entry["name"]}
+            for market in entry.get("markets", []):
+                market_id = f"{market['externalMarketId']}.{copy}"
+                markets[market_id] = {
+                    "eventId": event_id,
+                    "marketType": market["marketType"],
+                    "associatedMarkets": [{"externalMarketId": market_id}],
+                    "runners": [{"selectionId": runner["selectionId"], "handicap": runner["handicap"],
+                                 "runnerName": runner["runnerName"],
+                                 "winRunnerOdds": {"americanDisplayOdds": {"americanOdds": runner["winRunnerOdds"]}}}
+                                for runner in market["runners"]],
+                }
+    return markets, events
+
+
+def ingest(markets, events, market_types):
+    result = {event_id: dict(entry) for event_id, entry in events.items()}
+    process_fanduel_markets(markets, set(events), result, "LEAGUE", market_types)
+    return result
+
+
+def held(markets, events, market_types):
+    # Bytes still allocated by the processed result once ingestion returns
+    tracemalloc.start()
+    result = ingest(markets, events, market_types)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def timed(function):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        function()
+    return (time.perf_counter() - start) / RUNS
+
+
+def main():
+    print(f"{'fixture':>8} {'events':>7} {'markets':>8} {'kept':>5} {'all (ms)':>9} {'filtered (ms)':>14} "
+          f"{'all (KiB)':>10} {'filtered (KiB)':>15}")
+    for fixture in FIXTURES:
+        with open(f"src/example_json/example_fanduel_{fixture}.json") as f:
+            markets, events = rebuild_payload(json.load(f), multiplier=25)
+
+        everything = ingest(markets, events, None)
+        filtered = ingest(markets, events, MARKET_TYPES)
+        kept = sum(len(entry["markets"]) for entry in filtered.values())
+        for event_id, entry in everything.items():
+            assert filtered[event_id]["markets"] == [
+                market for market in entry["markets"] if market["marketType"] in MARKET_TYPES]
+
+        full = timed(lambda: ingest(markets, events, None))
+        trimmed = timed(lambda: ingest(markets, events, MARKET_TYPES))
+        print(f"{fixture:>8} {len(events):>7} {len(markets):>8} {kept:>5} {full * 1e3:>9.2f} {trimmed * 1e3:>14.2f} "
+              f"{held(markets, events, None) / 1024:>10.0f} {held(markets, events, MARKET_TYPES) / 1024:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmarks process_fanduel_rows per league on the FanDuel fixtures.
+
+The fixtures are processed results, so the attachments are rebuilt from them: each event gets its
+name back with a team code in parentheses and an openDate a few hours ahead, and every event is a
+row. Compares the previous per-row walk with the event preprocessor, cold (empty cache, as in the
+first cycle) and warm (events seen in the previous cycle).
+
+Run from the repository root: python -m benchmarks.bench_fanduel_rows
+"""
+import datetime
+import glob
+import json
+import os
+import re
+import time
+
+from src.scrape import FANDUEL_EVENT_CACHE, process_fanduel_rows
+
+RUNS = 200
+
+
+def process_fanduel_rows_old(rows, data, shorten_names=False, window_hours=24):
+    # process_fanduel_rows before events were preprocessed: two attachment walks, a regex compile
+    # lookup and a now() per row
+    result = {}
+    seen_event_ids = set()
+    for row in rows:
+        event_id = row.get("eventId")
+        if event_id:
+            name = data.get("attachments", {}).get(
+                "events", {}).get(str(event_id), {}).get("name")
+            date = data.get("attachments", {}).get(
+                "events", {}).get(str(event_id), {}).get("openDate")
+            if (" @ " in name or " v " in name):
+                name = re.sub(r' \([^)]*\)', '', name)  # Remove anything in parentheses
+                if shorten_names:
+                    if " @ " in name:
+                        name = name.split(" @ ")[0].split(" ")[-1] + " @ " + \
+                            name.split(" @ ")[1].split(" ")[-1]
+                    elif " v " in name:
+                        name = name.split(" v ")[0].split(" ")[-1] + " v " + \
+                            name.split(" v ")[1].split(" ")[-1]
+                event_date = datetime.datetime.fromisoformat(date.replace("Z", "+00:00"))
+                now = datetime.datetime.now(datetime.timezone.utc)
+                if now < event_date < (now + datetime.timedelta(hours=window_hours)):
+                    result[event_id] = {"name": name, "start_time": event_date.timestamp()}
+                    seen_event_ids.add(event_id)
+    return result, seen_event_ids
+
+
+def rebuild_payload(processed, multiplier=1):
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=3)
+    events = {}
+    for copy in range(multiplier):
+        for event_id, entry in processed.items():
+            event_id = str(int(event_id) + copy * 10 ** 9)
+            separator = " @ " if " @ " in entry["name"] else " v "
+            away, home = entry["name"].split(separator)
+            events[event_id] = {"name": f"{away} (A){separator}{home} (H)",
+                                "openDate": start.strftime("%Y-%m-%dT%H:%M:%S.000Z")}
+    rows = [{"eventId": int(event_id)} for event_id in events]
+    return rows, {"attachments": {"events": events}}
+
+
+def timed(function):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        function()
+    return (time.perf_counter() - start) / RUNS
+
+
+def main():
+    print(f"{'league':>16} {'events':>7} {'old (us)':>9} {'cold (us)':>10} {'warm (us)':>10}")
+    for path in sorted(glob.glob("src/example_json/example_fanduel_*.json")):
+        league = os.path.basename(path)[len("example_fanduel_"):-len(".json")]
+        with open(path) as f:
+            rows, data = rebuild_payload(json.load(f), multiplier=10)
+        if not rows:
+            continue
+
+        expected = process_fanduel_rows_old(rows, data)[0]
+        result = process_fanduel_rows(rows, data)[0]
+        assert {k: v["name"] for k, v in result.items()} == {k: v["name"] for k, v in expected.items()}
+
+        old = timed(lambda: process_fanduel_rows_old(rows, data))
+
+        def cold():
+            FANDUEL_EVENT_CACHE.clear()
+            process_fanduel_rows(rows, data)
+        warm = timed(lambda: process_fanduel_rows(rows, data))
+        print(f"{league:>16} {len(rows):>7} {old * 1e6:>9.0f} {timed(cold) * 1e6:>10.0f} {warm * 1e6:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
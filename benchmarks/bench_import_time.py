@@ -0,0 +1,47 @@
+"""
+Benchmarks module import times with python -X importtime.
+
+Each module is imported in a fresh interpreter (several times; the median is shown) and the
+cumulative time of its top-level import line is read from -X importtime's report. Modules an
+earlier import in the same process already loaded aren't counted again, as in the report.
+
+gspread and oauth2client are what importing src.sheet_operations used to cost on every launch,
+before it authorized and opened the spreadsheet over the network; now only the first sheet write
+pays for them (and for the network round trip, which isn't measured here).
+
+Run from the repository root: python -m benchmarks.bench_import_time
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+MODULES = ["src.sheet_operations", "src.bet_sinks", "src.sheet_writer", "goodbets",
+           "gspread", "oauth2client.service_account"]
+
+
+def import_times(module):
+    """
+    Returns {top-level module: cumulative microseconds} from one -X importtime run.
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    print(f"{'module':<30} {'import (ms)':>12}")
+    for module in MODULES:
+        times = [import_times(module).get(module, 0) for _ in range(RUNS)]
+        print(f"{module:<30} {statistics.median(times) / 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmarks LineHistory over a full day of fast polling on every league.
+
+A slate of markets is polled once a minute for 24 hours. Between polls a share of the prices move
+(Pinnacle more often than FanDuel) and games finish, their markets being replaced by new ones.
+Reports the time of record() per cycle and the memory the history holds (tracemalloc, in a second
+run of the same day) every few hours: it should level off at max_markets buffers, however long the
+polling goes on.
+
+Run from the repository root: python -m benchmarks.bench_line_history
+"""
+import random
+import statistics
+import time
+import tracemalloc
+
+from src.line_history import LineHistory
+from src.wager_table import WagerTable
+
+MARKETS = 10000
+CYCLES = 24 * 60
+CYCLE_SECONDS = 60
+MOVED_SHARE = 0.05
+# Markets replaced per cycle, as games finish and new ones are listed: the whole slate about every 2 hours
+REPLACED_PER_CYCLE = MARKETS // 120
+
+
+def make_table(rng):
+    table = WagerTable()
+    for i in range(MARKETS):
+        table.add_moneyline(f"Away {i} @ Home {i}", rng.randint(100, 200), -rng.randint(110, 200), 1000,
+                            "Home", "Away", 100, 0, f"42.{i // 2}", i, "NBA")
+    return table
+
+
+def simulate(trace):
+    """
+    Polls for a day, yielding (hour, markets kept, memory in MB or None, ms per record(), alerts) every
+    few hours. Tracing memory slows record() down, so times are only meaningful without it.
+    """
+    rng = random.Random(0)
+    table = make_table(rng)
+    now = [1_700_000_000.0]
+    history = LineHistory(clock=lambda: now[0])
+    next_id = MARKETS
+    times = []
+    alerts = 0
+    if trace:
+        tracemalloc.start()
+    for cycle in range(1, CYCLES + 1):
+        now[0] += CYCLE_SECONDS
+        for i in rng.sample(range(MARKETS), int(MARKETS * MOVED_SHARE)):
+            table.pinnacle_odds[i] -= rng.choice((-10, -5, 5, 10))
+            if rng.random() < 0.3:
+                table.fanduel_odds[i] += rng.choice((-10, 10))
+        for i in rng.sample(range(MARKETS), REPLACED_PER_CYCLE):
+            table.selection_id[i] = next_id
+            next_id += 1
+
+        start = time.perf_counter()
+        alerts += len(history.record("NBA", table))
+        times.append(time.perf_counter() - start)
+
+        if cycle % (4 * 60) == 0:
+            memory = tracemalloc.get_traced_memory()[0] / 1e6 if trace else None
+            yield cycle // 60, len(history), memory, statistics.mean(times) * 1e3, alerts
+            times = []
+    if trace:
+        tracemalloc.stop()
+
+
+def main():
+    print(f"{'hour':>5} {'markets':>8} {'memory (MB)':>12} {'record (ms/cycle)':>18} {'alerts':>7}")
+    # One day after the other: tracing mustn't be on while the other day is timed
+    timed_days = list(simulate(False))
+    for timed, traced in zip(timed_days, simulate(True)):
+        hour, markets, _, record_ms, alerts = timed
+        print(f"{hour:>5} {markets:>8} {traced[2]:>12.1f} {record_ms:>18.2f} {alerts:>7}")
+
+
+if __name__ == "__main__":
+    main()
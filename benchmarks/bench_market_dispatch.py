@@ -0,0 +1,137 @@
+"""
+Benchmarks process_markets throughput in markets per second.
+
+Compares the dispatch on pre-parsed market keys with the previous if/elif chain, which called
+market.get("key") and split it repeatedly and edited price dicts in place, and checks that both
+produce the same entries. Payloads are rebuilt from the NBA and NCAAB fixtures (see
+bench_specials), with props multiplied to get a prop-heavy night, with and without the half and
+quarter markets a live payload also carries.
+
+Run from the repository root: python -m benchmarks.bench_market_dispatch
+"""
+import copy
+import json
+import time
+
+from benchmarks.bench_specials import FIXTURES, rebuild_payloads
+from src.scrape import process_matchups, process_specials, process_markets
+
+# Runs per payload, alternating the chain and the dispatch so both see the same machine load
+RUNS = 100
+
+
+def process_markets_chain(markets_data, result, special_markets):
+    # process_markets before the key was parsed once: chained key comparisons, in-place price edits
+    for market in markets_data:
+        prices = market.get("prices")
+        if (market.get("key") == "s;0;m"
+            and (market.get("matchupId") in result)
+                and prices[0].get("points") is None):
+            market_info = {
+                "description": "moneyline",
+                "prices": prices,
+                "limit": market.get("limits", [{}])[0].get("amount")
+            }
+            result[market.get("matchupId")]["markets"].append(market_info)
+        elif market.get("key").startswith("s;0;tt;") and market.get("matchupId") in result and len(market.get("prices", [])) == 2:
+            parts = market.get("key").split(";")
+            if len(parts) == 5 and parts[4] in ["home", "away"]:
+                team = parts[4]
+                threshold = parts[3]
+                market_info = {
+                    "description": "team total",
+                    "team": team,
+                    "threshold": threshold,
+                    "prices": prices,
+                    "limit": market.get("limits", [{}])[0].get("amount")
+                }
+                result[market.get("matchupId")]["markets"].append(market_info)
+        elif market.get("key").startswith("s;0;s;") and market.get("matchupId") in result:
+            for price in prices:
+                if "points" in price:
+                    price["handicap"] = price.pop("points")
+                if "designation" in price:
+                    price["team"] = price.pop("designation")
+            market_info = {
+                "description": "handicap",
+                "prices": prices,
+                "limit": market.get("limits", [{}])[0].get("amount")
+            }
+            result[market.get("matchupId")]["markets"].append(market_info)
+
+        # Add processing for over/under markets
+        elif (((market.get("key") == "s;0;ou" and "points" in prices[0])
+                or (market.get("key") == "s;0;m" or market.get("key") == "s;1;m"))
+              and market.get("matchupId") in special_markets):
+            if len(prices) == 2:
+                existing_market = special_markets[market.get("matchupId")]
+                if prices[0].get("participantId", 0) > prices[1].get("participantId", 0):
+                    prices[0], prices[1] = prices[1], prices[0]
+                prices[0]["designation"] = "over" if market.get(
+                    "key") == "s;0;ou" else "odd" if market.get("key") == "s;1;m" else "yes"
+                prices[1]["designation"] = "under" if market.get(
+                    "key") == "s;0;ou" else "even" if market.get("key") == "s;1;m" else "no"
+                prices[0].pop("participantId")
+                prices[1].pop("participantId")
+                if market.get("key") != "s;0;ou" and "points" in prices[0]:
+                    prices[0].pop("points")
+                    prices[1].pop("points")
+                existing_market["prices"] = prices
+                existing_market["limit"] = market.get("limits", [{}])[0].get("amount")
+        # Add processing for total points markets
+        elif market.get("key").startswith("s;0;ou;") and market.get("matchupId") in result:
+            parts = market.get("key").split(";")
+            if len(parts) == 4 and len(prices) == 2:
+                threshold = parts[3]
+                market_info = {
+                    "description": "total points",
+                    "threshold": threshold,
+                    "prices": prices,
+                    "limit": market.get("limits", [{}])[0].get("amount")
+                }
+                result[market.get("matchupId")]["markets"].append(market_info)
+
+
+def parse(function, matchups, markets):
+    result = process_matchups(matchups, window_hours=None)
+    function(markets, result, process_specials(matchups, result))
+    return result
+
+
+def run_time(function, matchups, markets):
+    # Seconds taken by process_markets alone
+    result = process_matchups(matchups, window_hours=None)
+    special_markets = process_specials(matchups, result)
+    start = time.perf_counter()
+    function(markets, result, special_markets)
+    return time.perf_counter() - start
+
+
+def best_rates(matchups, markets):
+    # Markets per second of the fastest chain and dispatch runs
+    chain = dispatch = float("inf")
+    for _ in range(RUNS):
+        # The chain edits the payload, so it gets a fresh copy per run
+        chain = min(chain, run_time(process_markets_chain, matchups, copy.deepcopy(markets)))
+        dispatch = min(dispatch, run_time(process_markets, matchups, markets))
+    return len(markets) / chain, len(markets) / dispatch
+
+
+def main():
+    print(f"{'payload':>16} {'markets':>8} {'chain (markets/s)':>18} {'dispatch (markets/s)':>21} {'speedup':>8}")
+    for fixture in FIXTURES:
+        with open(f"src/example_json/example_pinnacle_{fixture}.json") as f:
+            processed = json.load(f)
+        for periods in (False, True):
+            matchups, markets = rebuild_payloads(processed, multiplier=4, periods=periods)
+            label = fixture + (" + periods" if periods else "")
+
+            expected = parse(process_markets_chain, matchups, copy.deepcopy(markets))
+            assert parse(process_markets, matchups, markets) == expected
+
+            chain, dispatch = best_rates(matchups, markets)
+            print(f"{label:>16} {len(markets):>8} {chain:>18,.0f} {dispatch:>21,.0f} {dispatch / chain:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
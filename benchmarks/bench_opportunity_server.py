@@ -0,0 +1,70 @@
+"""
+Benchmarks serving opportunities to many clients: encoding the snapshot per client against the
+OpportunityBoard, which encodes each record once and caches the unfiltered snapshot per version.
+
+A slate of BETS good bets is served to CLIENTS clients after every scan; each scan changes CHURN
+of the bets. Filtered clients (one league) join the pre-encoded records instead of re-encoding.
+
+Run from the repository root: python -m benchmarks.bench_opportunity_server
+"""
+import json
+import time
+
+from src.opportunity_server import OpportunityBoard, OpportunityFilter
+
+BETS = 600
+CLIENTS = 50
+SCANS = 20
+CHURN = 0.05
+LEAGUES = ["NBA", "NHL", "NFL", "NCAAB", "EPL", "UCL"]
+
+
+def make_records(scan):
+    records = []
+    for i in range(BETS):
+        moved = i < BETS * CHURN
+        records.append({"league": LEAGUES[i % len(LEAGUES)], "market": "Moneyline", "game": f"Away {i} @ Home {i}",
+                        "bet": f"Home {i} ML", "key": f"42.{i}:{i}", "market_id": f"42.{i}", "selection_id": i,
+                        "fanduel_odds": 150 + (scan if moved else 0), "pinnacle_odds": -120, "pinnacle_limit": 1000,
+                        "ev": 2.0 + i % 7, "risk_percentage": 1.0 + i % 11 / 10,
+                        "stakes": {"default": {"amount": 12.5, "units": 1.2}}})
+    return records
+
+
+def by_league(records):
+    leagues = {}
+    for record in records:
+        leagues.setdefault(record["league"], []).append(record)
+    return leagues
+
+
+def main():
+    league_filter = OpportunityFilter(["NBA"])
+    scans = [by_league(make_records(scan)) for scan in range(SCANS)]
+
+    start = time.perf_counter()
+    for leagues in scans:
+        for client in range(CLIENTS):
+            records = [record for league in leagues.values() for record in league]
+            if client % 2:
+                records = [record for record in records if record["league"] == "NBA"]
+            json.dumps({"version": 0, "opportunities": sorted(
+                records, key=lambda record: record["risk_percentage"], reverse=True)}).encode()
+    per_client = time.perf_counter() - start
+
+    board = OpportunityBoard()
+    start = time.perf_counter()
+    for leagues in scans:
+        for league, records in leagues.items():
+            board.update_league(league, records)
+        for client in range(CLIENTS):
+            board.snapshot(league_filter if client % 2 else None)
+    shared = time.perf_counter() - start
+
+    print(f"{BETS} bets, {CLIENTS} clients (half filtered to one league), {SCANS} scans, {CHURN:.0%} churn")
+    print(f"encode per client: {per_client * 1e3:.0f} ms, board: {shared * 1e3:.0f} ms "
+          f"({board.version} deltas encoded once)")
+
+
+if __name__ == "__main__":
+    main()
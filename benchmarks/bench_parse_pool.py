@@ -0,0 +1,108 @@
+"""
+Benchmarks the parse stage of a full cycle, on the scan thread and in a ParsePool, when many
+league payloads arrive at once.
+
+The fixtures are processed results, so the raw payloads are rebuilt from them (see
+bench_specials and bench_fanduel_filter) and served as response bytes by a fake request
+function: Pinnacle NBA and NCAAB with their props and period markets, FanDuel NBA and NHL with
+all their markets. Each fixture is multiplied to a slate-sized payload and the set of four is
+repeated as if LEAGUES_PER_CYCLE leagues came back together. Downloads take no time here, so
+the numbers are the parse cost alone; in the app it overlaps with the next league's download.
+
+Parse workers only help with more than one core: the table goes up to os.cpu_count().
+
+Run from the repository root: python -m benchmarks.bench_parse_pool
+"""
+import datetime
+import json
+import os
+import time
+
+from benchmarks.bench_fanduel_filter import MARKET_TYPES, rebuild_payload as rebuild_fanduel_markets
+from benchmarks.bench_specials import rebuild_payloads as rebuild_pinnacle_payloads
+from src.parse_pool import ParsePool, parsed
+from src.scrape import fanduel_nba, fanduel_nhl, pinnacle_nba, pinnacle_ncaab
+
+LEAGUES_PER_CYCLE = 16
+MULTIPLIER = 10
+
+
+def pinnacle_bodies(fixture):
+    with open(f"src/example_json/example_pinnacle_{fixture}.json") as f:
+        processed = json.load(f)
+    matchups, markets = [], []
+    for copy in range(MULTIPLIER):
+        shifted = {str(int(matchup_id) + copy * 10 ** 7): entry for matchup_id, entry in processed.items()}
+        copy_matchups, copy_markets = rebuild_pinnacle_payloads(shifted, periods=True)
+        for matchup in copy_matchups:
+            if "parentId" in matchup:
+                matchup["id"] += copy * 10 ** 7
+        for market in copy_markets:
+            if market["matchupId"] >= 10 ** 9:
+                market["matchupId"] += copy * 10 ** 7
+        matchups += copy_matchups
+        markets += copy_markets
+    return {"matchups": json.dumps(matchups).encode(), "markets": json.dumps(markets).encode()}
+
+
+def fanduel_body(fixture, coupon):
+    with open(f"src/example_json/example_fanduel_{fixture}.json") as f:
+        markets, events = rebuild_fanduel_markets(json.load(f), MULTIPLIER)
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=3)
+    for event in events.values():
+        event["openDate"] = start.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    data = {
+        "layout": {"coupons": {coupon: {"display": [{"rows": [{"eventId": event_id} for event_id in events]}]}}},
+        "attachments": {"events": {str(event_id): event for event_id, event in events.items()},
+                        "markets": markets},
+    }
+    return json.dumps(data).encode()
+
+
+class FakeRequest:
+    # Serves canned response bodies, decoded like get_response unless raw
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def __call__(self, url, headers, params=None, raw=False):
+        body = next(body for part, body in self.bodies.items() if part in url)
+        return body if raw else json.loads(body)
+
+
+def main():
+    nba, ncaab = pinnacle_bodies("nba"), pinnacle_bodies("ncaab")
+    jobs = [
+        (pinnacle_nba, FakeRequest(nba), {}),
+        (pinnacle_ncaab, FakeRequest(ncaab), {}),
+        (fanduel_nba, FakeRequest({"": fanduel_body("nba", "32866")}), {"market_types": MARKET_TYPES}),
+        (fanduel_nhl, FakeRequest({"": fanduel_body("nhl", "35876")}), {"market_types": MARKET_TYPES}),
+    ] * (LEAGUES_PER_CYCLE // 4)
+    size = sum(len(body) for _, request, _ in jobs[:4] for body in request.bodies.values())
+    print(f"{len(jobs)} payloads per cycle, {size * len(jobs) // 4 / 2 ** 20:.1f} MiB of JSON, "
+          f"{os.cpu_count()} cores")
+
+    start = time.perf_counter()
+    expected = [fetcher(request=request, **kwargs) for fetcher, request, kwargs in jobs]
+    serial = time.perf_counter() - start
+    print(f"{'workers':>8} {'cycle (s)':>10} {'speedup':>8}")
+    print(f"{'none':>8} {serial:>10.3f} {1:>8.2f}")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        pool = ParsePool(workers)
+        # Warm up the worker processes
+        fetcher, request, kwargs = jobs[0]
+        for future in [pool.fetch(fetcher, request, **kwargs) for _ in range(workers)]:
+            parsed(future)
+        start = time.perf_counter()
+        futures = [pool.fetch(fetcher, request, **kwargs) for fetcher, request, kwargs in jobs]
+        results = [parsed(future) for future in futures]
+        pooled = time.perf_counter() - start
+        pool.close()
+        assert results == expected
+        print(f"{workers:>8} {pooled:>10.3f} {serial / pooled:>8.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
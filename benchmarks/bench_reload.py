@@ -0,0 +1,62 @@
+"""
+Benchmarks the bet-update path of BettingGUI.reload_odds without Tk.
+
+Compares the old scan over every displayed bet (comparing pretty() strings) with the
+BetRegistry lookup by wager key. Frames are stand-in objects.
+
+Run from the repository root: python -m benchmarks.bench_reload
+"""
+import time
+
+from src.bet_registry import BetRegistry
+from src.wager import OverUnder
+from src.wager_table import WagerTable
+
+
+def make_bets(n):
+    table = WagerTable()
+    for i in range(n):
+        table.add_total_points(f"Away {i} @ Home {i}", -110, -105, 2000, OverUnder.OVER, 200.5 + i % 40,
+                               -115, f"42.{i}", 1000 + i, "NCAAB")
+    return [table.wager(i) for i in range(n)]
+
+
+def reload_scan(bet_data, good_bets):
+    for wager in good_bets:
+        for frame, data in list(bet_data.items()):
+            if data[1] == wager.pretty():
+                bet_data[frame] = [data[0], wager.pretty(), data[2]]
+                break
+
+
+def reload_indexed(bets, good_bets):
+    for wager in good_bets:
+        if bets.frame(wager.key) is not None:
+            bets.update(wager.key, ["", wager.pretty(), str(wager.fanduel_odds)])
+
+
+def main():
+    print(f"{'bets':>6} {'scan (s)':>10} {'indexed (s)':>12}")
+    for n in (500, 1000, 2000, 5000):
+        good_bets = make_bets(n)
+
+        bets = BetRegistry()
+        for wager in good_bets:
+            bets.add(wager.key, object(), ["", wager.pretty(), str(wager.fanduel_odds)], wager.league)
+        start = time.perf_counter()
+        reload_indexed(bets, good_bets)
+        indexed = time.perf_counter() - start
+
+        # The scan is quadratic, so only run it where it finishes in reasonable time
+        scan = float("nan")
+        if n <= 2000:
+            bet_data = {object(): ["", wager.pretty(), str(wager.fanduel_odds)] for wager in good_bets}
+            start = time.perf_counter()
+            reload_scan(bet_data, good_bets)
+            scan = time.perf_counter() - start
+
+        print(f"{n:>6} {scan:>10.4f} {indexed:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
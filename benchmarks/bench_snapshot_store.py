@@ -0,0 +1,92 @@
+"""
+Benchmarks SnapshotStore.commit() for full scrape cycles of every league fixture, both books.
+
+Each cycle adds all 19 Pinnacle and FanDuel fixtures; between cycles a share of the prices move,
+as lines do between polls. Reports the time per commit (one transaction, including compaction
+once cycles fall out of the full-detail window) and how many commits went over TARGET, the size
+of the database and the time of rows() for a cycle, an event and a market once every cycle is
+written, against keeping every row.
+
+Run from the repository root: python -m benchmarks.bench_snapshot_store
+"""
+import glob
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from src.snapshot_store import SnapshotStore
+
+CYCLES = 200
+MOVED_SHARE = 0.05
+# What a commit should stay under, in seconds
+TARGET = 0.1
+
+
+def load_fixtures():
+    leagues = []
+    for path in sorted(glob.glob("src/example_json/example_pinnacle_*.json")):
+        league = os.path.basename(path)[len("example_pinnacle_"):-len(".json")]
+        with open(path) as f:
+            pinnacle = json.load(f)
+        with open(f"src/example_json/example_fanduel_{league}.json") as f:
+            fanduel = json.load(f)
+        leagues.append((league.upper(), pinnacle, fanduel))
+    return leagues
+
+
+def move_prices(leagues, rng):
+    for _, pinnacle, fanduel in leagues:
+        for event in pinnacle.values():
+            for market in event["markets"]:
+                for price in market.get("prices", []):
+                    if rng.random() < MOVED_SHARE:
+                        price["price"] += rng.choice((-5, 5))
+        for event in fanduel.values():
+            for market in event.get("markets", []):
+                for runner in market["runners"]:
+                    if rng.random() < MOVED_SHARE:
+                        runner["winRunnerOdds"] += rng.choice((-5, 5))
+
+
+def run(path, full_cycles):
+    rng = random.Random(1)
+    leagues = load_fixtures()
+    store = SnapshotStore(path, full_cycles=full_cycles)
+    timings = []
+    for _ in range(CYCLES):
+        move_prices(leagues, rng)
+        start = time.perf_counter()
+        for league, pinnacle, fanduel in leagues:
+            store.add(league, pinnacle, fanduel)
+        store.commit()
+        timings.append(time.perf_counter() - start)
+    rows = len(store.rows())
+    event = next(iter(leagues[0][1].values()))["name"]
+    reads = []
+    for query in ({"cycle": CYCLES // 2}, {"event": event}, {"market": "moneyline"}):
+        start = time.perf_counter()
+        store.rows(**query)
+        reads.append(time.perf_counter() - start)
+    store.close()
+    return timings, rows, os.path.getsize(path), reads
+
+
+def main():
+    print(f"{CYCLES} cycles, {MOVED_SHARE:.0%} of prices moving per cycle")
+    print(f"{'full cycles':>12} {'median (ms)':>12} {'max (ms)':>9} {'over':>5} {'rows':>9} {'size (KiB)':>11} "
+          f"{'cycle (ms)':>11} {'event (ms)':>11} {'market (ms)':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for full_cycles in (CYCLES, 48):
+            timings, rows, size, reads = run(os.path.join(directory, f"{full_cycles}.db"), full_cycles)
+            cycle_read, event_read, market_read = (read * 1e3 for read in reads)
+            label = "all" if full_cycles == CYCLES else full_cycles
+            over = sum(1 for timing in timings if timing > TARGET)
+            print(f"{label:>12} {statistics.median(timings) * 1e3:>12.1f} {max(timings) * 1e3:>9.1f} {over:>5} "
+                  f"{rows:>9} {size / 1024:>11.0f} {cycle_read:>11.1f} {event_read:>11.1f} {market_read:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmarks Pinnacle special (player prop) price attachment on the NBA and NCAAB fixtures.
+
+The fixtures are processed results, so the raw matchups and markets payloads are rebuilt from
+them: every special becomes a child matchup plus an over/under (or yes/no) market, and the
+moneyline, spreads, totals and team totals become straight markets. Props can be multiplied to show
+how each approach scales with the number of specials per game, and the half and quarter markets
+that live payloads carry (and process_markets drops) can be added back.
+
+Compares the old attachment, which searched the parent's market entries for the special ID, with
+the special-ID index returned by process_specials.
+
+Run from the repository root: python -m benchmarks.bench_specials
+"""
+import copy
+import json
+import time
+
+from src.scrape import process_matchups, process_specials, process_markets
+
+FIXTURES = ("nba", "ncaab")
+
+
+# Periods of the half and quarter markets added by rebuild_payloads(periods=True)
+EXTRA_PERIODS = ("1", "2", "3", "4", "5", "6")
+
+
+def rebuild_payloads(processed, multiplier=1, periods=False):
+    matchups, markets = [], []
+    next_id = 10 ** 9
+    for matchup_id, entry in processed.items():
+        matchup_id = int(matchup_id)
+        away, home = entry["name"].split(" @ ") if " @ " in entry["name"] else entry["name"].split(" v ")
+        matchups.append({"id": matchup_id, "participants": [
+            {"alignment": "home", "name": home}, {"alignment": "away", "name": away}]})
+        for period in EXTRA_PERIODS if periods else ():
+            markets.append({"key": f"s;{period};m", "matchupId": matchup_id, "limits": [{"amount": 500}],
+                            "prices": [{"designation": "home", "price": -120}, {"designation": "away", "price": 100}]})
+            markets.append({"key": f"s;{period};s;-1.5", "matchupId": matchup_id, "limits": [{"amount": 500}],
+                            "prices": [{"designation": "home", "points": -1.5, "price": -110},
+                                       {"designation": "away", "points": 1.5, "price": -110}]})
+            markets.append({"key": f"s;{period};ou;55.5", "matchupId": matchup_id, "limits": [{"amount": 500}],
+                            "prices": [{"designation": "over", "points": 55.5, "price": -110},
+                                       {"designation": "under", "points": 55.5, "price": -110}]})
+        for market in entry["markets"]:
+            limits = [{"amount": market.get("limit")}]
+            if "id" not in market:
+                if market["description"] == "moneyline":
+                    markets.append({"key": "s;0;m", "matchupId": matchup_id, "limits": limits,
+                                    "prices": copy.deepcopy(market["prices"])})
+                elif market["description"] == "total points":
+                    markets.append({"key": f"s;0;ou;{market['threshold']}", "matchupId": matchup_id,
+                                    "limits": limits, "prices": copy.deepcopy(market["prices"])})
+                elif market["description"] == "team total":
+                    markets.append({"key": f"s;0;tt;{market['threshold']};{market['team']}",
+                                    "matchupId": matchup_id, "limits": limits,
+                                    "prices": copy.deepcopy(market["prices"])})
+                elif market["description"] == "handicap":
+                    prices = [{"designation": price["team"], "points": price["handicap"], "price": price["price"]}
+                              for price in market["prices"]]
+                    markets.append({"key": f"s;0;s;{prices[0]['points']}", "matchupId": matchup_id,
+                                    "limits": limits, "prices": prices})
+                continue
+            designation = market["prices"][0].get("designation")
+            key = {"over": "s;0;ou", "odd": "s;1;m"}.get(designation, "s;0;m")
+            for _ in range(multiplier):
+                next_id += 1
+                matchups.append({"id": next_id, "parentId": matchup_id,
+                                 "special": {"description": market["description"]}})
+                prices = []
+                for participant_id, price in ((2, market["prices"][1]), (1, market["prices"][0])):
+                    price = {k: v for k, v in price.items() if k != "designation"}
+                    price["participantId"] = participant_id
+                    prices.append(price)
+                markets.append({"key": key, "matchupId": next_id, "limits": limits, "prices": prices})
+    return matchups, markets
+
+
+def attach_by_scan(matchups, markets, result):
+    # The old lookup: special ID -> parent ID, then a search through the parent's market entries
+    special_to_parent = {}
+    for matchup in matchups:
+        if matchup.get("parentId") is not None and matchup.get("special"):
+            special_to_parent[matchup["id"]] = matchup["parentId"]
+    for market in markets:
+        parent_matchup_id = special_to_parent.get(market["matchupId"])
+        if parent_matchup_id in result:
+            for existing_market in result[parent_matchup_id]["markets"]:
+                if existing_market.get("id") == market["matchupId"]:
+                    existing_market["prices"] = market["prices"]
+                    break
+
+
+def attach_by_index(markets, special_markets):
+    for market in markets:
+        existing_market = special_markets.get(market["matchupId"])
+        if existing_market is not None:
+            existing_market["prices"] = market["prices"]
+
+
+def timed(function, runs=5):
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    print(f"{'fixture':>8} {'props/game':>11} {'specials':>9} {'scan (s)':>10} {'index (s)':>10} "
+          f"{'full parse (s)':>15}")
+    for fixture in FIXTURES:
+        with open(f"src/example_json/example_pinnacle_{fixture}.json") as f:
+            processed = json.load(f)
+        has_specials = any("id" in market for entry in processed.values() for market in entry["markets"])
+        for multiplier in (1, 4, 16) if has_specials else (1,):
+            matchups, markets = rebuild_payloads(processed, multiplier)
+            result = process_matchups(matchups, window_hours=None)
+            special_markets = process_specials(matchups, result)
+
+            scan = timed(lambda: attach_by_scan(matchups, markets, result))
+            index = timed(lambda: attach_by_index(markets, special_markets))
+
+            def parse():
+                parsed = process_matchups(matchups, window_hours=None)
+                process_markets(markets, parsed, process_specials(matchups, parsed))
+            full = timed(parse, runs=3)
+
+            games = max(1, len(result))
+            print(f"{fixture:>8} {len(special_markets) // games:>11} {len(special_markets):>9} "
+                  f"{scan:>10.4f} {index:>10.4f} {full:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
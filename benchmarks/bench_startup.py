@@ -0,0 +1,67 @@
+"""
+Benchmarks startup: importing the GUI (main), a headless scan (goodbets, which stream_good_bets
+comes from) and collecting the tests, each in a fresh interpreter.
+
+The time shown is the median over several runs minus a bare interpreter's startup, so it is what
+the repository's modules cost. Each import also lists the heavy dependencies it loaded: they should
+only load on the code paths that use them (requests on the first request, gspread and oauth2client
+on the first sheet write, plyer on the first notification, tkinter in the GUIs).
+
+Exits with status 1 if a startup goes over its budget, so the benchmark can gate regressions. The
+budgets leave about twice the headroom measured on a slow single-core machine.
+
+Run from the repository root: python -m benchmarks.bench_startup
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 5
+HEAVY_MODULES = ["tkinter", "requests", "gspread", "oauth2client", "plyer", "multiprocessing"]
+CHECK_MODULES = f"import sys; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+
+# (name, interpreter arguments, budget over a bare interpreter in ms)
+STARTUPS = [
+    ("gui", ["-c", f"import main; {CHECK_MODULES}"], 150),
+    ("headless scan", ["-c", f"import goodbets; {CHECK_MODULES}"], 120),
+    ("test collection", ["-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider"], 1000),
+]
+
+
+def run(args):
+    """
+    Returns the wall time of one interpreter run in ms, and its output.
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True).stdout
+    return (time.perf_counter() - start) * 1e3, output
+
+
+def median_time(args):
+    times = []
+    for _ in range(RUNS):
+        elapsed, output = run(args)
+        times.append(elapsed)
+    return statistics.median(times), output
+
+
+def main():
+    bare, _ = median_time(["-c", "pass"])
+    print(f"bare interpreter: {bare:.0f} ms")
+    print(f"{'startup':<16} {'time (ms)':>10} {'budget (ms)':>12}  heavy modules loaded")
+    over_budget = []
+    for name, args, budget in STARTUPS:
+        elapsed, output = median_time(args)
+        elapsed -= bare
+        loaded = output.strip() if args[0] == "-c" else ""
+        print(f"{name:<16} {elapsed:>10.0f} {budget:>12}  {loaded or '-'}")
+        if elapsed > budget:
+            over_budget.append(name)
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
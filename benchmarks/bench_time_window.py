@@ -0,0 +1,73 @@
+"""
+Benchmarks Pinnacle ingestion (process_matchups + process_specials + process_markets) with and
+without the time window on a futures-heavy league.
+
+The example JSON files are processed results, not raw payloads, so the matchups and markets are
+synthetic: NFL/UCL-like leagues list most games days ahead, each with specials (player props)
+and moneyline/spread/total markets.
+
+Run from the repository root: python -m benchmarks.bench_time_window
+"""
+import datetime
+import time
+
+from src.scrape import process_matchups, process_specials, process_markets
+
+NOW = time.time()
+PROPS_PER_GAME = 40
+
+
+def iso(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_payloads(games, upcoming_share):
+    matchups, markets = [], []
+    special_id = 10 ** 6
+    for game in range(games):
+        hours = 2 + game % 20 if game < games * upcoming_share else 48 + game % 200
+        matchups.append({"id": game, "startTime": iso(NOW + hours * 3600), "participants": [
+            {"alignment": "home", "name": f"Home {game}"}, {"alignment": "away", "name": f"Away {game}"}]})
+        markets.append({"key": "s;0;m", "matchupId": game, "limits": [{"amount": 1500}],
+                        "prices": [{"designation": "home", "price": -120}, {"designation": "away", "price": 105}]})
+        markets.append({"key": "s;0;s;-3.5", "matchupId": game, "limits": [{"amount": 3000}],
+                        "prices": [{"designation": "home", "points": -3.5, "price": -110},
+                                   {"designation": "away", "points": 3.5, "price": -110}]})
+        markets.append({"key": "s;0;ou;44.5", "matchupId": game, "limits": [{"amount": 2000}],
+                        "prices": [{"designation": "over", "points": 44.5, "price": -105},
+                                   {"designation": "under", "points": 44.5, "price": -115}]})
+        for prop in range(PROPS_PER_GAME):
+            special_id += 1
+            matchups.append({"id": special_id, "parentId": game,
+                             "special": {"description": f"Player {prop} (Receiving Yards)"}})
+            markets.append({"key": "s;0;ou", "matchupId": special_id, "limits": [{"amount": 250}],
+                            "prices": [{"participantId": 2, "points": 40.5 + prop, "price": -110},
+                                       {"participantId": 1, "points": 40.5 + prop, "price": -120}]})
+    return matchups, markets
+
+
+def ingest(matchups, markets, window_hours):
+    result = process_matchups(matchups, window_hours=window_hours, now=NOW)
+    special_markets = process_specials(matchups, result)
+    process_markets(markets, result, special_markets)
+    return result
+
+
+def main():
+    print(f"{'games':>6} {'upcoming':>9} {'no window (s)':>14} {'window (s)':>11} {'entries':>13}")
+    for games, upcoming_share in ((50, 0.25), (200, 0.25), (200, 0.1), (200, 1.0)):
+        matchups, markets = make_payloads(games, upcoming_share)
+        timings = {}
+        entries = {}
+        for window_hours in (None, 24):
+            start = time.perf_counter()
+            for _ in range(5):
+                result = ingest(matchups, markets, window_hours)
+            timings[window_hours] = (time.perf_counter() - start) / 5
+            entries[window_hours] = len(result)
+        print(f"{games:>6} {upcoming_share:>9.0%} {timings[None]:>14.4f} {timings[24]:>11.4f} "
+              f"{entries[None]:>6} -> {entries[24]:<5}")
+
+
+if __name__ == "__main__":
+    main()
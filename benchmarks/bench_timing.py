@@ -0,0 +1,73 @@
+"""
+Benchmarks the cost of the stage timing instrumentation on a scan cycle.
+
+A cycle here matches, devigs and filters every league fixture, as stream_good_bets does once both
+books are in (fetching and parsing aren't measured: they need the network). It is timed with the
+instrumented functions unwrapped (as before instrumentation), with the timer disabled (the default)
+and enabled. The enabled run's summary of the last cycle is printed too.
+
+Run from the repository root: python -m benchmarks.bench_timing
+"""
+import glob
+import json
+import os
+import statistics
+import time
+
+import goodbets
+from src.timing import TIMER
+from src.wager_table import WagerTable
+
+RUNS = 300
+
+
+def load_fixtures():
+    leagues = []
+    for path in sorted(glob.glob("src/example_json/example_pinnacle_*.json")):
+        league = os.path.basename(path)[len("example_pinnacle_"):-len(".json")]
+        with open(path) as f:
+            pinnacle = json.load(f)
+        with open(f"src/example_json/example_fanduel_{league}.json") as f:
+            fanduel = json.load(f)
+        leagues.append((league.upper(), pinnacle, fanduel))
+    return leagues
+
+
+def cycle(leagues):
+    for league, pinnacle, fanduel in leagues:
+        with TIMER.league(league):
+            goodbets.rank_good_bets(goodbets.match_wagers(pinnacle, fanduel), good_only=True)
+
+
+def instrument(instrumented, wrapped, enabled):
+    functions = instrumented if wrapped else [function.__wrapped__ for function in instrumented]
+    goodbets.match_wagers, goodbets.good_bet_rows, WagerTable.evaluate = functions
+    TIMER.enabled = enabled
+
+
+def main():
+    leagues = load_fixtures()
+    instrumented = (goodbets.match_wagers, goodbets.good_bet_rows, WagerTable.evaluate)
+    # (name, instrumented functions, timer enabled)
+    runs = [("uninstrumented", False, False), ("disabled", True, False), ("enabled", True, True)]
+
+    # The runs take turns, so load on the machine affects them alike
+    times = {name: [] for name, _, _ in runs}
+    for _ in range(RUNS):
+        for name, wrapped, enabled in runs:
+            instrument(instrumented, wrapped, enabled)
+            TIMER.reset()
+            start = time.perf_counter()
+            cycle(leagues)
+            times[name].append(time.perf_counter() - start)
+
+    bare = statistics.median(times["uninstrumented"])
+    print(f"{'run':<14} {'ms/cycle':>9} {'overhead':>9}")
+    for name, _, _ in runs:
+        elapsed = statistics.median(times[name])
+        print(f"{name:<14} {elapsed * 1e3:>9.2f} {(elapsed / bare - 1) * 100:>8.1f}%")
+    print(f"\nLast cycle (ms):\n{TIMER.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import argparse
+import contextlib
+import json
+import logging
+import sys
+import time
+import traceback
+from collections import namedtuple
+from datetime import datetime, timedelta
+from logging.handlers import RotatingFileHandler
+
+from goodbets import stream_good_bets, league_entries, LEAGUES
+from src.bet_log import BetLog, DAY_FORMAT
+from src.delta_engine import DeltaEngine
+from src.devig import DevigMethod, bet_amount
+from src.line_history import LineHistory
+from src.parse_pool import ParsePool
+from src.poll_scheduler import PollScheduler
+from src.snapshot_store import SnapshotStore
+from src.opportunity_server import OpportunityBoard, OpportunityServer
+from src.timing import TIMER
+from src.wager import wager_key_str
+
+# Bets already announced, one file per day (separate from the GUI's, so both can run)
+LOG_DIR = 'logged_bets_headless'
+# Size of the output file before it is rotated, and how many rotated files are kept
+MAX_OUTPUT_BYTES = 10 * 1024 * 1024
+OUTPUT_BACKUPS = 5
+# Shortest wait between looking at the schedule, in seconds
+MIN_DELAY = 1.0
+
+# name: shown in the stakes of every opportunity
+# bankroll, unit_size: what the stake and units of a bet are computed from, as in the GUI
+Account = namedtuple("Account", ["name", "bankroll", "unit_size"])
+
+
+def parse_account(text):
+    """
+    Parses an account given on the command line: "bankroll:unit_size" or "name=bankroll:unit_size".
+
+    Raises:
+        ValueError: If the text isn't in either form.
+    """
+    name, _, sizes = text.rpartition("=")
+    bankroll, unit_size = sizes.split(":")
+    return Account(name or sizes, float(bankroll), float(unit_size))
+
+
+class JsonLinesOutput:
+    """
+    Writes records as JSON lines, to a stream (stdout by default) or to a file rotated by size.
+    """
+
+    def __init__(self, path=None, stream=None, max_bytes=MAX_OUTPUT_BYTES, backups=OUTPUT_BACKUPS):
+        if path is not None:
+            self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        else:
+            self._handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def __call__(self, record):
+        self._handler.handle(logging.makeLogRecord({"msg": json.dumps(record)}))
+
+    def close(self):
+        self._handler.close()
+
+
+class HeadlessDaemon:
+    """
+    Runs the GUI's scan cycle without a display: polls the leagues that are due on the GUI's
+    schedule, keeps the bets that pass is_good_bet, and emits a record for each new or updated
+    opportunity and one with the metrics of each cycle.
+
+    The records follow the DeltaEngine's events: a bet is new when it becomes a good bet and isn't in
+    the bet log (today or yesterday), updated when its prices or limit change, and removed when it
+    stops being a good bet; once it becomes good again, it is new again. Every account gets its own
+    stake in the same record, so adding accounts doesn't add scrapes. Steam (Pinnacle moving while FanDuel doesn't) gets a
+    record of its own, good bet or not.
+    """
+
+    def __init__(self, accounts, emit, scheduler=None, bet_log=None, parse_pool=None, snapshots=None, board=None,
+                 devig_method=DevigMethod.POWER, scan=stream_good_bets, clock=time.time, sleep=time.sleep):
+        """
+        Args:
+            accounts (list): The Accounts to size bets for.
+            emit (callable): Called with each record (a dict).
+            scheduler (PollScheduler, optional): Decides which leagues are due. Defaults to all of LEAGUES.
+            bet_log (BetLog, optional): The bets already announced. Defaults to LOG_DIR.
+            parse_pool (ParsePool, optional): Parses the payloads in worker processes.
+            snapshots (SnapshotStore, optional): Stores the odds of every cycle.
+            board (OpportunityBoard, optional): Kept up to date with every league's good bets, and the
+                cycle metrics, for the HTTP server.
+            devig_method (DevigMethod): The method to use for devigging.
+            scan (callable): stream_good_bets, or anything with its signature.
+            clock (callable): Returns the current time in seconds since the epoch.
+            sleep (callable): Waits a number of seconds.
+        """
+        self.accounts = accounts
+        self.emit = emit
+        self.scheduler = scheduler or PollScheduler([league for league, _, _ in LEAGUES], clock=clock)
+        self.bet_log = bet_log if bet_log is not None else BetLog(LOG_DIR)
+        self.parse_pool = parse_pool
+        self.snapshots = snapshots
+        self.board = board
+        self.devig_method = devig_method
+        self._scan = scan
+        self._clock = clock
+        self._sleep = sleep
+        self.cycles = 0
+        self.deltas = DeltaEngine()
+        # Keys of the bets consumers know about: announced by this process, or before a restart per the bet log
+        self.announced = set()
+        self.history = LineHistory(clock=clock)
+
+    def run(self, cycles=None):
+        """
+        Runs scan cycles as leagues come due, forever or until a number of cycles have run.
+        """
+        while cycles is None or self.cycles < cycles:
+            if self.run_cycle() is None:
+                self._sleep(max(MIN_DELAY, self.scheduler.next_delay()))
+
+    def run_cycle(self):
+        """
+        Scans the leagues that are due, emitting their opportunities and then the cycle's metrics.
+
+        Returns:
+            dict: The metrics record, or None if no league was due.
+        """
+        leagues = self.scheduler.pop_due()
+        if not leagues:
+            return None
+        self.cycles += 1
+        started = self._clock()
+        metrics = {"event": "cycle", "cycle": self.cycles, "time": self.timestamp(started),
+                   "leagues": len(leagues), "scraped": 0, "skipped": 0, "failed": 0, "requests_skipped": 0,
+                   "good_bets": 0, "new": 0, "updated": 0, "removed": 0, "steam": 0, "empty": False,
+                   "error": None}
+        try:
+            scans = self._scan(self.devig_method, good_only=True, leagues=league_entries(leagues),
+                               parse_pool=self.parse_pool, snapshots=self.snapshots, deltas=self.deltas,
+                               history=self.history)
+            while True:
+                try:
+                    scan = next(scans)
+                except StopIteration as done:
+                    # A scan of only a few quiet leagues can legitimately come back empty
+                    metrics["empty"] = bool(done.value) and len(leagues) == len(LEAGUES)
+                    break
+                self.handle_league(scan, metrics)
+        except Exception as e:
+            metrics["error"] = f"{type(e).__name__}: {e}"
+            print(traceback.format_exc(), file=sys.stderr)
+        metrics["duration"] = round(self._clock() - started, 3)
+        metrics["next_delay"] = round(self.scheduler.next_delay(), 1)
+        if self.board is not None:
+            self.board.metrics = metrics
+        self.emit(metrics)
+        if TIMER.enabled:
+            print(f"Cycle {self.cycles} stage timings (ms):\n{TIMER.summary()}", file=sys.stderr)
+            TIMER.reset()
+        return metrics
+
+    def handle_league(self, scan, metrics):
+        if scan.failed:
+            # Says nothing about the league's bets: they stay on the board, and nothing is removed
+            self.scheduler.observe_failure(scan.league)
+            metrics["failed"] += 1
+            return
+        self.scheduler.observe(scan.league, scan.start_times, scan.prices)
+        if scan.requests_skipped:
+            self.scheduler.refund(scan.requests_skipped)
+            metrics["skipped"] += 1
+            metrics["requests_skipped"] += scan.requests_skipped
+        else:
+            metrics["scraped"] += 1
+            metrics["good_bets"] += len(scan.good_bets)
+        records = {wager.key: self.opportunity(wager, ev, risk_percentage)
+                   for wager, ev, risk_percentage in scan.good_bets}
+        if self.board is not None:
+            self.board.update_league(scan.league, list(records.values()))
+        now = self._clock()
+        today = datetime.fromtimestamp(now).strftime(DAY_FORMAT)
+        yesterday = (datetime.fromtimestamp(now) - timedelta(days=1)).strftime(DAY_FORMAT)
+        for event in scan.events:
+            if event.kind == "remove":
+                self.emit({"event": "remove", "time": self.timestamp(now), **self.opportunity(*event.bet)})
+                metrics["removed"] += 1
+            elif event.kind == "update":
+                self.emit({"event": "update", "time": self.timestamp(now), **records[event.key]})
+                metrics["updated"] += 1
+            else:
+                record = records[event.key]
+                if event.key not in self.announced:
+                    self.announced.add(event.key)
+                    # Logged bets were announced before a restart; they are only reported again once they move
+                    if self.bet_log.is_logged(today, record["key"]) or self.bet_log.is_logged(yesterday, record["key"]):
+                        continue
+                    self.bet_log.log(today, record["key"])
+                self.emit({"event": "new", "time": self.timestamp(now), **record})
+                metrics["new"] += 1
+        for alert in scan.alerts or ():
+            self.emit({"event": "steam", "time": self.timestamp(now), "league": alert.league, "bet": alert.bet,
+                       "key": wager_key_str(alert.key), "since": self.timestamp(alert.since),
+                       "pinnacle_before": alert.pinnacle_before, "pinnacle_odds": alert.pinnacle_odds,
+                       "fanduel_odds": alert.fanduel_odds, "move": round(alert.move, 4)})
+            metrics["steam"] += 1
+
+    def opportunity(self, wager, ev, risk_percentage):
+        """
+        Returns the record of a good bet, with its stake for every account.
+        """
+        stakes = {}
+        for account in self.accounts:
+            amount = bet_amount(risk_percentage, account.bankroll)
+            stakes[account.name] = {"amount": amount, "units": round(amount / account.unit_size, 1)}
+        return {
+            "league": wager.league,
+            "market": type(wager).__name__,
+            "game": wager.game,
+            "bet": wager.pretty(),
+            "key": wager_key_str(wager.key),
+            "market_id": wager.external_market_id,
+            "selection_id": wager.selection_id,
+            "fanduel_odds": wager.fanduel_odds,
+            "pinnacle_odds": wager.pinnacle_odds,
+            "pinnacle_limit": wager.pinnacle_limit,
+            "ev": round(ev, 3),
+            "risk_percentage": round(risk_percentage, 3),
+            "stakes": stakes,
+        }
+
+    @staticmethod
+    def timestamp(seconds):
+        return datetime.fromtimestamp(seconds).isoformat(timespec="seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scans for good bets without a display and writes them as JSON lines.")
+    parser.add_argument("accounts", nargs="*", type=parse_account, default=[Account("default", 1000, 10)],
+                        help='accounts to size bets for, as "bankroll:unit_size" or "name=bankroll:unit_size"')
+    parser.add_argument("--output", help="write to this file (rotated by size) instead of stdout")
+    parser.add_argument("--parse-workers", type=int, default=0, help="parse payloads in worker processes")
+    parser.add_argument("--snapshots", help="store the odds of every cycle in this SQLite file")
+    parser.add_argument("--cycles", type=int, help="stop after this many cycles")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="serve the opportunities over HTTP (/opportunities, /stream, /metrics)")
+    parser.add_argument("--timings", action="store_true",
+                        help="print how long each stage of each league took to stderr after every cycle")
+    args = parser.parse_args()
+    if args.timings:
+        TIMER.enabled = True
+
+    # stdout may be the output, so the scrapers' messages go to stderr
+    output = JsonLinesOutput(args.output, stream=sys.stdout)
+    parse_pool = ParsePool(args.parse_workers) if args.parse_workers > 0 else None
+    snapshots = SnapshotStore(args.snapshots) if args.snapshots else None
+    server = None
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        server = OpportunityServer((host or "127.0.0.1", int(port)), OpportunityBoard())
+        server.start()
+    daemon = HeadlessDaemon(args.accounts, output, parse_pool=parse_pool, snapshots=snapshots,
+                            board=server.board if server is not None else None)
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            daemon.run(args.cycles)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.stop()
+        if parse_pool is not None:
+            parse_pool.close()
+        if snapshots is not None:
+            snapshots.close()
+        output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
-import tkinter as tk
+import re
 from src.scrape import *
 from src.wager import *
 from src.devig import *
+from src.wager_table import WagerTable, MARKET_TYPES
+from src.schedule_index import ScheduleIndex
+from src.poll_scheduler import REQUESTS_PER_LEAGUE
+from src.parse_pool import is_parsed, parsed
+from src.timing import TIMER, timed
 from datetime import datetime
 import sys
-import webbrowser
+import time
+from collections import deque, namedtuple
 from src.sheet_operations import write_to_sheet
 
 
-# Default to 1000 if no argument provided
-BANKROLL = float(sys.argv[1]) if len(sys.argv) > 1 else 1000
+# Bankroll of the legacy GUI, set from the command line by main() (1000 if no argument is provided)
+BANKROLL = 1000
 
 
 def game_names_equal(game1, game2):
@@ -24,64 +30,198 @@ def game_names_equal(game1, game2):
     return (team1_1 in team2_1 or team2_1 in team1_1) and (team1_2 in team2_2 or team2_2 in team1_2)
 
 
-def wagers():
-    # Fetch data from Pinnacle and Fanduel
-    # Initialize empty dictionaries
-    pinnacle = {}
-    fanduel = {}
-
-    # Function to safely update dictionary
-    def safe_update(base_dict, new_dict, league=""):
-        if new_dict is not None:
-            base_dict.update(new_dict)
+# (label, Pinnacle fetcher, FanDuel fetcher) for every league, in the order they are scraped
+LEAGUES = [
+    ("NBA", pinnacle_nba, fanduel_nba),
+    ("NFL", pinnacle_nfl, fanduel_nfl),
+    ("NHL", pinnacle_nhl, fanduel_nhl),
+    ("NCAAF", pinnacle_ncaaf, fanduel_ncaaf),
+    ("NCAAB", pinnacle_ncaab, fanduel_ncaab),
+    ("UCL", pinnacle_ucl, fanduel_ucl),
+    ("EPL", pinnacle_epl, fanduel_epl),
+    ("SHL", pinnacle_shl, fanduel_shl),
+    ("NL", pinnacle_nla, fanduel_nla),
+    ("Turkish First", pinnacle_turkish_first, fanduel_turkish_first),
+    ("Turkish Super", pinnacle_turkish_super, fanduel_turkish_super),
+    ("J1", pinnacle_j1, fanduel_j1),
+    ("Ligue 1", pinnacle_ligue1, fanduel_ligue1),
+    ("Women Friendlies", pinnacle_women_friendlies, fanduel_women_friendlies),
+    ("Greek Super", pinnacle_greek_super, fanduel_greek_super),
+    ("CBA", pinnacle_cba, fanduel_cba),
+    ("AO", pinnacle_ao, fanduel_ao),
+    ("NBB", pinnacle_nbb, fanduel_nbb),
+    ("EuroLeague", pinnacle_euroleague, fanduel_euroleague),
+]
+
+
+# Pinnacle prop category -> FanDuel marketType, with {} standing for the rounded-up line
+FANDUEL_PROP_TEMPLATES = {
+    "Assists": "TO_RECORD_{}+_ASSISTS",
+    "3 Point FG": "{}+_MADE_THREES",
+    "Points": "TO_SCORE_{}+_POINTS",
+    "Rebounds": "TO_SCORE_{}+_REBOUNDS",
+    "1st TD Scorer": "FIRST_TOUCHDOWN_SCORER",
+    "Anytime TD": "ANY_TIME_TOUCHDOWN_SCORER",
+    "Longest Reception": "PLAYERS_WITH_{}+_YARDS_RECEPTION",
+    "Goals": "placeholder"
+}
+
+# Every FanDuel marketType match_wagers reads; the fetchers drop the rest before copying runners.
+# Keep in step with the marketType comparisons in match_wagers and with FANDUEL_PROP_TEMPLATES
+FANDUEL_MARKET_TYPES = MarketTypeFilter(
+    names=["MONEY_LINE", "MATCH_BETTING", "WIN-DRAW-WIN", "MATCH_HANDICAP_(2-WAY)", "TOTAL_POINTS_(OVER/UNDER)",
+           "ANY_TIME_GOAL_SCORER"]
+    + [template for category, template in FANDUEL_PROP_TEMPLATES.items()
+       if "{}" not in template and category != "Goals"],
+    patterns=[r"\d+".join(map(re.escape, template.split("{}")))
+              for template in FANDUEL_PROP_TEMPLATES.values() if "{}" in template],
+)
+
+
+# league: the league label
+# good_bets: list of (wager, ev, risk_percentage) sorted by risk percentage
+# start_times: start times (seconds since the epoch) of the league's FanDuel events
+# prices: wager key -> Pinnacle odds for every matched wager, used to spot line movement, or None
+#         if the league was skipped
+# requests_skipped: the number of requests saved by skipping a league with no upcoming events
+# events: the BetEvents since the league's last scan, if the scan was given a DeltaEngine, otherwise None
+# alerts: the SteamAlerts of the scan, if it was given a LineHistory and the league was scraped, otherwise None
+# failed: whether a book's request failed; the scan then says nothing about the league's bets, which
+#         are to be left as they were
+LeagueScan = namedtuple("LeagueScan", ["league", "good_bets", "start_times", "prices", "requests_skipped",
+                                       "events", "alerts", "failed"], defaults=[0, None, None, False])
+
+# Start times of every league's events, kept across cycles to skip leagues with nothing upcoming
+SCHEDULE_INDEX = ScheduleIndex()
+
+
+def league_entries(labels=None):
+    """
+    Returns the LEAGUES entries for the given labels, or all of them if labels is None.
+    """
+    if labels is None:
+        return LEAGUES
+    return [entry for entry in LEAGUES if entry[0] in labels]
+
+
+def event_start_times(*results):
+    """
+    Returns the start times stored on the entries of scrape results.
+    """
+    return [event["start_time"] for result in results for event in result.values() if "start_time" in event]
+
+
+def fetch_book(league, fetch, *args, **kwargs):
+    """
+    Calls a fetcher (or ParsePool.fetch), returning None as a failed request does if it raises.
+    """
+    try:
+        return fetch(*args, **kwargs)
+    except Exception as e:  # e.g. a timeout or a dropped connection
+        print(f"{league} request failed: {type(e).__name__}: {e}")
+        return None
+
+
+def fetch_leagues(leagues=None, schedule=SCHEDULE_INDEX, parse_pool=None, now=None):
+    """
+    Fetches Pinnacle and FanDuel data league by league.
+
+    Args:
+        leagues (list, optional): (label, Pinnacle fetcher, FanDuel fetcher) entries. Defaults to LEAGUES.
+        schedule (ScheduleIndex, optional): Skips leagues it knows have no events in the time window,
+            and is updated with the start times of every league fetched. None fetches everything.
+        parse_pool (ParsePool, optional): Parses the payloads in worker processes while the next
+            leagues download. The fetchers must then be module-level functions. None parses each
+            league here before fetching the next one.
+        now (float, optional): The time, in seconds since the epoch, that every league's time window
+            starts at, so one scan keeps the same window throughout. Defaults to the current time.
+
+    Yields:
+        tuple: (label, pinnacle, fanduel, skipped) as soon as both books have been fetched (and
+            parsed) for that league, in order. Skipped leagues come with empty dicts.
+    """
+    if now is None:
+        now = time.time()
+    pending = deque()  # (label, pinnacle, fanduel, skipped) in order; results, or futures while in the pool
+    for league, pinnacle_fetcher, fanduel_fetcher in (LEAGUES if leagues is None else leagues):
+        if schedule is not None and not schedule.should_fetch(league):
+            pending.append((league, {}, {}, True))
+        elif parse_pool is None:
+            with TIMER.league(league):
+                pending.append((league, fetch_book(league, pinnacle_fetcher, now=now),
+                                fetch_book(league, fanduel_fetcher, market_types=FANDUEL_MARKET_TYPES, now=now),
+                                False))
         else:
-            print(f"{league} returned empty dictionary")
-
-    # Pinnacle
-    safe_update(pinnacle, pinnacle_nba(), "NBA")
-    safe_update(pinnacle, pinnacle_nfl(), "NFL")
-    safe_update(pinnacle, pinnacle_nhl(), "NHL")
-    safe_update(pinnacle, pinnacle_ncaaf(), "NCAAF")
-    safe_update(pinnacle, pinnacle_ncaab(), "NCAAB")
-    safe_update(pinnacle, pinnacle_ucl(), "UCL")
-    safe_update(pinnacle, pinnacle_epl(), "EPL")
-    safe_update(pinnacle, pinnacle_shl(), "SHL")
-    safe_update(pinnacle, pinnacle_nla(), "NL")
-    safe_update(pinnacle, pinnacle_turkish_first(), "Turkish First")
-    safe_update(pinnacle, pinnacle_turkish_super(), "Turkish Super")
-    safe_update(pinnacle, pinnacle_j1(), "J1")
-    safe_update(pinnacle, pinnacle_ligue1(), "Ligue 1")
-    safe_update(pinnacle, pinnacle_women_friendlies(), "Women Friendlies")
-    safe_update(pinnacle, pinnacle_greek_super(), "Greek Super")
-    safe_update(pinnacle, pinnacle_cba(), "CBA")
-    safe_update(pinnacle, pinnacle_ao(), "AO")
-    safe_update(pinnacle, pinnacle_nbb(), "NBB")
-    safe_update(pinnacle, pinnacle_euroleague(), "EuroLeague")
-
-    # Fanduel
-    safe_update(fanduel, fanduel_nba(), "NBA")
-    safe_update(fanduel, fanduel_nfl(), "NFL")
-    safe_update(fanduel, fanduel_nhl(), "NHL")
-    safe_update(fanduel, fanduel_ncaaf(), "NCAAF")
-    safe_update(fanduel, fanduel_ncaab(), "NCAAB")
-    safe_update(fanduel, fanduel_ucl(), "UCL")
-    safe_update(fanduel, fanduel_epl(), "EPL")
-    safe_update(fanduel, fanduel_shl(), "SHL")
-    safe_update(fanduel, fanduel_nla(), "NL")
-    safe_update(fanduel, fanduel_turkish_first(), "Turkish First")
-    safe_update(fanduel, fanduel_turkish_super(), "Turkish Super")
-    safe_update(fanduel, fanduel_j1(), "J1")
-    safe_update(fanduel, fanduel_ligue1(), "Ligue 1")
-    safe_update(fanduel, fanduel_women_friendlies(), "Women Friendlies")
-    safe_update(fanduel, fanduel_greek_super(), "Greek Super")
-    safe_update(fanduel, fanduel_cba(), "CBA")
-    safe_update(fanduel, fanduel_ao(), "AO")
-    safe_update(fanduel, fanduel_nbb(), "NBB")
-    safe_update(fanduel, fanduel_euroleague(), "EuroLeague")
-
-    EMPTY_SCRAPE = pinnacle == {} or fanduel == {}
-
-    common_wagers = []
+            pending.append((league, fetch_book(league, parse_pool.fetch, pinnacle_fetcher, get_response_no_params,
+                                               now=now),
+                            fetch_book(league, parse_pool.fetch, fanduel_fetcher, get_response,
+                                       market_types=FANDUEL_MARKET_TYPES, now=now), False))
+        while pending and is_parsed(pending[0][1]) and is_parsed(pending[0][2]):
+            yield fetched_league(*pending.popleft(), schedule)
+    while pending:
+        yield fetched_league(*pending.popleft(), schedule)
+
+
+def fetched_league(league, pinnacle, fanduel, skipped, schedule):
+    """
+    Completes a league for fetch_leagues(): waits for its parse, defaults failed books to empty
+    dicts and records its start times if both books were fetched.
+    """
+    if skipped:
+        return league, pinnacle, fanduel, True
+    with TIMER.span("wait", league):
+        pinnacle = parsed(pinnacle)
+        fanduel = parsed(fanduel)
+    if pinnacle is None:
+        print(f"{league} returned empty dictionary")
+        pinnacle = {}
+    if fanduel is None:
+        print(f"{league} returned empty dictionary")
+        fanduel = {}
+    # A failed request says nothing about the schedule, and events without start times can't be
+    # placed in the window, so keep fetching those leagues. The index gets every start time of the
+    # payloads, including the events just past the window
+    if (schedule is not None and isinstance(pinnacle, ScrapeResult) and isinstance(fanduel, ScrapeResult) and
+            all("start_time" in event for result in (pinnacle, fanduel) for event in result.values())):
+        schedule.update(league, pinnacle.start_times + fanduel.start_times)
+    return league, pinnacle, fanduel, False
+
+
+def wagers():
+    # Fetch data from Pinnacle and Fanduel and match every league into one table
+    table = WagerTable()
+    pinnacle_empty = fanduel_empty = True
+    fetched = 0
+    for league, pinnacle, fanduel, skipped in fetch_leagues():
+        if skipped:
+            continue
+        fetched += 1
+        pinnacle_empty = pinnacle_empty and not pinnacle
+        fanduel_empty = fanduel_empty and not fanduel
+        with TIMER.league(league):
+            match_wagers(pinnacle, fanduel, table)
+
+    # Skipping every league isn't a failed scrape
+    EMPTY_SCRAPE = fetched > 0 and (pinnacle_empty or fanduel_empty)
+
+    return table, EMPTY_SCRAPE
+
+
+@timed("match")
+def match_wagers(pinnacle, fanduel, table=None):
+    """
+    Matches Pinnacle markets with FanDuel markets and fills a WagerTable with one row per FanDuel selection.
+
+    Args:
+        pinnacle (dict): Processed Pinnacle data keyed by matchup ID.
+        fanduel (dict): Processed FanDuel data keyed by event ID.
+        table (WagerTable, optional): The table to append to. A new one is created if omitted.
+
+    Returns:
+        WagerTable: The table of matched wagers.
+    """
+    if table is None:
+        table = WagerTable()
 
     # Iterate through each game in Pinnacle data
     for pinnacle_id in pinnacle:
@@ -120,20 +260,18 @@ def wagers():
                             away_selection_id = fanduel_wager["runners"][1 -
                                                                          home_index]["selectionId"]
 
-                            # Create home moneyline object
-                            home_moneyline = Moneyline(
+                            # Add home moneyline row
+                            table.add_moneyline(
                                 name, fanduel_home_odds, pinnacle_home_odds, pinnacle_limit,
                                 home_team, away_team, pinnacle_away_odds, 0, external_market_id,
                                 home_selection_id, league)
 
-                            # Create away moneyline object
-                            away_moneyline = Moneyline(
+                            # Add away moneyline row
+                            table.add_moneyline(
                                 name, fanduel_away_odds, pinnacle_away_odds, pinnacle_limit,
                                 away_team, home_team, pinnacle_home_odds, 0, external_market_id,
                                 away_selection_id, league)
 
-                            common_wagers.append(home_moneyline)
-                            common_wagers.append(away_moneyline)
                             break
                         elif fanduel_wager["marketType"] == "WIN-DRAW-WIN":
                             pinnacle_home_odds = pinnacle_wager["prices"][0]["price"]
@@ -148,26 +286,23 @@ def wagers():
                             away_selection_id = fanduel_wager["runners"][2]["selectionId"]
                             draw_selection_id = fanduel_wager["runners"][1]["selectionId"]
 
-                            # Create home moneyline object
-                            home_moneyline = Moneyline(
+                            # Add home moneyline row
+                            table.add_moneyline(
                                 name, fanduel_home_odds, pinnacle_home_odds, pinnacle_limit,
                                 home_team, away_team, pinnacle_away_odds, pinnacle_draw_odds,
                                 external_market_id, home_selection_id, league)
 
-                            # Create away moneyline object
-                            away_moneyline = Moneyline(
+                            # Add away moneyline row
+                            table.add_moneyline(
                                 name, fanduel_away_odds, pinnacle_away_odds, pinnacle_limit,
                                 away_team, home_team, pinnacle_home_odds, pinnacle_draw_odds,
                                 external_market_id, away_selection_id, league)
 
-                            # Create draw moneyline object
-                            draw_moneyline = Draw(
+                            # Add draw moneyline row
+                            table.add_draw(
                                 name, fanduel_draw_odds, pinnacle_draw_odds, pinnacle_home_odds,
                                 pinnacle_away_odds, pinnacle_limit, external_market_id, draw_selection_id, league)
 
-                            common_wagers.append(home_moneyline)
-                            common_wagers.append(away_moneyline)
-                            common_wagers.append(draw_moneyline)
                             break
                 elif description == "handicap":
                     home_handicap = pinnacle_wager["prices"][0]["handicap"]
@@ -184,20 +319,18 @@ def wagers():
                             home_selection_id = fanduel_wager["runners"][1]["selectionId"]
                             away_selection_id = fanduel_wager["runners"][0]["selectionId"]
 
-                            # Create home spread object
-                            home_spread = Spread(
+                            # Add home spread row
+                            table.add_spread(
                                 name, fanduel_home_odds, pinnacle_home_odds, pinnacle_limit,
                                 home_team, away_team, home_handicap, pinnacle_away_odds, external_market_id, home_selection_id,
                                 league)
 
-                            # Create away spread object
-                            away_spread = Spread(
+                            # Add away spread row
+                            table.add_spread(
                                 name, fanduel_away_odds, pinnacle_away_odds, pinnacle_limit,
                                 away_team, home_team, -home_handicap, pinnacle_home_odds, external_market_id, away_selection_id,
                                 league)
 
-                            common_wagers.append(home_spread)
-                            common_wagers.append(away_spread)
                             break
                 elif description == "total points":
                     threshold = float(pinnacle_wager["threshold"])
@@ -213,18 +346,16 @@ def wagers():
                             over_selection_id = fanduel_wager["runners"][0]["selectionId"]
                             under_selection_id = fanduel_wager["runners"][1]["selectionId"]
 
-                            # Create over total points object
-                            over_total_points = TotalPoints(
+                            # Add over total points row
+                            table.add_total_points(
                                 name, fanduel_over_odds, pinnacle_over_odds, pinnacle_limit, OverUnder.OVER,
                                 threshold, pinnacle_under_odds, external_market_id, over_selection_id, league)
 
-                            # Create under total points object
-                            under_total_points = TotalPoints(
+                            # Add under total points row
+                            table.add_total_points(
                                 name, fanduel_under_odds, pinnacle_under_odds, pinnacle_limit, OverUnder.UNDER,
                                 threshold, pinnacle_over_odds, external_market_id, under_selection_id, league)
 
-                            common_wagers.append(over_total_points)
-                            common_wagers.append(under_total_points)
                             break
                 elif description == "team total":
                     # there are no team total market easily accessible on fanduel data
@@ -234,22 +365,12 @@ def wagers():
                     player_name, raw_category = description.rsplit(" (", 1)
                     category = raw_category.rstrip(")")
                     category = category.rstrip(")")
-                    fanduel_category_map = {
-                        "Assists": "TO_RECORD_{}+_ASSISTS",
-                        "3 Point FG": "{}+_MADE_THREES",
-                        "Points": "TO_SCORE_{}+_POINTS",
-                        "Rebounds": "TO_SCORE_{}+_REBOUNDS",
-                        "1st TD Scorer": "FIRST_TOUCHDOWN_SCORER",
-                        "Anytime TD": "ANY_TIME_TOUCHDOWN_SCORER",
-                        "Longest Reception": "PLAYERS_WITH_{}+_YARDS_RECEPTION",
-                        "Goals": "placeholder"
-                    }
                     # Round N up to the nearest integer
                     if "points" in pinnacle_wager["prices"][0]:
                         N = int(pinnacle_wager["prices"][0]["points"] + 1)
                     else:
                         continue
-                    fanduel_category_template = fanduel_category_map.get(category)
+                    fanduel_category_template = FANDUEL_PROP_TEMPLATES.get(category)
                     stat_category = (
                         StatCategory.POINTS if category == "Points" else
                         StatCategory.REBOUNDS if category == "Rebounds" else
@@ -276,13 +397,12 @@ def wagers():
 
                                         over_selection_id = runner["selectionId"]
 
-                                        # Create player props over object
-                                        player_props_over = PlayerProps(
+                                        # Add player props over row
+                                        table.add_player_props(
                                             name, fanduel_odds, pinnacle_over_odds, pinnacle_limit,
                                             player_name, stat_category, OverUnder.OVER, N, pinnacle_under_odds,
                                             external_market_id, over_selection_id, league
                                         )
-                                        common_wagers.append(player_props_over)
                                         break
                     # yes/no player props
                     elif fanduel_category_template:
@@ -298,16 +418,15 @@ def wagers():
                                         fanduel_odds = runner["winRunnerOdds"]
                                         pinnacle_limit = pinnacle_wager["limit"]
 
-                                        yes_selection_id = fanduel_wager["runners"][0]["selectionId"]
+                                        yes_selection_id = runner["selectionId"]
 
-                                        # Create player props yes object
-                                        player_props_yes = PlayerPropsYes(
+                                        # Add player props yes row
+                                        table.add_player_props_yes(
                                             name, fanduel_odds, pinnacle_yes_odds, pinnacle_limit,
                                             player_name, stat_category, pinnacle_no_odds, external_market_id,
                                             yes_selection_id, league
                                         )
 
-                                        common_wagers.append(player_props_yes)
                                         break
 
                         else:
@@ -323,63 +442,107 @@ def wagers():
                                             fanduel_odds = runner["winRunnerOdds"]
                                             pinnacle_limit = pinnacle_wager["limit"]
 
-                                            yes_selection_id = fanduel_wager["runners"][0]["selectionId"]
+                                            yes_selection_id = runner["selectionId"]
 
-                                            # Create player props yes object
-                                            player_props_yes = PlayerPropsYes(
+                                            # Add player props yes row
+                                            table.add_player_props_yes(
                                                 name, fanduel_odds, pinnacle_yes_odds, pinnacle_limit,
                                                 player_name, stat_category, pinnacle_no_odds, external_market_id,
                                                 yes_selection_id, league
                                             )
 
-                                            common_wagers.append(player_props_yes)
                                             break
-    return common_wagers, EMPTY_SCRAPE
-
-
-def display_good_bets(devig_method=DevigMethod.POWER):
-    common_wagers, EMPTY_SCRAPE = wagers()
-    good_bets = []
-
-    for wager in common_wagers:
-        if " @ " in wager.game:
-            true_prob = devig(wager.pinnacle_odds, wager.pinnacle_opposing_odds, devig_method)
-        elif isinstance(wager, Draw):
-            true_prob = devig3(wager.pinnacle_odds, wager.pinnacle_home_odds,
-                               wager.pinnacle_away_odds, devig_method)
-        elif isinstance(wager, Moneyline):
-            true_prob = devig3(wager.pinnacle_odds, wager.pinnacle_opposing_odds,
-                               wager.pinnacle_draw_odds, devig_method)
-        if (wager.fanduel_odds is None):
+    return table
+
+
+def display_good_bets(devig_method=DevigMethod.POWER, good_only=False):
+    """
+    Scrapes, matches and devigs the slate, and returns the positive EV bets sorted by risk percentage.
+
+    Args:
+        devig_method (DevigMethod): The method to use for devigging.
+        good_only (bool): If True, only keep bets that pass is_good_bet.
+
+    Returns:
+        tuple: A list of (wager, ev, risk_percentage) tuples, and whether the scrape came back empty.
+    """
+    table, EMPTY_SCRAPE = wagers()
+    return rank_good_bets(table, devig_method, good_only), EMPTY_SCRAPE
+
+
+def rank_good_bets(table, devig_method=DevigMethod.POWER, good_only=False):
+    """
+    Devigs a WagerTable and materializes the positive EV rows, sorted by risk percentage.
+
+    Args:
+        table (WagerTable): The matched wagers.
+        devig_method (DevigMethod): The method to use for devigging.
+        good_only (bool): If True, only keep rows that pass is_good_bet.
+
+    Returns:
+        list: A list of (wager, ev, risk_percentage) tuples.
+    """
+    table.evaluate(devig_method)
+    indices = table.positive_ev()
+    if good_only:
+        indices = good_bet_rows(table, indices)
+    return list(table.bets(table.ranked(indices)))
+
+
+def stream_good_bets(devig_method=DevigMethod.POWER, good_only=False, leagues=None, schedule=SCHEDULE_INDEX,
+                     parse_pool=None, snapshots=None, deltas=None, history=None):
+    """
+    Scrapes, matches and devigs league by league, yielding each league's good bets as soon as
+    both books have been fetched for it.
+
+    Args:
+        devig_method (DevigMethod): The method to use for devigging.
+        good_only (bool): If True, only keep bets that pass is_good_bet.
+        leagues (list, optional): (label, Pinnacle fetcher, FanDuel fetcher) entries. Defaults to LEAGUES.
+        schedule (ScheduleIndex, optional): Used to skip leagues with no upcoming events. None fetches everything.
+        parse_pool (ParsePool, optional): Parses the payloads in worker processes; see fetch_leagues.
+        snapshots (SnapshotStore, optional): Stores the odds of every league scraped, as one cycle.
+        deltas (DeltaEngine, optional): Only devigs the wagers whose prices changed since the last
+            scan, and reports the bets added, updated and removed in each LeagueScan's events.
+        history (LineHistory, optional): Records the line movements of every league scraped, and
+            reports steam in each LeagueScan's alerts.
+
+    Yields:
+        LeagueScan: The league's good bets, event start times and Pinnacle prices, the requests
+            saved if the league was skipped, or a failed scan if a book's request failed. A failed
+            league is left out of the snapshot, the deltas and the line history, so one bad
+            response doesn't remove its bets.
+
+    Returns:
+        bool: Whether the whole scrape came back empty (the generator's return value).
+    """
+    pinnacle_empty = fanduel_empty = True
+    fetched = 0
+    for league, pinnacle, fanduel, skipped in fetch_leagues(leagues, schedule, parse_pool):
+        if skipped:
+            yield LeagueScan(league, [], schedule.start_times(league), None, REQUESTS_PER_LEAGUE,
+                             deltas.clear(league) if deltas is not None else None)
             continue
-        fanduel_prob = american_to_probability(wager.fanduel_odds)
-        if true_prob > fanduel_prob:
-            ev = (true_prob - fanduel_prob) / fanduel_prob * 100
-            kelly_percentage = kelly_criterion(true_prob, fanduel_prob) * 100
-            risk_percentage = min(2.5, kelly_percentage *
-                                  get_confidence_value(wager.pinnacle_limit) / 10)
-            good_bets.append((wager, ev, risk_percentage))
-
-    return good_bets, EMPTY_SCRAPE
-
-
-def change_devig_method(devig_method, common_wagers):
-    good_bets = []
-
-    for wager in common_wagers:
-        if " @ " in wager.game:
-            true_prob = devig(wager.pinnacle_odds, wager.pinnacle_opposing_odds, devig_method)
-        else:
-            true_prob = devig3(wager.pinnacle_draw_odds, wager.pinnacle_home_odds,
-                               wager.pinnacle_away_odds, devig_method)
-        fanduel_prob = american_to_probability(wager.fanduel_odds)
-        if true_prob > fanduel_prob:
-            ev = (true_prob - fanduel_prob) / fanduel_prob * 100
-            kelly_percentage = kelly_criterion(true_prob, fanduel_prob) * 100
-            risk_percentage = kelly_percentage * get_confidence_value(wager.pinnacle_limit)
-            good_bets.append((wager, ev, risk_percentage))
-
-    return good_bets
+        fetched += 1
+        pinnacle_empty = pinnacle_empty and not pinnacle
+        fanduel_empty = fanduel_empty and not fanduel
+        if not isinstance(pinnacle, ScrapeResult) or not isinstance(fanduel, ScrapeResult):
+            yield LeagueScan(league, [], [], None, failed=True)
+            continue
+        if snapshots is not None:
+            snapshots.add(league, pinnacle, fanduel)
+        with TIMER.league(league):
+            table = match_wagers(pinnacle, fanduel)
+            prices = {table.key(i): table.pinnacle_odds[i] for i in range(len(table))}
+            alerts = history.record(league, table) if history is not None else None
+            if deltas is not None:
+                good_bets, events = deltas.apply(league, table, devig_method, good_bet_rows if good_only else None)
+            else:
+                good_bets, events = rank_good_bets(table, devig_method, good_only), None
+        yield LeagueScan(league, good_bets, event_start_times(pinnacle, fanduel), prices, 0, events, alerts)
+    if snapshots is not None:
+        snapshots.commit()
+    return fetched > 0 and (pinnacle_empty or fanduel_empty)
 
 
 def show_details(wager, details_label):
@@ -410,39 +573,81 @@ def copy_to_clipboard(root, text):
 
 
 def open_betslip(external_market_id, selection_id):
+    import webbrowser
+
     url = f"https://sportsbook.fanduel.com/addToBetslip?marketId[0]={
         external_market_id}&selectionId[0]={selection_id}"
     webbrowser.open_new_tab(url)
 
 
+# Based on research, only certain leagues/markets are good.
+# Each entry is (wager type, league, highest FanDuel odds allowed or None for any odds).
+GOOD_BET_MARKETS = [
+    (Moneyline, "NCAAB", None),
+    (TotalPoints, "NCAAB", -120),
+    (Moneyline, "NCAAFB", -120),
+    (Moneyline, "NFL", -120),
+    (Spread, "NCAAFB", -120),
+    (TotalPoints, "NHL", -120),
+]
+# Leagues where only GOOD_BET_MARKETS are kept. Every market in other leagues is good.
+FILTERED_LEAGUES = ["NBA", "NFL", "NHL", "NCAAB", "NCAAFB", "SHL", "NL", "AO"]
+
+
 def is_good_bet(wager):
     # Based on research, only certain leagues/markets are good. This function filters out the rest.
-    if isinstance(wager, Moneyline) and wager.league == "NCAAB":
-        return True
-    elif isinstance(wager, TotalPoints) and wager.league == "NCAAB" and wager.fanduel_odds <= -120:
-        return True
-    elif isinstance(wager, Moneyline) and wager.league == "NCAAFB" and wager.fanduel_odds <= -120:
-        return True
-    elif isinstance(wager, Moneyline) and wager.league == "NFL" and wager.fanduel_odds <= -120:
-        return True
-    elif isinstance(wager, Spread) and wager.league == "NCAAFB" and wager.fanduel_odds <= -120:
-        return True
-    elif isinstance(wager, TotalPoints) and wager.league == "NHL" and wager.fanduel_odds <= -120:
-        return True
-    elif wager.league not in ["NBA", "NFL", "NHL", "NCAAB", "NCAAFB", "SHL", "NL", "AO"]:
-        return True
-    else:
-        return False
+    for wager_type, league, max_odds in GOOD_BET_MARKETS:
+        if isinstance(wager, wager_type) and wager.league == league and (max_odds is None or wager.fanduel_odds <= max_odds):
+            return True
+    return wager.league not in FILTERED_LEAGUES
+
+
+@timed("filter")
+def good_bet_rows(table, indices):
+    """
+    Applies the is_good_bet rules to rows of a WagerTable without materializing wagers.
+
+    Args:
+        table (WagerTable): The evaluated table.
+        indices (list): The row indices to filter.
+
+    Returns:
+        list: The row indices that pass is_good_bet.
+    """
+    # Resolve the rules into the table's codes once, then filter on the integer columns. Leagues the
+    # table has no rows for are left out rather than registered
+    rules = {}
+    for wager_type, league, max_odds in GOOD_BET_MARKETS:
+        code = table.find_league_code(league)
+        if code is not None:
+            rules[(MARKET_TYPES.index(wager_type), code)] = max_odds
+    filtered = {table.find_league_code(league) for league in FILTERED_LEAGUES} - {None}
+
+    market_type = table.market_type
+    league = table.league
+    fanduel_odds = table.fanduel_odds
+    good = []
+    for i in indices:
+        key = (market_type[i], league[i])
+        if key in rules:
+            max_odds = rules[key]
+            if max_odds is None or fanduel_odds[i] <= max_odds:
+                good.append(i)
+                continue
+        if league[i] not in filtered:
+            good.append(i)
+    return good
 
 
 def reload_data(root, canvas, scrollable_frame, devig_method):
+    import tkinter as tk
+
     for widget in scrollable_frame.winfo_children():
         widget.destroy()
 
-    good_bets, EMPTY_SCRAPE = display_good_bets(devig_method)
+    good_bets, EMPTY_SCRAPE = display_good_bets(devig_method)  # Sorted by risk_percentage
     if EMPTY_SCRAPE:
         print("No data found. Please try again later.")
-    good_bets.sort(key=lambda x: x[2], reverse=True)  # Sort by risk_percentage
 
     row = 0
     col = 0
@@ -497,6 +702,13 @@ def reload_data(root, canvas, scrollable_frame, devig_method):
 
 
 def main():
+    # tkinter is only imported by the GUI, so scanning headless (e.g. stream_good_bets) doesn't load it
+    import tkinter as tk
+
+    global BANKROLL
+    if len(sys.argv) > 1:
+        BANKROLL = float(sys.argv[1])
+
     root = tk.Tk()
     root.title("Good Bets")
     root.geometry("600x650")
@@ -1,59 +1,69 @@
 import sys
 from tkinter import messagebox
-from goodbets import open_betslip, display_good_bets, is_good_bet
-from src.sheet_operations import write_to_sheet, write_to_column
-import os.path
+from goodbets import open_betslip, stream_good_bets, league_entries, LEAGUES
 import time
 from datetime import datetime, timedelta
 import tkinter as tk
-from src.devig import DevigMethod
+from src.devig import DevigMethod, bet_amount
 from src.wager import *
-from plyer import notification
+from src.bet_registry import BetRegistry
+from src.bet_list import BetListView
+from src.scan_worker import ScanWorker
+from src.poll_scheduler import PollScheduler, REQUESTS_PER_LEAGUE
+from src.parse_pool import ParsePool
+from src.snapshot_store import SnapshotStore
+from src.last_scan import LastScan, age_text
+from src.bet_log import BetLog
+from src.sheet_writer import SheetWriter
+from src.bet_sinks import make_sink
+from src.delta_engine import DeltaEngine
+from src.line_history import LineHistory, alert_text
+from src.timing import TIMER
 import traceback
 
+# Bets already shown, one file per day; the old single-file log is split into it once
+LOG_DIR = 'logged_bets'
 LOG_FILE = 'logged_bets.txt'
+# Odds of every scrape cycle
+SNAPSHOT_FILE = 'snapshots.db'
+# Good bets of each league's last scan, shown at startup until the league is scraped again
+LAST_SCAN_FILE = 'last_scan.pickle'
+STALE_AGE_REFRESH_MS = 60 * 1000
+SCAN_POLL_INTERVAL_MS = 250
+# How soon to look at the schedule again while a scan is still running
+SCHEDULE_BUSY_RETRY_MS = 5000
 
 
-def is_bet_logged(date_game):
-    if not os.path.exists(LOG_FILE):
-        return False
-    with open(LOG_FILE, 'r') as f:
-        logged_bets = f.read().splitlines()
-    return date_game in logged_bets
-
-
-def log_bet(date_game):
-    with open(LOG_FILE, 'a') as f:
-        f.write(f"{date_game}\n")
+def notify(**kwargs):
+    """
+    Shows a desktop notification. plyer is imported by the first one rather than at startup.
+    """
+    from plyer import notification
+    notification.notify(**kwargs)
 
 
 class BettingGUI:
-    def __init__(self, root, unit_size=100):
+    def __init__(self, root, unit_size=100, parse_workers=0, sink="sheets"):
         self.root = root
         self.unit_size = unit_size
         self.root.title("Automated Betting Tracker")
-        self.root.geometry("1200x650")  # Increased width for two columns
-
-        self.frame = tk.Frame(self.root)
-        self.frame.pack(padx=10, pady=10)
-
-        self.canvas = tk.Canvas(self.frame, height=500, width=1180)  # Increased canvas width
-        self.scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas)
-
-        self.scrollable_frame.bind("<Configure>",
-                                   lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.root.geometry("1200x650")
 
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.bet_list = BetListView(self.root, [
+            ("Place Bet", self.place_bets),
+            ("Copy Bet", self.copy_bets),
+            ("Write to Sheet", self.write_bets_to_sheet),
+        ])
+        self.bet_list.pack(padx=10, pady=10, fill="both", expand=True)
 
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
-
-        self.canvas.bind_all("<MouseWheel>", self.on_mouse_wheel)
         self.processed_bets = set()
-        self.bet_data = {}  # New dictionary to store bet data
-        self.displayed_games = {}  # Store displayed games and their frames
+        self.bet_log = BetLog(LOG_DIR, legacy_file=LOG_FILE)
+        # Bets are written to the sheet in batches on a background thread
+        self.sheet_writer = SheetWriter(make_sink(sink))
+        self.bets = BetRegistry()  # Displayed bets indexed by wager key
+        self.item_keys = {}  # Bet list item ID -> wager key
+        # Keys of every bet displayed in this session; taken down bets that turn good again are shown again
+        self.shown_keys = set()
 
         # Add reload button at the top
         self.reload_button = tk.Button(root, text="Reload Odds", command=self.reload_odds)
@@ -63,16 +73,35 @@ class BettingGUI:
         self.status_label = tk.Label(root, text="Monitoring for new bets...", pady=5)
         self.status_label.pack()
 
-        self.bet_frames = {}  # Store frames by wager text
+        # Scrape + match + devig runs on a worker thread; each league's results are polled from
+        # the Tk loop as soon as both books are in. A scan's scope is the set of leagues to scrape.
+        # With parse workers, the payloads are parsed in other processes while the next leagues download
+        self.parse_pool = ParsePool(parse_workers) if parse_workers > 0 else None
+        self.snapshots = SnapshotStore(SNAPSHOT_FILE)
+        # Only the bets whose prices moved are devigged again and redrawn each cycle
+        self.deltas = DeltaEngine()
+        # Recent line movements of every market, to catch Pinnacle moving before FanDuel
+        self.history = LineHistory()
+        self.worker = ScanWorker(lambda leagues=None: stream_good_bets(
+            DevigMethod.POWER, good_only=True, leagues=league_entries(leagues), parse_pool=self.parse_pool,
+            snapshots=self.snapshots, deltas=self.deltas, history=self.history))
+        # Decides which leagues are due, from start times, line movement and the request budget
+        self.scheduler = PollScheduler([league for league, _, _ in LEAGUES])
+        self.cycle_updates = False  # Whether the scan in flight updated or added any bet so far
+        self.cycle_new_bets = 0
+        self.cycle_requests_skipped = 0
+
+        self.last_scan = LastScan(LAST_SCAN_FILE)
+        self.stale_bets = {}  # league -> (scan time, keys of the bets shown from the last run)
+        self.show_last_scan()
         self.root.after(1000, self.check_for_new_bets)
-        self.bet_counter = 0  # Add counter to track number of bets for column placement
-        self.total_bets = 0  # Add this line to track total bets
+        self.root.after(SCAN_POLL_INTERVAL_MS, self.poll_scan_results)
 
-    def on_mouse_wheel(self, event):
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    def bet_amount(self, risk_percentage):
+        return bet_amount(risk_percentage, BANKROLL)
 
     def format_bet_text(self, wager, risk_percentage):
-        bet_amount = int(2 * risk_percentage / 100 * BANKROLL + 1) / 2
+        bet_amount = self.bet_amount(risk_percentage)
         units = bet_amount / self.unit_size
         units = round(units, 1)
         odds_str = f"+{wager.fanduel_odds}" if wager.fanduel_odds > 0 else str(wager.fanduel_odds)
@@ -82,267 +111,369 @@ class BettingGUI:
         self.root.clipboard_clear()
         self.root.clipboard_append(text)
 
-    def add_bet_to_display(self, wager, ev, risk_percentage, insert_at_top=True):
-        bet_frame = tk.Frame(self.scrollable_frame, borderwidth=2,
-                             relief="groove", width=570, height=200, bg="#90ee90")
-
-        if insert_at_top:
-            # Shift all existing frames down
-            for widget in self.scrollable_frame.winfo_children():
-                grid_info = widget.grid_info()
-                if grid_info:
-                    position = grid_info['row'] * 2 + grid_info['column']
-                    new_position = position + 1
-                    new_row = new_position // 2
-                    new_col = new_position % 2
-                    widget.grid(row=new_row, column=new_col, padx=5, pady=5, sticky="ew")
-
-            # Place new frame at position 0
-            bet_frame.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
-            self.total_bets += 1
-        else:
-            # For non-top insertions, add to next available position
-            position = self.total_bets
-            row = position // 2
-            col = position % 2
-            bet_frame.grid(row=row, column=col, padx=5, pady=5, sticky="ew")
-            self.total_bets += 1
+    def bet_values(self, wager, ev, risk_percentage):
+        # Display text and sort values for a row of the bet list
+        bet_amount = self.bet_amount(risk_percentage)
+        values = {
+            "bet": wager.pretty(),
+            "odds": f"+{wager.fanduel_odds}" if wager.fanduel_odds > 0 else str(wager.fanduel_odds),
+            "ev": f"{ev:.2f}%",
+            "risk": f"{risk_percentage:.2f}%",
+            "amount": f"${bet_amount:.2f}",
+            "league": wager.league,
+        }
+        sort_values = {"odds": wager.fanduel_odds, "ev": ev, "risk": risk_percentage, "amount": bet_amount}
+        return values, sort_values
+
+    def add_bet_to_display(self, wager, ev, risk_percentage, insert_at_top=True, stale=False):
+        iid = wager_key_str(wager.key)
+        values, sort_values = self.bet_values(wager, ev, risk_percentage)
+        self.bet_list.insert(iid, values, wager.league, sort_values, at_top=insert_at_top, stale=stale)
+        self.item_keys[iid] = wager.key
 
         # Store the bet data for later use
         today = datetime.today().strftime("%m/%d/%Y")
-        row_data = [today, wager.pretty(), str(wager.fanduel_odds),
-                    str(int(2 * risk_percentage / 100 * BANKROLL + 1) / 2)]
-        self.bet_data[bet_frame] = row_data, wager.league
-
-        bet_frame.pack_propagate(False)
-
-        bet_label = tk.Label(
-            bet_frame,
-            text=f"{wager.pretty()}\nFanduel Odds: {wager.fanduel_odds}\nEV: {ev:.2f}%\nRisk: {
-                risk_percentage:.2f}% (${int(2 * risk_percentage / 100 * BANKROLL + 1) / 2}0)",
-            wraplength=520,  # Adjusted wraplength for two columns
-            justify="left",
-            bg="#90ee90"
-        )
-        bet_label.pack(expand=True)
-
-        button_frame = tk.Frame(bet_frame, bg="#90ee90")
-        button_frame.pack(pady=5)
-
-        copy_bet_button = tk.Button(
-            button_frame,
-            text="Copy Bet",
-            command=lambda: self.copy_to_clipboard(self.format_bet_text(wager, risk_percentage))
-        )
-        copy_bet_button.pack(side="left", padx=2)
-
-        place_bet_button = tk.Button(
-            button_frame,
-            text="Place Bet",
-            command=lambda: open_betslip(wager.external_market_id, wager.selection_id)
-        )
-        place_bet_button.pack(side="left", padx=2)
-
-        write_sheet_button = tk.Button(
-            button_frame,
-            text="Write to Sheet",
-            command=lambda: self.write_bet_to_sheet(bet_frame)
-        )
-        write_sheet_button.pack(side="left", padx=2)
-
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        self.displayed_games[wager.game] = bet_frame  # Track displayed games
-        return bet_frame  # Add this line to return the frame
-
-    def write_bet_to_sheet(self, bet_frame):
-        if (bet_frame in self.bet_data):
-            row_data, league = self.bet_data[bet_frame]
-            try:
-                write_to_sheet(row_data)
-                write_to_column(8, league)
-                bet_frame.configure(bg="#D3D3D3")  # Change color to indicate written
-                for widget in bet_frame.winfo_children():
-                    if isinstance(widget, tk.Frame):
-                        widget.configure(bg="#D3D3D3")
-                        for button in widget.winfo_children():
-                            if button["text"] == "Write to Sheet":
-                                button.configure(state="disabled")
-                    else:
-                        widget.configure(bg="#D3D3D3")
-            except Exception as e:
-                print(f"Error writing to sheet: {e}")
-
-    def update_bet_display(self, bet_frame, wager, ev, risk_percentage):
-        bet_label = bet_frame.winfo_children()[0]  # Get the label widget
-        bet_label.config(
-            text=f"{wager.pretty()}\nFanduel Odds: {wager.fanduel_odds}\nEV: {ev:.2f}%\nRisk: {
-                risk_percentage:.2f}% (${int(2 * risk_percentage / 100 * BANKROLL + 1) / 2}0)"
-        )
+        row_data = [today, wager.pretty(), str(wager.fanduel_odds), str(self.bet_amount(risk_percentage))]
+        self.bets.add(wager.key, iid, row_data, wager.league, (wager, ev, risk_percentage))
+        self.shown_keys.add(wager.key)
+        return iid
+
+    def show_last_scan(self):
+        """
+        Shows the good bets of the last run's scans, marked with their age, so the window is useful
+        before the first scrape finishes. Each league's bets are replaced once it is scraped again.
+        """
+        for league, (scanned_at, good_bets) in self.last_scan.load().items():
+            keys = set()
+            for wager, ev, risk_percentage in good_bets:
+                if wager.key not in self.bets:
+                    self.add_bet_to_display(wager, ev, risk_percentage, insert_at_top=False, stale=True)
+                    keys.add(wager.key)
+            if keys:
+                self.stale_bets[league] = (scanned_at, keys)
+        if self.stale_bets:
+            count = sum(len(keys) for _, keys in self.stale_bets.values())
+            self.status_label.config(text=f"Showing {count} bets from the last run until their leagues are scraped...")
+            self.refresh_stale_ages()
+
+    def refresh_stale_ages(self):
+        now = time.time()
+        for scanned_at, keys in self.stale_bets.values():
+            text = age_text(now - scanned_at)
+            for key in keys:
+                iid = self.bets.frame(key)
+                if iid is not None:
+                    self.bet_list.set_value(iid, "age", text)
+        if self.stale_bets:
+            self.root.after(STALE_AGE_REFRESH_MS, self.refresh_stale_ages)
+
+    def replace_stale_bets(self, league, good_bets):
+        """
+        Updates the bets shown from the last run for a league that was just scraped, and removes
+        the ones that aren't good bets anymore.
+        """
+        entry = self.stale_bets.pop(league, None)
+        if entry is None:
+            return
+        fresh = {wager.key: (wager, ev, risk_percentage) for wager, ev, risk_percentage in good_bets}
+        today = datetime.today().strftime("%m/%d/%Y")
+        for key in entry[1]:
+            iid = self.bets.frame(key)
+            if iid is None:
+                continue
+            if key in fresh:
+                wager, ev, risk_percentage = fresh[key]
+                self.update_bet_display(iid, wager, ev, risk_percentage)
+                row_data = [today, wager.pretty(), str(wager.fanduel_odds), str(self.bet_amount(risk_percentage))]
+                self.bets.update(key, row_data, fresh[key])
+                self.bet_list.mark_fresh(iid)
+            else:
+                self.remove_bet_from_display(key)
+
+    def save_last_scan(self):
+        try:
+            self.last_scan.save()
+        except OSError as e:
+            print(f"Could not save the last scan to {LAST_SCAN_FILE}: {e}")
+
+    def remove_bet_from_display(self, key):
+        iid = self.bets.remove(key)
+        if iid is not None:
+            self.bet_list.remove(iid)
+            del self.item_keys[iid]
+
+    def place_bets(self, iids):
+        for iid in iids:
+            wager, _, _ = self.bets.bet(self.item_keys[iid])
+            open_betslip(wager.external_market_id, wager.selection_id)
+
+    def copy_bets(self, iids):
+        texts = []
+        for iid in iids:
+            wager, _, risk_percentage = self.bets.bet(self.item_keys[iid])
+            texts.append(self.format_bet_text(wager, risk_percentage))
+        self.copy_to_clipboard("\n\n".join(texts))
+
+    def write_bets_to_sheet(self, iids):
+        for iid in iids:
+            self.write_bet_to_sheet(self.item_keys[iid])
+
+    def write_bet_to_sheet(self, key):
+        if key in self.bets:
+            iid = self.bets.frame(key)
+            row_data, league = self.bets.data(key)
+            self.sheet_writer.write(iid, row_data, league)
+
+    def handle_sheet_writes(self):
+        for iid, error in self.sheet_writer.poll():
+            if error is not None:
+                print(f"Error writing to sheet: {error}")
+                self.status_label.config(text=f"Error writing to sheet: {error}")
+            elif iid in self.bet_list:
+                self.bet_list.mark_written(iid)  # Change color to indicate written
+
+    def update_bet_display(self, iid, wager, ev, risk_percentage):
+        values, sort_values = self.bet_values(wager, ev, risk_percentage)
+        self.bet_list.update(iid, values, sort_values)
 
     def are_same_bet(self, wager1, wager2):
         # Compare essential properties to determine if it's the same bet
-        return (wager1.game == wager2.game and
-                wager1.pretty() == wager2.pretty())
+        return wager1.key == wager2.key
 
-    def process_new_bet(self, wager, ev, risk_percentage, today, notify=True):
+    def process_new_bet(self, wager, ev, risk_percentage, today, alert=True):
+        if wager.key in self.bets:
+            # Already shown, e.g. carried over from the last run
+            return False, None
         game_name = wager.game
-        date_bet = f"{today}-{wager.pretty()}"
-        date_bet_yesterday = f"{(datetime.today() - timedelta(days=1)
-                                 ).strftime('%m/%d/%Y')}-{wager.pretty()}"
+        bet_key = wager_key_str(wager.key)
+        date_bet = f"{today}-{bet_key}"
+        yesterday = (datetime.today() - timedelta(days=1)).strftime('%m/%d/%Y')
 
-        if (not is_bet_logged(date_bet) and
-                not is_bet_logged(date_bet_yesterday)) and date_bet not in self.processed_bets:
+        if (not self.bet_log.is_logged(today, bet_key) and
+                not self.bet_log.is_logged(yesterday, bet_key)) and date_bet not in self.processed_bets:
             # Add to GUI
-            bet_frame = self.add_bet_to_display(wager, ev, risk_percentage, True)
-            self.bet_frames[date_bet] = bet_frame
+            self.add_bet_to_display(wager, ev, risk_percentage, True)
 
             # Log the bet
-            log_bet(date_bet)
+            self.bet_log.log(today, bet_key)
             self.processed_bets.add(date_bet)
             return True, wager.pretty() + f" ({wager.fanduel_odds})"
         return False, None
 
     def reload_odds(self):
-        try:
-            print("\nReloading odds...")
+        print("\nReloading odds...")
+        # A reload scrapes every league on top of the schedule, so it uses up budget the scheduled
+        # polls then wait for; it isn't refused, as it is what the user asked for
+        if not self.worker.covers(None):
+            self.scheduler.charge(len(LEAGUES) * REQUESTS_PER_LEAGUE)
+        if self.worker.request("reload"):
             self.status_label.config(text="Reloading odds...")
-            self.root.update()
-
-            good_bets, EMPTY_SCRAPE = display_good_bets(DevigMethod.POWER)
-            if EMPTY_SCRAPE:
-                error_msg = "No data was scraped. The site may be down or experiencing issues."
-                print(error_msg)
-                self.status_label.config(text=error_msg)
-                notification.notify(
-                    title='Scraping Error',
-                    message=error_msg,
-                    app_icon=None,
-                    timeout=10,
-                )
-                return
-            # Sort bets by risk percentage before processing
-            good_bets.sort(key=lambda x: x[2], reverse=True)
-            found_updates = False
-            new_bets_text = []
-            today = datetime.today().strftime("%m/%d/%Y")
-
-            # Create a mapping of displayed bets for easier lookup
-            displayed_bets = {}
-            for frame, data in self.bet_data.items():
-                displayed_bets[data[1]] = frame  # Using bet name as key
-
-            # Process all bets from the new data
-            for wager, ev, risk_percentage in good_bets:
-                if not is_good_bet(wager):
-                    continue
-
-                # Check if this bet already exists
-                found_match = False
-                for frame, data in list(self.bet_data.items()):
-                    if data[1] == wager.pretty():  # If same bet name
-                        # Update the display and stored data
-                        self.update_bet_display(frame, wager, ev, risk_percentage)
-                        self.bet_data[frame] = [today, wager.pretty(), str(wager.fanduel_odds),
-                                                str(int(2 * risk_percentage / 100 * BANKROLL + 1) / 2)]
-                        found_match = True
-                        found_updates = True
-                        break
-
-                # If it's a new bet, process it
-                if not found_match:
-                    is_new, bet_text = self.process_new_bet(wager, ev, risk_percentage, today)
-                    if is_new:
-                        found_updates = True
-                        new_bets_text.append(bet_text)
-
-            if new_bets_text:
-                notification.notify(
-                    title='New Betting Opportunities!',
-                    message='\n'.join(new_bets_text[:3]) +
-                    ('\n...' if len(new_bets_text) > 3 else ''),
-                    app_icon=None,
-                    timeout=10,
-                )
-
-            current_time = datetime.now().strftime('%I:%M:%S %p')
-            status_msg = f"Last reload: {current_time} - " + \
-                ("Odds updated!" if found_updates else "No changes in odds")
-            self.status_label.config(text=status_msg)
-
-        except Exception as e:
-            error_msg = f"Error reloading odds: {str(e)}"
-            print(error_msg)
-            self.status_label.config(text=error_msg)
+        else:
+            self.status_label.config(text="Scrape in progress - odds will reload when it finishes...")
 
     def check_for_new_bets(self):
-        try:
-            print("\nScraping data...")
-            self.status_label.config(text="Scraping data...")
-            self.root.update()
-
-            good_bets, EMPTY_SCRAPE = display_good_bets(DevigMethod.POWER)
-            if EMPTY_SCRAPE:
-                error_msg = "No data was scraped. The site may be down or experiencing issues."
-                print(error_msg)
-                self.status_label.config(text=error_msg)
-                notification.notify(
-                    title='Scraping Error',
-                    message=error_msg,
-                    app_icon=None,
-                    timeout=10,
-                )
-                return
-            good_bets.sort(key=lambda x: x[2], reverse=True)
-
-            today = datetime.today().strftime("%m/%d/%Y")
-            found_new_bet = False
-            new_bets_text = []
-
-            for wager, ev, risk_percentage in good_bets:
-                if not is_good_bet(wager):
-                    continue
-
-                is_new, bet_text = self.process_new_bet(wager, ev, risk_percentage, today)
-                if is_new:
-                    found_new_bet = True
-                    new_bets_text.append(bet_text)
+        if not self.worker.busy:
+            leagues = self.scheduler.pop_due()
+            if leagues:
+                print(f"\nScraping data... ({', '.join(leagues)})")
+                self.worker.request("check", set(leagues))
+                self.status_label.config(text=f"Scraping data... ({len(leagues)} leagues due)")
+
+        # Schedule the next check for when the next league is due
+        if hasattr(self, 'next_check'):
+            self.root.after_cancel(self.next_check)
+        delay_ms = max(1000, int(self.scheduler.next_delay() * 1000))
+        if self.worker.busy:
+            delay_ms = min(delay_ms, SCHEDULE_BUSY_RETRY_MS)
+        self.next_check = self.root.after(delay_ms, self.check_for_new_bets)
+
+    def poll_scan_results(self):
+        # Drain everything that arrived since the last poll so a fast league burst isn't delayed
+        result = self.worker.poll()
+        while result is not None:
+            self.handle_scan_result(result)
+            result = self.worker.poll()
+        self.handle_sheet_writes()
+        self.root.after(SCAN_POLL_INTERVAL_MS, self.poll_scan_results)
+
+    def handle_scan_result(self, result):
+        if not result.done:
+            self.handle_league_result(result)
+            return
+
+        cycle_msg = f" (cycle took {result.duration:.1f}s)"
+        found_updates, found_new_bet = self.cycle_updates, self.cycle_new_bets > 0
+        if self.cycle_requests_skipped:
+            cycle_msg = f" (cycle took {result.duration:.1f}s, " \
+                f"{self.cycle_requests_skipped} requests skipped for leagues with no upcoming games)"
+        self.cycle_updates = False
+        self.cycle_new_bets = 0
+        self.cycle_requests_skipped = 0
+        if TIMER.enabled:
+            print(f"Stage timings (ms):\n{TIMER.summary()}")
+            TIMER.reset()
+        if result.error is not None:
+            e = result.error
+            error_msg = f"Error: {str(e)}\nType: {type(e).__name__}\nDetails: {str(e.__dict__)}"
+            print(error_msg)
+            print("\nStack trace:")
+            print(result.trace)
+            self.status_label.config(text=error_msg + cycle_msg)
+            notify(
+                title='Error in Betting App',
+                message=error_msg[:200] + '...' if len(error_msg) > 200 else error_msg,
+                app_icon=None,
+                timeout=10,
+            )
+            return
 
-            if found_new_bet:
-                notification.notify(
-                    title='New Betting Opportunities!',
-                    message='\n'.join(new_bets_text[:3]) +
-                    ('\n...' if len(new_bets_text) > 3 else ''),
-                    app_icon=None,
-                    timeout=10,
-                )
+        EMPTY_SCRAPE = result.value
+        # A scheduled scan of a few quiet leagues can legitimately come back empty
+        if EMPTY_SCRAPE and result.scope is None:
+            error_msg = "No data was scraped. The site may be down or experiencing issues."
+            print(error_msg)
+            self.status_label.config(text=error_msg + cycle_msg)
+            notify(
+                title='Scraping Error',
+                message=error_msg,
+                app_icon=None,
+                timeout=10,
+            )
+            return
 
-            current_time = datetime.now().strftime('%I:%M:%S %p')
+        self.save_last_scan()
+        current_time = datetime.now().strftime('%I:%M:%S %p')
+        if "reload" in result.kinds:
+            status_msg = f"Last reload: {current_time} - " + \
+                ("Odds updated!" if found_updates else "No changes in odds")
+        else:
             status_msg = f"Last check: {current_time} - " + \
                 ("New bets found!" if found_new_bet else "No new bets found")
-            print(f"{status_msg}\nWaiting 30 minutes before next check...")
-            self.status_label.config(text=status_msg)
-
+            print(f"{status_msg}{cycle_msg}\n"
+                  f"Next check in {self.scheduler.next_delay() / 60:.0f} minutes...")
+        self.status_label.config(text=status_msg + cycle_msg)
+
+    def handle_league_result(self, result):
+        scan = result.value
+        league, good_bets = scan.league, scan.good_bets
+        if scan.failed:
+            # The league's bets stay up as they were until a scan of it goes through
+            interval = self.scheduler.observe_failure(league)
+            print(f"{league}: scan failed, next poll in {interval / 60:.0f} minutes")
+            return
+        interval = self.scheduler.observe(league, scan.start_times, scan.prices)
+        if scan.requests_skipped:
+            # No games coming up, so none of the league's bets are still good
+            with TIMER.span("render", league):
+                self.replace_stale_bets(league, [])
+                self.apply_events(scan.events)
+            self.last_scan.update(league, [])
+            self.scheduler.refund(scan.requests_skipped)
+            self.cycle_requests_skipped += scan.requests_skipped
+            print(f"{league}: no games in the next 24 hours, skipped "
+                  f"{scan.requests_skipped} requests, next poll in {interval / 60:.0f} minutes")
+            return
+        self.last_scan.update(league, good_bets)
+        try:
+            with TIMER.span("render", league):
+                self.replace_stale_bets(league, good_bets)
+                found_updates, new_bets_text = self.apply_events(scan.events)
         except Exception as e:
             error_msg = f"Error: {str(e)}\nType: {type(e).__name__}\nDetails: {str(e.__dict__)}"
             print(error_msg)
             print("\nStack trace:")
             print(traceback.format_exc())
             self.status_label.config(text=error_msg)
-            notification.notify(
-                title='Error in Betting App',
-                message=error_msg[:200] + '...' if len(error_msg) > 200 else error_msg,
-                app_icon=None,
-                timeout=10,
-            )
+            return
+
+        self.cycle_updates = self.cycle_updates or found_updates
+        self.cycle_new_bets += len(new_bets_text)
+        if new_bets_text:
+            # Alert per league instead of waiting for the whole scrape
+            self.notify_new_bets(new_bets_text)
+        if scan.alerts:
+            self.notify_steam(scan.alerts)
+        print(f"{league}: {len(good_bets)} good bets, {len(new_bets_text)} new, "
+              f"{self.scheduler.moved[league]} lines moved ({result.duration:.1f}s), "
+              f"next poll in {interval / 60:.0f} minutes")
+        self.status_label.config(
+            text=f"Scraping data... {league} done, {self.cycle_new_bets} new bets so far ({result.duration:.0f}s)")
+
+    def notify_new_bets(self, new_bets_text):
+        notify(
+            title='New Betting Opportunities!',
+            message='\n'.join(new_bets_text[:3]) +
+            ('\n...' if len(new_bets_text) > 3 else ''),
+            app_icon=None,
+            timeout=10,
+        )
 
-        # Schedule next check in 30 minutes
-        if hasattr(self, 'next_check'):
-            self.root.after_cancel(self.next_check)
-        self.next_check = self.root.after(1800000, self.check_for_new_bets)
+    def notify_steam(self, alerts):
+        alerts_text = [alert_text(alert) for alert in alerts]
+        for text in alerts_text:
+            print(f"Steam: {text}")
+        notify(
+            title='Pinnacle Line Moving',
+            message='\n'.join(alerts_text[:3]) +
+            ('\n...' if len(alerts_text) > 3 else ''),
+            app_icon=None,
+            timeout=10,
+        )
+
+    def apply_events(self, events):
+        """
+        Applies a league's BetEvents: adds the new bets that haven't been logged yet, redraws the
+        changed ones, removes the ones that aren't good bets anymore and shows again the ones taken
+        down earlier in the session that are good again. Unchanged bets aren't touched.
+
+        Returns:
+            tuple: (whether anything was added, updated or removed, list of new bet texts)
+        """
+        found_updates = False
+        new_bets_text = []
+        today = datetime.today().strftime("%m/%d/%Y")
+
+        for event in events:
+            wager, ev, risk_percentage = event.bet
+            if event.kind == "remove":
+                if event.key in self.bets:
+                    self.remove_bet_from_display(event.key)
+                    found_updates = True
+            elif event.key in self.bets:
+                # Changed, or shown before this scan (e.g. carried over from the last run)
+                self.update_bet_display(self.bets.frame(event.key), wager, ev, risk_percentage)
+                row_data = [today, wager.pretty(), str(wager.fanduel_odds),
+                            str(self.bet_amount(risk_percentage))]
+                self.bets.update(event.key, row_data, event.bet)
+                found_updates = True
+            elif event.key in self.shown_keys:
+                # Taken down when it stopped being good; the log only keeps bets from being shown twice
+                # across runs
+                self.add_bet_to_display(wager, ev, risk_percentage, True)
+                found_updates = True
+            elif event.kind == "add":
+                is_new, bet_text = self.process_new_bet(wager, ev, risk_percentage, today)
+                if is_new:
+                    found_updates = True
+                    new_bets_text.append(bet_text)
+
+        return found_updates, new_bets_text
 
 
 def main():
     global BANKROLL
+    parse_workers = 0
+    sink = "sheets"
+    if len(sys.argv) > 4:
+        if sys.argv[4] in ("sheets", "csv", "sqlite"):
+            sink = sys.argv[4]
+        else:
+            print("Invalid sink. Writing bets to the Google sheet")
+    if len(sys.argv) > 3:
+        try:
+            parse_workers = int(sys.argv[3])
+        except ValueError:
+            print("Invalid parse_workers. Parsing on the scan thread")
     if len(sys.argv) > 2:
         try:
             BANKROLL = float(sys.argv[1])
@@ -352,14 +483,16 @@ def main():
             BANKROLL = 1000
             unit_size = 10
     else:
-        print("Usage: python main.py <bankroll> <unit_size>")
+        print("Usage: python main.py <bankroll> <unit_size> [parse_workers] [sheets|csv|sqlite]")
         print("Using defaults: BANKROLL=1000, unit_size=10")
         BANKROLL = 1000
         unit_size = 10
 
     root = tk.Tk()
-    app = BettingGUI(root, unit_size)
+    app = BettingGUI(root, unit_size, parse_workers, sink)
     root.mainloop()
+    if app.parse_pool is not None:
+        app.parse_pool.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+import tkinter as tk
+from tkinter import ttk
+
+ALL_LEAGUES = "All leagues"
+
+# (column id, heading, width)
+COLUMNS = (
+    ("bet", "Bet", 560),
+    ("odds", "Odds", 70),
+    ("ev", "EV", 80),
+    ("risk", "Risk", 80),
+    ("amount", "Amount", 90),
+    ("league", "League", 100),
+    ("age", "Age", 70),
+)
+NUMERIC_COLUMNS = {"odds", "ev", "risk", "amount"}
+
+
+class BetListView:
+    """
+    Bet list backed by a ttk.Treeview.
+
+    Tk only draws the rows that are visible, and each bet is a single tree item instead of a
+    Frame with a Label and Buttons, so inserting, updating and scrolling stay cheap with thousands
+    of bets. Rows are identified by an item ID chosen by the caller. Actions (copy, place, write)
+    run on the selected rows through the toolbar, a right-click menu or a double-click.
+    """
+
+    def __init__(self, parent, actions, height=20):
+        """
+        Args:
+            parent: The parent widget.
+            actions (list): (label, callback) pairs. Each callback receives the list of selected item IDs.
+                The first action also runs on double-click.
+            height (int): The number of visible rows.
+        """
+        self.frame = tk.Frame(parent)
+        self._rows = {}  # item ID -> {"league": str, "sort": dict of column -> sortable value}
+        # item ID -> position, lowest at the top, including rows hidden by the league filter. A dict
+        # rather than a list, so removing a row doesn't shift the rest
+        self._order = {}
+        self._top = 0  # lowest position in use
+        self._bottom = -1  # highest position in use
+        self._sort_column = None
+        self._sort_reverse = True
+        self._relayout_pending = False
+        self._leagues = set()
+
+        toolbar = tk.Frame(self.frame)
+        toolbar.pack(fill="x", pady=(0, 5))
+        tk.Label(toolbar, text="League:").pack(side="left")
+        self.league_var = tk.StringVar(value=ALL_LEAGUES)
+        self.league_menu = ttk.Combobox(toolbar, textvariable=self.league_var, values=[ALL_LEAGUES],
+                                        state="readonly", width=16)
+        self.league_menu.bind("<<ComboboxSelected>>", lambda event: self._relayout())
+        self.league_menu.pack(side="left", padx=(2, 10))
+        for label, callback in actions:
+            tk.Button(toolbar, text=label, command=lambda c=callback: self._run(c)).pack(side="left", padx=2)
+
+        body = tk.Frame(self.frame)
+        body.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(body, columns=[column for column, _, _ in COLUMNS], show="headings",
+                                 selectmode="extended", height=height)
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width, stretch=column == "bet",
+                             anchor="e" if column in NUMERIC_COLUMNS else "w")
+        self.tree.tag_configure("good", background="#90ee90")
+        self.tree.tag_configure("written", background="#D3D3D3")
+        self.tree.tag_configure("stale", background="#FFF2CC")
+        scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self.menu = tk.Menu(self.tree, tearoff=0)
+        for label, callback in actions:
+            self.menu.add_command(label=label, command=lambda c=callback: self._run(c))
+        self.tree.bind("<Button-3>", self._show_menu)
+        if actions:
+            self.tree.bind("<Double-1>", lambda event: self._run(actions[0][1]))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, iid):
+        return iid in self._rows
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def insert(self, iid, values, league, sort_values, at_top=True, stale=False):
+        """
+        Adds a row.
+
+        Args:
+            iid (str): The item ID of the row.
+            values (dict): Display text for each column.
+            league (str): The league used by the league filter.
+            sort_values (dict): Sortable values for numeric columns (e.g. {"ev": 3.2, "risk": 1.1}).
+            at_top (bool): Insert at the top instead of the bottom.
+            stale (bool): Show the row as carried over from a previous run until mark_fresh().
+        """
+        index = 0 if at_top else "end"
+        tags = ("stale",) if stale else ("good",)
+        self.tree.insert("", index, iid=iid, values=self._column_values(values), tags=tags)
+        if at_top:
+            self._top -= 1
+            self._order[iid] = self._top
+        else:
+            self._bottom += 1
+            self._order[iid] = self._bottom
+        self._rows[iid] = {"league": league, "sort": dict(sort_values, bet=values.get("bet", ""), league=league)}
+
+        if league not in self._leagues:
+            self._leagues.add(league)
+            self.league_menu["values"] = [ALL_LEAGUES] + sorted(self._leagues)
+        if not self._visible(iid):
+            self.tree.detach(iid)
+        if self._sort_column is not None:
+            self._schedule_relayout()
+
+    def update(self, iid, values, sort_values):
+        """
+        Replaces the text and sort values of an existing row.
+        """
+        self.tree.item(iid, values=self._column_values(values))
+        self._rows[iid]["sort"].update(sort_values)
+        if self._sort_column in sort_values:
+            self._schedule_relayout()
+
+    def remove(self, iid):
+        """
+        Deletes a row if it exists.
+        """
+        if iid in self._rows:
+            del self._rows[iid]
+            del self._order[iid]
+            self.tree.delete(iid)
+
+    def mark_written(self, iid):
+        """
+        Greys out a row to show it was written to the sheet.
+        """
+        self.tree.item(iid, tags=("written",))
+
+    def mark_fresh(self, iid):
+        """
+        Shows a stale row as current again.
+        """
+        if "stale" in self.tree.item(iid, "tags"):
+            self.tree.item(iid, tags=("good",))
+
+    def set_value(self, iid, column, text):
+        """
+        Replaces the text of one column of a row.
+        """
+        self.tree.set(iid, column, text)
+
+    def selection(self):
+        """
+        Returns the item IDs of the selected rows.
+        """
+        return list(self.tree.selection())
+
+    def sort_by(self, column):
+        """
+        Sorts rows by a column. Clicking the same column again reverses the order.
+        Numeric columns sort highest first.
+        """
+        if self._sort_column == column:
+            self._sort_reverse = not self._sort_reverse
+        else:
+            self._sort_column = column
+            self._sort_reverse = column in NUMERIC_COLUMNS
+        self._relayout()
+
+    def _column_values(self, values):
+        return [values.get(column, "") for column, _, _ in COLUMNS]
+
+    def _visible(self, iid):
+        league = self.league_var.get()
+        return league == ALL_LEAGUES or self._rows[iid]["league"] == league
+
+    def _schedule_relayout(self):
+        # Coalesce the re-sorts triggered by a burst of inserts/updates into one pass
+        if not self._relayout_pending:
+            self._relayout_pending = True
+            self.tree.after_idle(self._relayout)
+
+    def _relayout(self):
+        self._relayout_pending = False
+        order = sorted(self._order, key=self._order.get)
+        if self._sort_column is not None:
+            column = self._sort_column
+            order.sort(key=lambda iid: self._rows[iid]["sort"].get(column, 0), reverse=self._sort_reverse)
+            self._order = {iid: position for position, iid in enumerate(order)}
+            self._top, self._bottom = 0, len(order) - 1
+        index = 0
+        for iid in order:
+            if self._visible(iid):
+                self.tree.move(iid, "", index)
+                index += 1
+            else:
+                self.tree.detach(iid)
+
+    def _run(self, callback):
+        selection = self.selection()
+        if selection:
+            callback(selection)
+
+    def _show_menu(self, event):
+        iid = self.tree.identify_row(event.y)
+        if iid and iid not in self.tree.selection():
+            self.tree.selection_set(iid)
+        if self.tree.selection():
+            self.menu.tk_popup(event.x_root, event.y_root)
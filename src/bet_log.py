@@ -0,0 +1,126 @@
+import os
+import sqlite3
+from datetime import datetime
+
+# Format of the days the GUI logs bets under (e.g. "01/31/2025")
+DAY_FORMAT = "%m/%d/%Y"
+
+
+def split_entry(entry):
+    """
+    Splits a legacy log line ("01/31/2025-42.1:11") into (day, bet key).
+    """
+    day, _, bet_key = entry.partition("-")
+    return day, bet_key
+
+
+class BetLog:
+    """
+    The bets already shown, by day, so they aren't shown again.
+
+    Each day is an append-only file of bet keys in a directory ("2025-01-31.txt"). A day is read
+    into a set the first time it is looked up and kept up to date as bets are logged, so lookups
+    are set lookups and startup only reads the days the GUI asks about (today and yesterday),
+    however long the history.
+    """
+
+    def __init__(self, directory, legacy_file=None):
+        """
+        Args:
+            directory (str): The directory holding one file per day, created if missing.
+            legacy_file (str, optional): A single-file log ("day-key" per line) to split into days once;
+                it is renamed with a ".migrated" suffix afterwards.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._days = {}  # day -> set of bet keys, for the days loaded
+        if legacy_file is not None and os.path.exists(legacy_file):
+            self._migrate(legacy_file)
+
+    def _path(self, day):
+        return os.path.join(self.directory, datetime.strptime(day, DAY_FORMAT).strftime("%Y-%m-%d.txt"))
+
+    def _load(self, day):
+        keys = self._days.get(day)
+        if keys is None:
+            try:
+                with open(self._path(day)) as f:
+                    keys = set(f.read().splitlines())
+            except FileNotFoundError:
+                keys = set()
+            self._days[day] = keys
+        return keys
+
+    def is_logged(self, day, bet_key):
+        """
+        Returns whether a bet was logged on a day.
+        """
+        return bet_key in self._load(day)
+
+    def log(self, day, bet_key):
+        """
+        Logs a bet under a day.
+        """
+        keys = self._load(day)
+        if bet_key not in keys:
+            with open(self._path(day), "a") as f:
+                f.write(f"{bet_key}\n")
+            keys.add(bet_key)
+
+    def _migrate(self, legacy_file):
+        days = {}
+        with open(legacy_file) as f:
+            for line in f.read().splitlines():
+                day, bet_key = split_entry(line)
+                if bet_key:
+                    days.setdefault(day, []).append(bet_key)
+        for day, bet_keys in days.items():
+            try:
+                logged = self._load(day)
+            except ValueError:
+                print(f"Skipping {len(bet_keys)} logged bets with an invalid day: {day}")
+                continue
+            new_keys = [key for key in dict.fromkeys(bet_keys) if key not in logged]
+            if new_keys:
+                with open(self._path(day), "a") as f:
+                    f.write("".join(f"{key}\n" for key in new_keys))
+                logged.update(new_keys)
+        os.replace(legacy_file, f"{legacy_file}.migrated")
+        self._days.clear()
+
+
+class SqliteBetLog:
+    """
+    BetLog backed by a SQLite table indexed by (day, bet key), for keeping the log in one file.
+
+    Lookups go to the index, so nothing is loaded up front.
+    """
+
+    def __init__(self, path, legacy_file=None):
+        """
+        Args:
+            path (str): The database file, created if missing.
+            legacy_file (str, optional): A single-file log to import once; see BetLog.
+        """
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS logged_bets (day TEXT NOT NULL, bet_key TEXT NOT NULL, "
+            "PRIMARY KEY (day, bet_key)) WITHOUT ROWID")
+        if legacy_file is not None and os.path.exists(legacy_file):
+            with open(legacy_file) as f:
+                entries = [split_entry(line) for line in f.read().splitlines()]
+            with self._connection:
+                self._connection.executemany("INSERT OR IGNORE INTO logged_bets VALUES (?, ?)",
+                                             [entry for entry in entries if entry[1]])
+            os.replace(legacy_file, f"{legacy_file}.migrated")
+
+    def is_logged(self, day, bet_key):
+        return self._connection.execute(
+            "SELECT 1 FROM logged_bets WHERE day = ? AND bet_key = ?", (day, bet_key)).fetchone() is not None
+
+    def log(self, day, bet_key):
+        with self._connection:
+            self._connection.execute("INSERT OR IGNORE INTO logged_bets VALUES (?, ?)", (day, bet_key))
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,78 @@
+class BetRegistry:
+    """
+    Index of the bets currently displayed, keyed by wager key.
+
+    Each entry holds the widget (or list item ID) showing the bet, the row that gets written to the
+    sheet, the league and the latest (wager, ev, risk_percentage), so looking up, updating or
+    removing a bet is a single dict operation.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def add(self, key, frame, row_data, league, bet=None):
+        """
+        Registers a displayed bet.
+
+        Args:
+            key (tuple): The wager key.
+            frame: The widget or list item ID displaying the bet.
+            row_data (list): The row to write to the sheet.
+            league (str): The league of the bet.
+            bet (tuple, optional): The (wager, ev, risk_percentage) being displayed.
+        """
+        self._entries[key] = [frame, row_data, league, bet]
+
+    def update(self, key, row_data, bet=None):
+        """
+        Replaces the sheet row (and optionally the displayed bet) of a displayed bet.
+
+        Args:
+            key (tuple): The wager key.
+            row_data (list): The new row to write to the sheet.
+            bet (tuple, optional): The new (wager, ev, risk_percentage).
+        """
+        entry = self._entries[key]
+        entry[1] = row_data
+        if bet is not None:
+            entry[3] = bet
+
+    def remove(self, key):
+        """
+        Unregisters a bet.
+
+        Args:
+            key (tuple): The wager key.
+
+        Returns:
+            The widget that was displaying the bet, or None if the bet was not registered.
+        """
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def frame(self, key):
+        """
+        Returns the widget or list item ID displaying a bet, or None if the bet is not displayed.
+        """
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def data(self, key):
+        """
+        Returns the (row_data, league) of a displayed bet, or None if the bet is not displayed.
+        """
+        entry = self._entries.get(key)
+        return (entry[1], entry[2]) if entry else None
+
+    def bet(self, key):
+        """
+        Returns the (wager, ev, risk_percentage) of a displayed bet, or None if the bet is not displayed.
+        """
+        entry = self._entries.get(key)
+        return entry[3] if entry else None
@@ -0,0 +1,151 @@
+import csv
+import json
+import sqlite3
+import time
+
+from src.sheet_operations import open_worksheet
+
+# Column the league of each bet is written to (H)
+LEAGUE_COLUMN = 8
+# Default files of the local sinks
+CSV_FILE = "bets.csv"
+SQLITE_FILE = "bets.db"
+
+
+def column_letter(column):
+    """
+    Returns the A1 letter of a 1-based column number (e.g. 8 -> "H").
+    """
+    letters = ""
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+class SheetsSink:
+    """
+    Writes bets to a Google Sheets worksheet.
+
+    The rows of a batch are appended with one append_rows() call and the league column is filled with
+    one batch_update(). The next empty row of that column is read once per connection and then tracked
+    locally. The worksheet is opened by the first write, not when the sink is created.
+    """
+
+    def __init__(self, connect, column=LEAGUE_COLUMN):
+        """
+        Args:
+            connect (callable): Opens the gspread worksheet (or anything with append_rows, col_values
+                and batch_update) to write to, e.g. sheet_operations.open_worksheet.
+            column (int): The 1-based column the second value of each bet goes to.
+        """
+        self._connect = connect
+        self.column = column
+        self._worksheet = None
+        self._next_row = None  # next empty row of the column, or None to read it from the sheet
+        self._appended = None  # the rows of a batch whose column failed, so a retry doesn't append them again
+
+    def write(self, rows, column_values):
+        """
+        Writes a batch of bets.
+
+        Args:
+            rows (list): The rows to append.
+            column_values (list): The values written to the first empty cells of the column, one per row.
+        """
+        if self._worksheet is None:
+            self._worksheet = self._connect()
+            self._next_row = None
+        if self._appended is not rows:
+            self._worksheet.append_rows(rows, value_input_option="USER_ENTERED")
+            self._appended = rows
+        if self._next_row is None:
+            self._next_row = len(self._worksheet.col_values(self.column)) + 1
+        letter = column_letter(self.column)
+        first, last = self._next_row, self._next_row + len(column_values) - 1
+        self._worksheet.batch_update([{"range": f"{letter}{first}:{letter}{last}",
+                                       "values": [[value] for value in column_values]}])
+        self._next_row = last + 1
+        self._appended = None
+
+    def reset(self):
+        """
+        Drops the connection after a failed write, so the next write reconnects (e.g. with refreshed
+        credentials) and reads the column again.
+        """
+        self._worksheet = None
+
+
+class CsvSink:
+    """
+    Appends bets to a CSV file, each row followed by its column value (padded to the column).
+    """
+
+    def __init__(self, path=CSV_FILE, column=LEAGUE_COLUMN):
+        self.path = path
+        self.column = column
+
+    def write(self, rows, column_values):
+        with open(self.path, "a", newline="") as f:
+            writer = csv.writer(f)
+            for row, value in zip(rows, column_values):
+                writer.writerow(list(row) + [""] * (self.column - 1 - len(row)) + [value])
+
+    def reset(self):
+        pass
+
+
+class SqliteSink:
+    """
+    Appends bets to a SQLite table: the row as a JSON array, the column value and when it was written.
+    """
+
+    def __init__(self, path=SQLITE_FILE, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._connection = None
+
+    def write(self, rows, column_values):
+        # Connected by the first write, on the thread that writes
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS bets (id INTEGER PRIMARY KEY, written_at REAL NOT NULL, "
+                "row TEXT NOT NULL, league TEXT)")
+        now = self._clock()
+        with self._connection:
+            self._connection.executemany("INSERT INTO bets (written_at, row, league) VALUES (?, ?, ?)",
+                                         [(now, json.dumps(row), value)
+                                          for row, value in zip(rows, column_values)])
+
+    def rows(self):
+        """
+        Returns the (row, column value) of every bet written, in order.
+        """
+        connection = sqlite3.connect(self.path)
+        try:
+            return [(json.loads(row), value)
+                    for row, value in connection.execute("SELECT row, league FROM bets ORDER BY id")]
+        finally:
+            connection.close()
+
+    def reset(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def make_sink(name):
+    """
+    Returns the sink bets are written to: "sheets" (the Google sheet), "csv" or "sqlite".
+
+    Raises:
+        ValueError: If the name isn't one of those.
+    """
+    if name == "sheets":
+        return SheetsSink(open_worksheet)
+    if name == "csv":
+        return CsvSink()
+    if name == "sqlite":
+        return SqliteSink()
+    raise ValueError(f"Unknown sink: {name}")
@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+from src.devig import DevigMethod
+
+# kind: "add", "update" or "remove"
+# key: the wager key
+# bet: the (wager, ev, risk_percentage) added or updated, or the last one seen for a removal
+BetEvent = namedtuple("BetEvent", ["kind", "key", "bet"])
+
+
+def row_prices(table):
+    """
+    Returns what each row's bet is computed from besides its key (which holds the line), in a single
+    column pass: (FanDuel odds, Pinnacle odds, opposing odds, third odds, limit) per row.
+    """
+    return zip(table.fanduel_odds, table.pinnacle_odds, table.pinnacle_opposing_odds,
+               table.pinnacle_third_odds, table.limit)
+
+
+class DeltaEngine:
+    """
+    Turns each league's matched wagers into add, update and remove events against the last cycle.
+
+    Rows are compared with the last cycle's by key (FanDuel market, selection and line) and prices.
+    Only new rows and rows whose prices changed are devigged, filtered and materialized as Wager
+    objects; unchanged rows keep their last result. So beyond matching, a cycle costs in proportion
+    to what moved rather than to the slate, and consumers only redraw the bets in the events.
+    """
+
+    def __init__(self):
+        self._leagues = {}  # league -> {key: (prices, bet or None if the row isn't a good bet)}
+        self._settings = None  # (devig method, select) the stored results were computed with
+
+    def apply(self, league, table, devig_method=DevigMethod.POWER, select=None):
+        """
+        Takes a league's fresh WagerTable.
+
+        Args:
+            league (str): The league the table holds.
+            table (WagerTable): The league's matched wagers.
+            devig_method (DevigMethod): The method to use for devigging.
+            select (callable, optional): Filters positive EV rows further: called with the table and
+                row indices, returns the indices to keep (e.g. good_bet_rows).
+
+        Returns:
+            tuple: (the league's (wager, ev, risk_percentage) bets sorted by risk percentage, list of
+                BetEvents).
+        """
+        if self._settings != (devig_method, select):
+            # Results computed another way can't be reused
+            self._leagues.clear()
+            self._settings = (devig_method, select)
+        previous = self._leagues.get(league, {})
+        current = {}
+        changed = []
+        keys = table.keys()
+        for i, (key, prices) in enumerate(zip(keys, row_prices(table))):
+            entry = previous.get(key)
+            if entry is not None and entry[0] == prices:
+                current[key] = entry
+            else:
+                current[key] = (prices, None)
+                changed.append(i)
+        if changed:
+            table.evaluate(devig_method, changed)
+            ev = table.ev
+            indices = [i for i in changed if ev[i] > 0]
+            if select is not None:
+                indices = select(table, indices)
+            for i, bet in zip(indices, table.bets(indices)):
+                key = bet[0].key
+                current[key] = (current[key][0], bet)
+
+        # Unchanged rows kept their bet, so only changed and vanished rows can produce events
+        events = []
+        for key in dict.fromkeys(keys[i] for i in changed):
+            bet = current[key][1]
+            entry = previous.get(key)
+            last = entry[1] if entry is not None else None
+            if bet is None and last is None:
+                continue
+            if bet is None:
+                events.append(BetEvent("remove", key, last))
+            elif last is None:
+                events.append(BetEvent("add", key, bet))
+            else:
+                events.append(BetEvent("update", key, bet))
+        for key in previous.keys() - current.keys():
+            last = previous[key][1]
+            if last is not None:
+                events.append(BetEvent("remove", key, last))
+        self._leagues[league] = current
+
+        good_bets = [bet for _, bet in current.values() if bet is not None]
+        good_bets.sort(key=lambda bet: bet[2], reverse=True)
+        return good_bets, events
+
+    def clear(self, league):
+        """
+        Forgets a league (e.g. it has no games coming up).
+
+        Returns:
+            list: Remove BetEvents for its bets.
+        """
+        return [BetEvent("remove", key, bet) for key, (_, bet) in self._leagues.pop(league, {}).items()
+                if bet is not None]
@@ -110,3 +110,17 @@ def kelly_criterion(true_prob, fanduel_prob):
         float: The optimal bet size as a fraction of the bankroll.
     """
     return true_prob - (1 - true_prob) / (1 / fanduel_prob - 1)
+
+
+def bet_amount(risk_percentage, bankroll):
+    """
+    Returns the stake for a risk percentage of a bankroll, rounded up to the nearest $0.50.
+
+    Args:
+        risk_percentage (float): The percentage of the bankroll to risk.
+        bankroll (float): The bankroll.
+
+    Returns:
+        float: The stake in dollars.
+    """
+    return int(2 * risk_percentage / 100 * bankroll + 1) / 2
@@ -0,0 +1,74 @@
+import os
+import pickle
+import time
+
+# Scans older than this aren't shown at startup: their games have likely started
+MAX_AGE = 12 * 60 * 60
+
+
+class LastScan:
+    """
+    The good bets of each league's most recent scan, kept in a file so the next start can show them
+    before its first scrape finishes.
+
+    The file is a pickle of {"leagues": {league: (scan time, [(wager, ev, risk_percentage), ...])}},
+    replaced atomically by save().
+    """
+
+    def __init__(self, path, max_age=MAX_AGE, clock=time.time):
+        """
+        Args:
+            path (str): The file to read and write.
+            max_age (float): How old a league's scan may be to be loaded, in seconds.
+            clock (callable): Returns the current time in seconds since the epoch.
+        """
+        self.path = path
+        self.max_age = max_age
+        self._clock = clock
+        self.leagues = {}  # league -> (scan time, good bets)
+
+    def load(self, now=None):
+        """
+        Reads the file, keeping the leagues scanned within max_age. A missing or unreadable file
+        loads nothing.
+
+        Returns:
+            dict: League -> (scan time, good bets) of the leagues loaded.
+        """
+        now = self._clock() if now is None else now
+        try:
+            with open(self.path, "rb") as f:
+                leagues = pickle.load(f)["leagues"]
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Could not load the last scan from {self.path}: {e}")
+            return {}
+        self.leagues = {league: (scanned_at, good_bets) for league, (scanned_at, good_bets) in leagues.items()
+                        if now - scanned_at <= self.max_age}
+        return dict(self.leagues)
+
+    def update(self, league, good_bets, now=None):
+        """
+        Replaces a league's good bets with those of a new scan.
+        """
+        self.leagues[league] = (self._clock() if now is None else now, list(good_bets))
+
+    def save(self):
+        """
+        Writes every league's latest good bets to the file.
+        """
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump({"leagues": self.leagues}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path)
+
+
+def age_text(seconds):
+    """
+    Formats how long ago a scan ran, e.g. "45s old", "12m old" or "3h old".
+    """
+    if seconds < 60:
+        return f"{seconds:.0f}s old"
+    if seconds < 60 * 60:
+        return f"{seconds / 60:.0f}m old"
+    return f"{seconds / 3600:.0f}h old"
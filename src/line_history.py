@@ -0,0 +1,197 @@
+import time
+from array import array
+from collections import namedtuple
+from datetime import datetime
+
+from src.devig import american_to_probability
+
+# Line movements kept per market; older ones are overwritten
+HISTORY_LENGTH = 32
+# Markets kept; the ones not seen for the longest are dropped first (their games are over)
+MAX_MARKETS = 20000
+# A move of Pinnacle's implied probability (e.g. 0.02 is two percentage points) within STEAM_WINDOW
+# seconds while FanDuel's odds stay put is steam
+STEAM_THRESHOLD = 0.02
+STEAM_WINDOW = 15 * 60
+
+# One line movement, materialized from a LineBuffer's arrays when read
+LineTick = namedtuple("LineTick", ["timestamp", "pinnacle_odds", "fanduel_odds", "limit"])
+
+# key: the wager key
+# league, bet: of the wager, for display
+# since: when the Pinnacle price the move started from was seen (seconds since the epoch)
+# pinnacle_before, pinnacle_odds: Pinnacle's odds then and now
+# fanduel_odds: FanDuel's odds, unchanged since
+# move: the change of Pinnacle's implied probability (positive: the selection got shorter, so
+#       FanDuel's price is now better value)
+SteamAlert = namedtuple("SteamAlert", ["key", "league", "bet", "since", "pinnacle_before", "pinnacle_odds",
+                                       "fanduel_odds", "move"])
+
+
+class LineBuffer:
+    """
+    A fixed-size ring buffer of one market's line movements. Each field is a typed array, so a tick
+    costs a few machine words instead of an object; the arrays grow up to the capacity, then the
+    oldest tick is overwritten.
+    """
+    __slots__ = ("capacity", "start", "newest", "seen", "times", "pinnacle_odds", "fanduel_odds", "limits")
+
+    def __init__(self, capacity=HISTORY_LENGTH):
+        self.capacity = capacity
+        self.start = 0  # array index of the oldest tick
+        self.newest = -1  # array index of the newest tick
+        self.seen = 0.0  # when the market was last recorded, ticked or not
+        self.times = array('d')
+        self.pinnacle_odds = array('l')
+        self.fanduel_odds = array('l')
+        self.limits = array('d')
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, timestamp, pinnacle_odds, fanduel_odds, limit):
+        if len(self.times) < self.capacity:
+            self.times.append(timestamp)
+            self.pinnacle_odds.append(pinnacle_odds)
+            self.fanduel_odds.append(fanduel_odds)
+            self.limits.append(limit)
+            self.newest += 1
+            return
+        i = self.start
+        self.times[i] = timestamp
+        self.pinnacle_odds[i] = pinnacle_odds
+        self.fanduel_odds[i] = fanduel_odds
+        self.limits[i] = limit
+        self.newest = i
+        self.start = (i + 1) % self.capacity
+
+    def index(self, n):
+        """
+        Returns the array index of the nth tick, oldest first (negative n counts from the newest).
+        """
+        return (self.start + n) % len(self.times)
+
+    def tick(self, n):
+        i = self.index(n)
+        return LineTick(self.times[i], self.pinnacle_odds[i], self.fanduel_odds[i], self.limits[i])
+
+    def ticks(self):
+        """
+        Returns the LineTicks, oldest first.
+        """
+        return [self.tick(n) for n in range(len(self))]
+
+
+class LineHistory:
+    """
+    Recent line movements of every matched market, and steam alerts.
+
+    record() is fed every league's WagerTable each cycle. A market gets a tick when its Pinnacle
+    odds, FanDuel odds or Pinnacle limit differ from its last tick, so a quiet market costs nothing
+    more over the day. When Pinnacle's price of a market moves by the threshold within the window
+    while FanDuel's doesn't move, record() returns a SteamAlert.
+
+    Memory is bounded by max_markets buffers of capacity ticks each, whatever the polling rate.
+    """
+
+    def __init__(self, capacity=HISTORY_LENGTH, max_markets=MAX_MARKETS, threshold=STEAM_THRESHOLD,
+                 window=STEAM_WINDOW, clock=time.time):
+        """
+        Args:
+            capacity (int): Line movements kept per market.
+            max_markets (int): Markets kept; the least recently seen are dropped first.
+            threshold (float): The move of Pinnacle's implied probability that is steam.
+            window (float): Seconds the move has to happen in.
+            clock (callable): Returns the current time in seconds since the epoch.
+        """
+        self.capacity = capacity
+        self.max_markets = max_markets
+        self.threshold = threshold
+        self.window = window
+        self._clock = clock
+        self._markets = {}  # wager key -> LineBuffer
+
+    def __len__(self):
+        return len(self._markets)
+
+    def ticks(self, key):
+        """
+        Returns a market's LineTicks, oldest first (empty if it isn't kept).
+        """
+        buffer = self._markets.get(key)
+        return buffer.ticks() if buffer is not None else []
+
+    def record(self, league, table):
+        """
+        Records a league's prices.
+
+        Args:
+            league (str): The league the table holds.
+            table (WagerTable): The league's matched wagers.
+
+        Returns:
+            list: The SteamAlerts of the markets Pinnacle just moved on.
+        """
+        now = self._clock()
+        markets = self._markets
+        alerts = []
+        rows = zip(table.keys(), table.pinnacle_odds, table.fanduel_odds, table.limit)
+        for i, (key, pinnacle_odds, fanduel_odds, limit) in enumerate(rows):
+            buffer = markets.get(key)
+            if buffer is None:
+                buffer = markets[key] = LineBuffer(self.capacity)
+                buffer.seen = now
+                buffer.append(now, pinnacle_odds, fanduel_odds, limit)
+                continue
+            buffer.seen = now
+            last = buffer.newest
+            pinnacle_before = buffer.pinnacle_odds[last]
+            if (pinnacle_before == pinnacle_odds and buffer.fanduel_odds[last] == fanduel_odds and
+                    buffer.limits[last] == limit):
+                continue
+            buffer.append(now, pinnacle_odds, fanduel_odds, limit)
+            if pinnacle_before != pinnacle_odds:
+                alert = self.steam(buffer, now)
+                if alert is not None:
+                    since, pinnacle_before, move = alert
+                    alerts.append(SteamAlert(key, league, table.wager(i).pretty(), since, pinnacle_before,
+                                             pinnacle_odds, fanduel_odds, move))
+        if len(markets) > self.max_markets:
+            # Drop a tenth more than needed, so the sort only runs every so many cycles
+            excess = len(markets) - self.max_markets + self.max_markets // 10
+            for key in sorted(markets, key=lambda key: markets[key].seen)[:excess]:
+                del markets[key]
+        return alerts
+
+    def steam(self, buffer, now):
+        """
+        Checks a market's newest tick for steam.
+
+        Returns:
+            tuple: (when the window's starting price was seen, Pinnacle's odds then, the move of its
+                implied probability), or None if Pinnacle didn't move enough or FanDuel moved too.
+        """
+        newest = buffer.newest
+        fanduel_odds = buffer.fanduel_odds[newest]
+        start = now - self.window
+        # Walk back to the price standing when the window started (or the oldest one kept)
+        for n in range(len(buffer) - 2, -1, -1):
+            i = buffer.index(n)
+            if buffer.fanduel_odds[i] != fanduel_odds:
+                return None
+            if buffer.times[i] <= start:
+                break
+        move = (american_to_probability(buffer.pinnacle_odds[newest]) -
+                american_to_probability(buffer.pinnacle_odds[i]))
+        if abs(move) < self.threshold:
+            return None
+        return buffer.times[i], buffer.pinnacle_odds[i], move
+
+
+def alert_text(alert):
+    """
+    Returns a one-line description of a SteamAlert.
+    """
+    since = datetime.fromtimestamp(alert.since).strftime('%I:%M %p')
+    return (f"{alert.league} {alert.bet}: Pinnacle {alert.pinnacle_before:+d} -> {alert.pinnacle_odds:+d} "
+            f"({alert.move * 100:+.1f} pts) since {since}, FanDuel still {alert.fanduel_odds:+d}")
@@ -0,0 +1,253 @@
+import json
+import threading
+from collections import deque, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# How many deltas are kept for clients reconnecting with Last-Event-ID; further behind gets a snapshot
+DELTA_BACKLOG = 10000
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE = 15.0
+
+# version: the board version the delta produced (the event ID of the stream)
+# league, market: of the bet, for filtering
+# ev: the highest EV of the bet before and after the change, for filtering
+# event: the encoded server-sent event, shared by every client
+Delta = namedtuple("Delta", ["version", "league", "market", "ev", "event"])
+
+
+class OpportunityFilter:
+    """
+    Which opportunities a client asked for: some leagues, some market types (wager class names,
+    e.g. "Moneyline") and a minimum EV. Empty means any.
+    """
+
+    def __init__(self, leagues=(), markets=(), min_ev=None):
+        self.leagues = frozenset(leagues)
+        self.markets = frozenset(markets)
+        self.min_ev = min_ev
+
+    @classmethod
+    def from_query(cls, query):
+        """
+        Parses a query string: league=NBA,NHL&market=Moneyline&min_ev=2.5.
+
+        Raises:
+            ValueError: If min_ev isn't a number.
+        """
+        params = parse_qs(query)
+
+        def values(name):
+            return [value for param in params.get(name, []) for value in param.split(",") if value]
+
+        min_ev = params.get("min_ev")
+        return cls(values("league"), values("market"), float(min_ev[-1]) if min_ev else None)
+
+    def selects_all(self):
+        return not self.leagues and not self.markets and self.min_ev is None
+
+    def matches(self, league, market, ev):
+        return ((not self.leagues or league in self.leagues) and
+                (not self.markets or market in self.markets) and
+                (self.min_ev is None or ev >= self.min_ev))
+
+
+def server_sent_event(event, version, data):
+    return f"id: {version}\nevent: {event}\ndata: ".encode() + data + b"\n\n"
+
+
+class OpportunityBoard:
+    """
+    The current good bets of every league, and the deltas between scans, served to many clients.
+
+    update_league() replaces a league's bets with a fresh scan's records and turns the difference
+    into add, update and remove deltas. Every record and every delta is encoded to JSON once, when
+    it changes; snapshots join the encoded records (the unfiltered one is cached per version) and
+    event streams send the encoded deltas, so the cost of a scan doesn't grow with the clients.
+    """
+
+    def __init__(self, backlog=DELTA_BACKLOG):
+        """
+        Args:
+            backlog (int): How many deltas are kept for clients catching up.
+        """
+        self.version = 0
+        self.metrics = None  # the last cycle's metrics record
+        self.closed = False
+        self._bets = {}  # key -> (record, encoded record)
+        self._leagues = {}  # league -> keys of its bets
+        self._deltas = deque(maxlen=backlog)
+        self._ranked = None  # (version, keys by risk percentage, unfiltered snapshot) when computed
+        self._changed = threading.Condition()
+
+    def update_league(self, league, records):
+        """
+        Replaces a league's bets.
+
+        Args:
+            league (str): The league scanned.
+            records (list): The records of its good bets (dicts with at least key, league, market,
+                ev and risk_percentage).
+        """
+        with self._changed:
+            keys = []
+            for record in records:
+                key = record["key"]
+                keys.append(key)
+                previous = self._bets.get(key)
+                if previous is not None and previous[0] == record:
+                    continue
+                encoded = json.dumps(record).encode()
+                self._bets[key] = (record, encoded)
+                if previous is None:
+                    self._add_delta("add", record, record["ev"], encoded)
+                else:
+                    self._add_delta("update", record, max(record["ev"], previous[0]["ev"]), encoded)
+            current = set(keys)
+            for key in self._leagues.get(league, ()):
+                if key not in current:
+                    record, encoded = self._bets.pop(key)
+                    self._add_delta("remove", record, record["ev"], encoded)
+            self._leagues[league] = keys
+            self._changed.notify_all()
+
+    def _add_delta(self, op, record, ev, encoded):
+        self.version += 1
+        data = b'{"op": "' + op.encode() + b'", "bet": ' + encoded + b'}'
+        self._deltas.append(Delta(self.version, record["league"], record["market"], ev,
+                                  server_sent_event("delta", self.version, data)))
+
+    def snapshot(self, opportunity_filter=None):
+        """
+        Returns the board version and the JSON of the bets matching a filter, by risk percentage.
+        """
+        with self._changed:
+            if self._ranked is None or self._ranked[0] != self.version:
+                keys = sorted(self._bets, key=lambda key: self._bets[key][0]["risk_percentage"], reverse=True)
+                self._ranked = (self.version, keys, self._join(keys))
+            version, keys, unfiltered = self._ranked
+            if opportunity_filter is None or opportunity_filter.selects_all():
+                return version, unfiltered
+            return version, self._join([key for key in keys if opportunity_filter.matches(
+                self._bets[key][0]["league"], self._bets[key][0]["market"], self._bets[key][0]["ev"])])
+
+    def _join(self, keys):
+        return (b'{"version": ' + str(self.version).encode() + b', "opportunities": [' +
+                b", ".join(self._bets[key][1] for key in keys) + b"]}")
+
+    def deltas(self, since, timeout=None):
+        """
+        Waits for changes after a version.
+
+        Returns:
+            list: The Deltas after the version (empty if the timeout expired), or None if they are no
+                longer all kept (or the board is closed), in which case the client needs a snapshot.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != since or self.closed, timeout)
+            if self.closed or since > self.version:
+                # since > version: an event ID from before the server restarted
+                return None
+            if self.version > since and (not self._deltas or self._deltas[0].version > since + 1):
+                return None
+            return [delta for delta in self._deltas if delta.version > since]
+
+    def close(self):
+        """
+        Ends the event streams.
+        """
+        with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+
+
+class OpportunityRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /opportunities: the snapshot, as JSON. GET /stream: a snapshot event, then delta events as
+    server-sent events. Both take the filter query (league, market, min_ev). GET /metrics: the last
+    cycle's metrics.
+    """
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            opportunity_filter = OpportunityFilter.from_query(url.query)
+        except ValueError:
+            self.send_error(400, "min_ev must be a number")
+            return
+        if url.path == "/opportunities":
+            _, body = self.server.board.snapshot(opportunity_filter)
+            self._send_json(body)
+        elif url.path == "/metrics":
+            self._send_json(json.dumps(self.server.board.metrics).encode())
+        elif url.path == "/stream":
+            self._stream(opportunity_filter)
+        else:
+            self.send_error(404)
+
+    def _send_json(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, opportunity_filter):
+        board = self.server.board
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        last_event = self.headers.get("Last-Event-ID")
+        version = int(last_event) if last_event and last_event.isdigit() else None
+        try:
+            deltas = board.deltas(version, timeout=0) if version is not None else None
+            while not board.closed:
+                if deltas is None:
+                    version, snapshot = board.snapshot(opportunity_filter)
+                    self.wfile.write(server_sent_event("snapshot", version, snapshot))
+                elif not deltas:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    self.wfile.write(b"".join(delta.event for delta in deltas if opportunity_filter.matches(
+                        delta.league, delta.market, delta.ev)))
+                    version = deltas[-1].version
+                self.wfile.flush()
+                deltas = board.deltas(version, timeout=self.server.keepalive)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        # Requests aren't logged: stdout may be the JSON lines output
+        pass
+
+
+class OpportunityServer(ThreadingHTTPServer):
+    """
+    Serves an OpportunityBoard over HTTP, one thread per client.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, board, keepalive=KEEPALIVE):
+        """
+        Args:
+            address (tuple): The (host, port) to listen on; port 0 picks a free one.
+            board (OpportunityBoard): The opportunities to serve.
+            keepalive (float): Seconds between keep-alive comments on an idle event stream.
+        """
+        super().__init__(address, OpportunityRequestHandler)
+        self.board = board
+        self.keepalive = keepalive
+
+    def start(self):
+        """
+        Serves on a background thread.
+        """
+        thread = threading.Thread(target=self.serve_forever, name="opportunity-server", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.board.close()
+        self.shutdown()
+        self.server_close()
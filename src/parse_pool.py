@@ -0,0 +1,124 @@
+import json
+import marshal
+import os
+from concurrent.futures import Future
+
+from src.scrape import ScrapeResult
+
+# Worker processes used by default, one per core
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+class ResponseRecorder:
+    """
+    Stands in for a fetcher's request function (get_response or get_response_no_params): sends the
+    request, keeps the undecoded body and returns None, so the fetcher stops before parsing anything.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.payloads = []  # response bodies (bytes), or None for a failed request, in request order
+
+    def __call__(self, *args):
+        self.payloads.append(self.request(*args, raw=True))
+        return None
+
+
+class ResponseReplay:
+    """
+    Stands in for a fetcher's request function in a worker: returns the recorded responses, decoded,
+    in the order they were requested.
+    """
+
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+
+    def __call__(self, *args):
+        return json.loads(self.payloads.pop(0))
+
+
+def parse_league(fetcher, payloads, kwargs):
+    """
+    Runs a fetcher on recorded responses. Executed in a worker process.
+
+    Returns:
+        bytes: The fetcher's result and the start times of a ScrapeResult (None otherwise),
+            marshalled; they are only dicts, lists, strings and numbers, which marshal encodes and
+            decodes faster than pickle.
+    """
+    result = fetcher(request=ResponseReplay(payloads), **kwargs)
+    if isinstance(result, ScrapeResult):
+        return marshal.dumps((dict(result), result.start_times))
+    return marshal.dumps((result, None))
+
+
+class ParsePool:
+    """
+    Moves the parsing of league payloads (JSON decoding, process_matchups/process_markets,
+    process_fanduel_rows/process_fanduel_markets) to worker processes, so big leagues are parsed
+    on other cores while the scan thread downloads the next ones.
+
+    fetch() sends a fetcher's requests in the calling thread and hands the raw response bodies to a
+    worker, which runs the same fetcher on them. Works with any fetcher that takes a request
+    function, i.e. every pinnacle_* and fanduel_* fetcher. The workers are started on first use.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        """
+        Args:
+            workers (int): The number of worker processes.
+        """
+        self.workers = workers
+        self._executor = None
+
+    def fetch(self, fetcher, request, **kwargs):
+        """
+        Downloads a league from one book and submits it for parsing.
+
+        Args:
+            fetcher (callable): A module-level fetcher, e.g. pinnacle_nba or fanduel_nba.
+            request (callable): The request function the fetcher uses (get_response or
+                get_response_no_params).
+            **kwargs: Passed on to the fetcher (e.g. market_types).
+
+        Returns:
+            Future: Resolves to whatever the fetcher returns; see result().
+        """
+        recorder = ResponseRecorder(request)
+        failed = fetcher(request=recorder, **kwargs)
+        if None in recorder.payloads:
+            # A request failed, so there is nothing to parse: the fetcher has already returned
+            # what it returns without data
+            future = Future()
+            future.set_result(marshal.dumps((failed, None)))
+            return future
+        if self._executor is None:
+            # Imported here: it pulls in multiprocessing, which the app only needs with parse workers
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor.submit(parse_league, fetcher, recorder.payloads, kwargs)
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def is_parsed(value):
+    """
+    Returns whether a value returned by a fetcher or by ParsePool.fetch() can be taken without waiting.
+    """
+    return not isinstance(value, Future) or value.done()
+
+
+def parsed(value):
+    """
+    Returns a fetcher's result, waiting for the pool if the value came from ParsePool.fetch().
+    """
+    if not isinstance(value, Future):
+        return value
+    result, start_times = marshal.loads(value.result())
+    return result if start_times is None else ScrapeResult(result, start_times)
@@ -0,0 +1,206 @@
+import heapq
+import time
+from collections import deque
+
+# (hours until the league's next start, seconds between polls); the first matching row wins
+START_INTERVALS = [
+    (1, 5 * 60),
+    (3, 10 * 60),
+    (24, 30 * 60),
+]
+# Leagues with nothing starting in the next 24 hours are only polled to pick up new listings
+IDLE_INTERVAL = 3 * 60 * 60
+# Leagues whose Pinnacle lines moved since the previous poll are polled twice as often, down to this
+MIN_INTERVAL = 2 * 60
+# Interval for a league that has been requested but not observed yet, and the longest a league whose
+# scan failed waits to be retried
+DEFAULT_INTERVAL = 30 * 60
+
+# Requests one league poll costs: Pinnacle matchups + markets, and one FanDuel page
+REQUESTS_PER_LEAGUE = 3
+# Global cap on requests per BUDGET_WINDOW seconds. Polling all 19 leagues every 30 minutes,
+# as the app used to, is 114 requests an hour
+DEFAULT_BUDGET = 120
+BUDGET_WINDOW = 60 * 60
+
+
+class PollScheduler:
+    """
+    Decides which leagues to scrape next.
+
+    Leagues sit in a priority queue keyed by the time they are next due. After each poll a league
+    is rescheduled from the start time of its next event and from whether its Pinnacle lines moved,
+    so leagues with games about to start or moving lines are polled often and empty leagues rarely.
+    pop_due() never hands out more requests than the budget allows per window; leagues that don't
+    fit stay due and go out as soon as the window frees up.
+    """
+
+    def __init__(self, leagues, budget=DEFAULT_BUDGET, window=BUDGET_WINDOW,
+                 requests_per_league=REQUESTS_PER_LEAGUE, clock=time.time):
+        """
+        Args:
+            leagues (list): The league labels to schedule. All of them are due immediately.
+            budget (int): The maximum number of requests per window.
+            window (float): The budget window, in seconds.
+            requests_per_league (int): The number of requests one league poll costs.
+            clock (callable): Returns the current time in seconds since the epoch.
+        """
+        self.budget = budget
+        self.window = window
+        self.requests_per_league = requests_per_league
+        self._clock = clock
+        now = clock()
+        self._due = {}  # league -> time it is next due
+        self._heap = []  # (due time, order, league); entries whose time no longer matches _due are stale
+        self._order = 0
+        self._sent = deque()  # (time, requests) of polls inside the budget window
+        self._prices = {}  # league -> {wager key: Pinnacle odds} from the last poll
+        self.moved = {}  # league -> number of Pinnacle prices that moved in the last poll
+        self.next_start = {}  # league -> start time of the league's next event, or None
+        for league in leagues:
+            self._schedule(league, now)
+
+    def __len__(self):
+        return len(self._due)
+
+    def due_at(self, league):
+        """
+        Returns the time a league is next due.
+        """
+        return self._due[league]
+
+    def requests_in_window(self, now=None):
+        """
+        Returns the number of requests sent by polls in the current budget window.
+        """
+        now = self._clock() if now is None else now
+        while self._sent and self._sent[0][0] <= now - self.window:
+            self._sent.popleft()
+        return sum(requests for _, requests in self._sent)
+
+    def pop_due(self, now=None):
+        """
+        Takes the leagues that are due, soonest first, as long as the budget allows.
+
+        Each league taken is provisionally rescheduled DEFAULT_INTERVAL ahead, so a poll that
+        never reports back (observe()) doesn't drop the league from the schedule.
+
+        Returns:
+            list: The league labels to poll now.
+        """
+        now = self._clock() if now is None else now
+        available = self.budget - self.requests_in_window(now)
+        leagues = []
+        while self._heap and self._heap[0][0] <= now and available >= self.requests_per_league:
+            due, _, league = heapq.heappop(self._heap)
+            if self._due.get(league) != due:
+                continue
+            leagues.append(league)
+            available -= self.requests_per_league
+            self._schedule(league, now + DEFAULT_INTERVAL)
+        if leagues:
+            self._sent.append((now, len(leagues) * self.requests_per_league))
+        return leagues
+
+    def observe(self, league, start_times, prices, now=None):
+        """
+        Reschedules a league from the results of a poll.
+
+        Args:
+            league (str): The league label.
+            start_times (iterable): Start times (seconds since the epoch) of the league's events.
+            prices (dict): Wager key -> Pinnacle odds for every matched wager of the league, or None
+                if the league wasn't scraped (its prices are then left as they were).
+            now (float, optional): The current time.
+
+        Returns:
+            float: The number of seconds until the league is due again.
+        """
+        now = self._clock() if now is None else now
+        upcoming = [start for start in start_times if start > now]
+        self.next_start[league] = min(upcoming) if upcoming else None
+
+        if prices is None:
+            self.moved[league] = 0
+        else:
+            previous = self._prices.get(league, {})
+            self.moved[league] = sum(1 for key, odds in prices.items()
+                                     if key in previous and previous[key] != odds)
+            self._prices[league] = dict(prices)
+
+        interval = self.interval(league, now)
+        self._schedule(league, now + interval)
+        return interval
+
+    def observe_failure(self, league, now=None):
+        """
+        Reschedules a league whose poll failed. A failed poll says nothing about the league's
+        events, so what the last poll that went through saw is kept: a league with games about to
+        start is retried as often as usual, and any other within DEFAULT_INTERVAL.
+
+        Returns:
+            float: The number of seconds until the league is due again.
+        """
+        now = self._clock() if now is None else now
+        interval = min(self.interval(league, now), DEFAULT_INTERVAL)
+        self._schedule(league, now + interval)
+        return interval
+
+    def interval(self, league, now=None):
+        """
+        Returns the number of seconds between polls of a league, given what the last poll saw.
+        """
+        now = self._clock() if now is None else now
+        next_start = self.next_start.get(league)
+        if next_start is None:
+            return IDLE_INTERVAL
+        hours = (next_start - now) / 3600
+        interval = next((seconds for limit, seconds in START_INTERVALS if hours <= limit), IDLE_INTERVAL)
+        if self.moved.get(league):
+            interval = max(MIN_INTERVAL, interval / 2)
+        return interval
+
+    def charge(self, requests, now=None):
+        """
+        Counts requests sent outside pop_due() (e.g. a manual reload of every league) against the budget.
+        """
+        now = self._clock() if now is None else now
+        self._sent.append((now, requests))
+
+    def refund(self, requests):
+        """
+        Gives back budget for requests a poll didn't need to send (e.g. a skipped league).
+        """
+        # Take them off the latest polls, so the refund expires together with what it refunds
+        for i in range(len(self._sent) - 1, -1, -1):
+            if requests <= 0:
+                break
+            sent_at, sent = self._sent[i]
+            taken = min(sent, requests)
+            self._sent[i] = (sent_at, sent - taken)
+            requests -= taken
+
+    def next_delay(self, now=None):
+        """
+        Returns the number of seconds until pop_due() will next return a league.
+        """
+        now = self._clock() if now is None else now
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return self.window
+        delay = max(0, self._heap[0][0] - now)
+
+        # Out of budget: wait until enough of the window has expired for one league poll
+        over = self.requests_in_window(now) + self.requests_per_league - self.budget
+        for sent_at, requests in self._sent:
+            if over <= 0:
+                break
+            over -= requests
+            delay = max(delay, sent_at + self.window - now)
+        return delay
+
+    def _schedule(self, league, due):
+        self._due[league] = due
+        self._order += 1
+        heapq.heappush(self._heap, (due, self._order, league))
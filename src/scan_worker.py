@@ -0,0 +1,141 @@
+import queue
+import threading
+import time
+import traceback
+from collections import namedtuple
+from types import GeneratorType
+
+# kinds: the set of request kinds (e.g. {"check", "reload"}) served by this scan
+# value: what the scan function returned, or None if it raised. For a partial result, the item
+#        the scan generator yielded
+# error: the exception raised by the scan, or None
+# trace: the formatted stack trace of the error, or None
+# duration: how long the scan took (so far, for a partial result), in seconds
+# done: False for a partial result, True once the scan has finished
+# scope: the scope the scan ran with, or None if it scanned everything
+ScanResult = namedtuple("ScanResult", ["kinds", "value", "error", "trace", "duration", "done", "scope"],
+                        defaults=[True, None])
+
+
+class ScanWorker:
+    """
+    Runs a scan function (scrape + match + devig) on a background thread.
+
+    request() and poll() are meant to be called from the Tk thread: request() starts a scan if none
+    is running, merges the request into the one in flight if that one covers its scope, and
+    otherwise queues it for a follow-up scan (requests queued together share it), which poll()
+    starts once it has returned the final result in flight. poll() returns the next ScanResult, if
+    any, without blocking. The scan function must not touch Tk.
+
+    If the scan function returns a generator, every item it yields is handed to poll() as a partial
+    result (done=False) while the scan keeps running, and the generator's return value becomes the
+    value of the final result.
+
+    A request can carry a scope (e.g. the leagues to scrape), which is passed to the scan function
+    as its only argument. A request without a scope calls the scan function with no arguments.
+    """
+
+    def __init__(self, scan):
+        """
+        Args:
+            scan (callable): The function to run. It is called with the scope of the scan, or with no
+                arguments when the scan covers everything.
+        """
+        self._scan = scan
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._kinds = set()
+        self.scope = None  # Scope of the scan in flight, or None for everything
+        self._pending_kinds = set()  # Kinds of the requests queued for the next scan
+        self._pending_scope = None  # Scope of the next scan, if requests are queued
+        self.busy = False
+        self.last_duration = None
+        self._thread = threading.Thread(target=self._run, name="scan-worker", daemon=True)
+        self._thread.start()
+
+    def request(self, kind, scope=None):
+        """
+        Asks for a scan.
+
+        Args:
+            kind (str): What the result will be used for (e.g. "check" or "reload").
+            scope (set, optional): What to scan, or None for everything. A request merged into the
+                scan in flight shares its results; one the scan doesn't cover is queued instead.
+
+        Returns:
+            bool: True if a new scan was started, False if the request was merged or queued.
+        """
+        if not self.busy:
+            self._start({kind}, scope)
+            return True
+        if self._scope_covers(self.scope, scope):
+            self._kinds.add(kind)
+        else:
+            if not self._pending_kinds:
+                self._pending_scope = scope
+            elif self._pending_scope is not None:
+                self._pending_scope = None if scope is None else self._pending_scope | scope
+            self._pending_kinds.add(kind)
+        return False
+
+    def covers(self, scope):
+        """
+        Returns whether a request with a scope would be served by the scan in flight or the one queued.
+        """
+        return self.busy and (self._scope_covers(self.scope, scope) or
+                              bool(self._pending_kinds) and self._scope_covers(self._pending_scope, scope))
+
+    @staticmethod
+    def _scope_covers(scanned, scope):
+        return scanned is None or scope is not None and scope <= scanned
+
+    def _start(self, kinds, scope):
+        self._kinds = kinds
+        self.busy = True
+        self.scope = scope
+        self._requests.put(scope)
+
+    def poll(self):
+        """
+        Returns the next partial or final result, or None if there is nothing new since the last poll.
+
+        Returns:
+            ScanResult: The result, with the kinds of every request it serves.
+        """
+        try:
+            value, error, trace, duration, done = self._results.get_nowait()
+        except queue.Empty:
+            return None
+        if not done:
+            return ScanResult(set(self._kinds), value, None, None, duration, False, self.scope)
+        kinds, scope = self._kinds, self.scope
+        self._kinds = set()
+        self.scope = None
+        self.busy = False
+        self.last_duration = duration
+        if self._pending_kinds:
+            self._start(self._pending_kinds, self._pending_scope)
+            self._pending_kinds, self._pending_scope = set(), None
+        return ScanResult(kinds, value, error, trace, duration, True, scope)
+
+    def _run(self):
+        while True:
+            scope = self._requests.get()
+            start = time.perf_counter()
+            try:
+                value = self._scan() if scope is None else self._scan(scope)
+                value, error, trace = self._stream(value, start), None, None
+            except Exception as e:
+                value, error, trace = None, e, traceback.format_exc()
+            self._results.put((value, error, trace, time.perf_counter() - start, True))
+
+    def _stream(self, value, start):
+        # Forward each item of a generator scan as soon as it is produced
+        if not isinstance(value, GeneratorType):
+            return value
+        while True:
+            try:
+                item = next(value)
+            except StopIteration as stop:
+                return stop.value
+            self._results.put((item, None, None, time.perf_counter() - start, False))
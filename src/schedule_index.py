@@ -0,0 +1,70 @@
+import time
+from src.scrape import TIME_WINDOW_HOURS
+
+# How long a league's cached start times are trusted before the league is fetched again to pick
+# up newly listed events
+MAX_AGE = 2 * 60 * 60
+
+
+class ScheduleIndex:
+    """
+    Start times of every league's events, cached from previous scrapes.
+
+    The fetch loop asks should_fetch() before downloading a league: a league whose cached events
+    are all outside the time window is skipped, both books included, until its entry is older than
+    max_age. Leagues that have never been fetched are always fetched.
+    """
+
+    def __init__(self, window_hours=TIME_WINDOW_HOURS, max_age=MAX_AGE, clock=time.time):
+        """
+        Args:
+            window_hours (float): How far ahead an event must start to count, in hours.
+            max_age (float): How long cached start times are trusted, in seconds.
+            clock (callable): Returns the current time in seconds since the epoch.
+        """
+        self.window = window_hours * 3600
+        self.max_age = max_age
+        self._clock = clock
+        self._leagues = {}  # league -> (time of the scrape, sorted start times)
+        self.skipped = {}  # league -> number of times the league was skipped
+
+    def __contains__(self, league):
+        return league in self._leagues
+
+    def update(self, league, start_times, now=None):
+        """
+        Replaces the cached start times of a league after it was scraped.
+
+        Args:
+            league (str): The league label.
+            start_times (iterable): Start times (seconds since the epoch) of the league's events.
+            now (float, optional): The time of the scrape.
+        """
+        now = self._clock() if now is None else now
+        self._leagues[league] = (now, sorted(start_times))
+
+    def start_times(self, league):
+        """
+        Returns the cached start times of a league, or an empty list if it was never scraped.
+        """
+        entry = self._leagues.get(league)
+        return entry[1] if entry else []
+
+    def has_events(self, league, now=None):
+        """
+        Returns whether any cached event of a league starts within the time window.
+        """
+        now = self._clock() if now is None else now
+        return any(now < start < now + self.window for start in self.start_times(league))
+
+    def should_fetch(self, league, now=None):
+        """
+        Returns whether a league has to be scraped: it was never scraped, its entry is stale, or it
+        has events in the time window. Counts the league as skipped otherwise.
+        """
+        now = self._clock() if now is None else now
+        entry = self._leagues.get(league)
+        if entry is None or now - entry[0] > self.max_age or self.has_events(league, now):
+            return True
+        self.skipped[league] = self.skipped.get(league, 0) + 1
+        return False
@@ -1,12 +1,48 @@
-import requests
 import os
 import json  # Add import for json module
 import datetime
 import time
 import re
+from collections import namedtuple
+from functools import lru_cache
 
+from src.timing import timed
 
-def get_response(url, headers, params=None):
+# Only events starting within this many hours of now are kept, on both books
+TIME_WINDOW_HOURS = 24
+
+
+def parse_start_time(start_time):
+    """
+    Parses an ISO 8601 start time (e.g. "2025-01-20T00:10:00Z") into seconds since the epoch.
+    """
+    return datetime.datetime.fromisoformat(start_time.replace("Z", "+00:00")).timestamp()
+
+
+class ScrapeResult(dict):
+    """
+    A processed scrape result: event ID -> event, for the events in the time window. start_times
+    also has the start times of the payload's events outside the window, which were dropped.
+
+    Fetchers return one when their request went through; a failed one returns None or a plain dict.
+    """
+
+    def __init__(self, events=(), start_times=()):
+        super().__init__(events)
+        self.start_times = list(start_times)
+
+
+def __getattr__(name):
+    # requests takes a while to import, so it's imported by the first request rather than with this
+    # module (the GUI and the tests don't need it at startup); src.scrape.requests still resolves
+    if name == "requests":
+        import requests
+        return requests
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@timed("fetch")
+def get_response(url, headers, params=None, raw=False):
     """
     Sends a GET request to the specified URL with the given headers and parameters.
 
@@ -14,78 +50,173 @@ def get_response(url, headers, params=None):
         url (str): The URL to send the request to.
         headers (dict): The headers to include in the request.
         params (dict, optional): The parameters to include in the request. Defaults to None.
+        raw (bool, optional): Return the undecoded response body instead of its JSON.
 
     Returns:
-        dict: The JSON response if the request is successful, otherwise None.
+        dict: The JSON response (bytes if raw) if the request is successful, otherwise None.
     """
+    import requests
+
     if "competition" in url:
         time.sleep(5)
     response = requests.get(url, headers=headers, params=params)
     if response.status_code == 200:
-        return response.json()
+        return response.content if raw else response.json()
     else:
         print(
             f"FanDuel request failed with status code: {response.status_code}. ID: {params.get('competitionId')}")
         return None
 
 
-def get_response_no_params(url, headers):
+@timed("fetch")
+def get_response_no_params(url, headers, raw=False):
     """
     Sends a GET request to the specified URL with the given headers.
 
     Args:
         url (str): The URL to send the request to.
         headers (dict): The headers to include in the request.
+        raw (bool, optional): Return the undecoded response body instead of its JSON.
 
     Returns:
-        dict: The JSON response if the request is successful, otherwise None.
+        dict: The JSON response (bytes if raw) if the request is successful, otherwise None.
     """
+    import requests
+
     response = requests.get(url, headers=headers)
     if response.status_code == 200:
-        return response.json()
+        return response.content if raw else response.json()
     else:
         print(f"Pinnacle request failed with status code: {response.status_code}")
         return None
 
 
-def process_fanduel_rows(rows, data, shorten_names=False):
+# Matches anything in parentheses in FanDuel event names (e.g. pitchers or rankings)
+PARENTHESES = re.compile(r' \([^)]*\)')
+# FanDuel event ID -> ((name, openDate, shorten_names), (game name, start time) or None for events
+# that aren't games), kept across cycles so events seen before aren't parsed again
+FANDUEL_EVENT_CACHE = {}
+FANDUEL_EVENT_CACHE_SIZE = 10000
+
+
+def normalize_fanduel_name(name, shorten_names=False):
+    """
+    Normalizes a FanDuel event name into a game name.
+
+    Args:
+        name (str): The event name, e.g. "Los Angeles Lakers (LAL) @ Philadelphia 76ers (PHI)".
+        shorten_names (bool): Keep only the last word of each side.
+
+    Returns:
+        str: The game name, or None if the event isn't a game.
+    """
+    if not name:
+        return None
+    if " @ " in name:
+        separator = " @ "
+    elif " v " in name:
+        separator = " v "
+    else:
+        return None
+    name = PARENTHESES.sub("", name)
+    if shorten_names:
+        sides = name.split(separator)
+        if len(sides) > 1:
+            name = sides[0].split(" ")[-1] + separator + sides[1].split(" ")[-1]
+    return name
+
+
+def preprocess_fanduel_events(data, shorten_names=False, cache=FANDUEL_EVENT_CACHE):
+    """
+    Builds the game events of a FanDuel payload once, normalizing each name and parsing each
+    openDate. Events already seen in a previous cycle with the same name and openDate come from
+    the cache.
+
+    Args:
+        data (dict): The FanDuel response.
+        shorten_names (bool): Keep only the last word of each side of the game names.
+        cache (dict): Parsed events kept across cycles.
+
+    Returns:
+        dict: Event ID (as a string, like the attachments keys) -> (game name, start time in
+            seconds since the epoch).
+    """
+    if len(cache) > FANDUEL_EVENT_CACHE_SIZE:
+        cache.clear()
+    events = {}
+    for event_id, event in data.get("attachments", {}).get("events", {}).items():
+        raw = (event.get("name"), event.get("openDate"), shorten_names)
+        cached = cache.get(event_id)
+        if cached is None or cached[0] != raw:
+            name = normalize_fanduel_name(raw[0], shorten_names)
+            parsed = (name, parse_start_time(raw[1])) if name and raw[1] else None
+            cached = cache[event_id] = (raw, parsed)
+        if cached[1] is not None:
+            events[event_id] = cached[1]
+    return events
+
+
+@timed("parse")
+def process_fanduel_rows(rows, data, shorten_names=False, window_hours=TIME_WINDOW_HOURS, now=None):
     """
     Processes the rows of Fanduel data to extract event IDs and names.
 
     Args:
         rows (list): The list of rows to process.
         data (dict): The data containing event information.
+        window_hours (float): Only keep events starting within this many hours.
+        now (float, optional): The current time in seconds since the epoch, e.g. shared by a whole cycle.
 
     Returns:
-        tuple: A dictionary of event IDs and names, and a set of seen event IDs.
+        tuple: A ScrapeResult of event IDs and names, and a set of seen event IDs.
     """
-    result = {}
+    result = ScrapeResult()
     seen_event_ids = set()
+    if now is None:
+        now = time.time()
+    window_end = now + window_hours * 3600
+    events = preprocess_fanduel_events(data, shorten_names)
     for row in rows:
         event_id = row.get("eventId")
         if event_id:
-            name = data.get("attachments", {}).get(
-                "events", {}).get(str(event_id), {}).get("name")
-            date = data.get("attachments", {}).get(
-                "events", {}).get(str(event_id), {}).get("openDate")
-            if (" @ " in name or " v " in name):
-                name = re.sub(r' \([^)]*\)', '', name)  # Remove anything in parentheses
-                if shorten_names:
-                    if " @ " in name:
-                        name = name.split(" @ ")[0].split(" ")[-1] + " @ " + \
-                            name.split(" @ ")[1].split(" ")[-1]
-                    elif " v " in name:
-                        name = name.split(" v ")[0].split(" ")[-1] + " v " + \
-                            name.split(" v ")[1].split(" ")[-1]
-                event_date = datetime.datetime.fromisoformat(date.replace("Z", "+00:00"))
-                now = datetime.datetime.now(datetime.timezone.utc)
-                if now < event_date < (now + datetime.timedelta(hours=24)):
-                    result[event_id] = {"name": name}
-                    seen_event_ids.add(event_id)
+            event = events.get(str(event_id))
+            if event is not None:
+                result.start_times.append(event[1])
+            if event is not None and now < event[1] < window_end:
+                result[event_id] = {"name": event[0], "start_time": event[1]}
+                seen_event_ids.add(event_id)
     return result, seen_event_ids
 
 
-def process_fanduel_markets(markets, seen_event_ids, result, league):
+class MarketTypeFilter:
+    """
+    The FanDuel market types a consumer reads, as exact names and regex patterns
+    (e.g. r"TO_SCORE_\\d+\\+_POINTS"). Each marketType is checked against them once and remembered.
+    """
+
+    def __init__(self, names=(), patterns=()):
+        """
+        Args:
+            names (iterable): Market types kept as is.
+            patterns (iterable): Regex patterns; market types matching one in full are kept.
+        """
+        self.names = frozenset(names)
+        self.patterns = tuple(patterns)
+        self._pattern = (re.compile("|".join(f"(?:{pattern})" for pattern in self.patterns))
+                         if self.patterns else None)
+        self._kept = {}  # marketType -> whether it is kept
+
+    def __contains__(self, market_type):
+        kept = self._kept.get(market_type)
+        if kept is None:
+            kept = market_type in self.names or (
+                self._pattern is not None and self._pattern.fullmatch(market_type or "") is not None)
+            self._kept[market_type] = kept
+        return kept
+
+
+@timed("parse")
+def process_fanduel_markets(markets, seen_event_ids, result, league, market_types=None):
     """
     Processes the Fanduel markets to extract market information for seen event IDs.
 
@@ -93,11 +224,18 @@ def process_fanduel_markets(markets, seen_event_ids, result, league):
         markets (dict): The dictionary of markets to process.
         seen_event_ids (set): The set of seen event IDs.
         result (dict): The dictionary to store the processed market information.
+        league (str): The league label stored on every event.
+        market_types (MarketTypeFilter, optional): Only markets of these types are kept; the rest are
+            dropped before their runners are copied. None keeps everything.
     """
+    for event_id in seen_event_ids:
+        result[event_id]["league"] = league
+        result[event_id].setdefault("markets", [])
     for _, market in markets.items():
         event_id = market.get("eventId")
         if event_id in seen_event_ids:
-            result[event_id]["league"] = league
+            if market_types is not None and market.get("marketType") not in market_types:
+                continue
             market_info = {
                 "marketType": market.get("marketType"),
                 "externalMarketId": market.get("associatedMarkets")[0].get("externalMarketId"),
@@ -111,8 +249,6 @@ def process_fanduel_markets(markets, seen_event_ids, result, league):
                     "winRunnerOdds": runner.get("winRunnerOdds", {}).get("americanDisplayOdds", {}).get("americanOdds")
                 }
                 market_info["runners"].append(runner_info)
-            if 'markets' not in result[event_id]:
-                result[event_id]['markets'] = []
             result[event_id]["markets"].append(market_info)
 
 
@@ -128,7 +264,7 @@ def save_result_to_file(result, filename):
         json.dump(result, f, indent=4)
 
 
-def fanduel_nba(save_to_file=False):
+def fanduel_nba(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes NBA data from Fanduel.
     """
@@ -159,20 +295,20 @@ def fanduel_nba(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         rows = data.get("layout", {}).get("coupons", {}).get(
             "32866", {}).get("display", [])[0].get("rows", [])
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "NBA")
+        process_fanduel_markets(markets, seen_event_ids, result, "NBA", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_nba.json')
         return result
 
 
-def fanduel_nfl(save_to_file=False):
+def fanduel_nfl(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes NFL data from Fanduel.
     """
@@ -203,19 +339,19 @@ def fanduel_nfl(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         rows = list(data.get("attachments", {}).get("events", {}).values())[2:]
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "NFL")
+        process_fanduel_markets(markets, seen_event_ids, result, "NFL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_nfl.json')
         return result
 
 
-def fanduel_nhl(save_to_file=False):
+def fanduel_nhl(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes NHL data from Fanduel.
     """
@@ -246,21 +382,21 @@ def fanduel_nhl(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         display = data.get("layout", {}).get("coupons", {}).get(
             "35876", {}).get("display", [])
         rows = display[0].get("rows", []) if display else []
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "NHL")
+        process_fanduel_markets(markets, seen_event_ids, result, "NHL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_nhl.json')
         return result
 
 
-def fanduel_ncaaf(save_to_file=False):
+def fanduel_ncaaf(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes NCAAF data from Fanduel.
     """
@@ -291,7 +427,7 @@ def fanduel_ncaaf(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the attachments section
         display = data.get("layout", {}).get("coupons", {}).get(
@@ -300,16 +436,16 @@ def fanduel_ncaaf(save_to_file=False):
             rows = display[0].get("rows", [])
         else:
             rows = []
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "NCAAFB")
+        process_fanduel_markets(markets, seen_event_ids, result, "NCAAFB", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_ncaaf.json')
         return result
 
 
-def fanduel_ncaab(save_to_file=False):
+def fanduel_ncaab(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes NCAAB data from Fanduel.
     """
@@ -340,22 +476,22 @@ def fanduel_ncaab(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the attachments section
         rows = []
         for display in data.get("layout", {}).get("coupons", {}).get("37884", {}).get("display", []):
             rows.extend(display.get("rows", []))
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "NCAAB")
+        process_fanduel_markets(markets, seen_event_ids, result, "NCAAB", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_ncaab.json')
         return result
 
 
-def fanduel_ucl(save_to_file=False):
+def fanduel_ucl(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes UEFA Champions League data from Fanduel.
     """
@@ -382,20 +518,20 @@ def fanduel_ucl(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "UCL")
+        process_fanduel_markets(markets, seen_event_ids, result, "UCL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_ucl.json')
         return result
 
 
-def fanduel_epl(save_to_file=False):
+def fanduel_epl(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes English Premier League data from Fanduel.
     """
@@ -422,20 +558,20 @@ def fanduel_epl(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "EPL")
+        process_fanduel_markets(markets, seen_event_ids, result, "EPL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_epl.json')
         return result
 
 
-def fanduel_shl(save_to_file=False):
+def fanduel_shl(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Swedish Hockey League (SHL) data from Fanduel.
     """
@@ -462,20 +598,20 @@ def fanduel_shl(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "SHL")
+        process_fanduel_markets(markets, seen_event_ids, result, "SHL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_shl.json')
         return result
 
 
-def fanduel_nla(save_to_file=False):
+def fanduel_nla(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Swiss National League A (NLA) data from Fanduel.
     """
@@ -502,20 +638,20 @@ def fanduel_nla(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "NL")
+        process_fanduel_markets(markets, seen_event_ids, result, "NL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_nla.json')
         return result
 
 
-def fanduel_turkish_first(save_to_file=False):
+def fanduel_turkish_first(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Turkish 1st League data from Fanduel.
     """
@@ -542,13 +678,13 @@ def fanduel_turkish_first(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "TFL")
+        process_fanduel_markets(markets, seen_event_ids, result, "TFL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_turkish_first.json')
@@ -556,7 +692,7 @@ def fanduel_turkish_first(save_to_file=False):
     return {}
 
 
-def fanduel_turkish_super(save_to_file=False):
+def fanduel_turkish_super(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Turkish Super League data from Fanduel.
     """
@@ -583,13 +719,13 @@ def fanduel_turkish_super(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "TSL")
+        process_fanduel_markets(markets, seen_event_ids, result, "TSL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_turkish_super.json')
@@ -597,7 +733,7 @@ def fanduel_turkish_super(save_to_file=False):
     return {}
 
 
-def fanduel_j1(save_to_file=False):
+def fanduel_j1(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Japanese J1 League data from Fanduel.
     """
@@ -624,19 +760,19 @@ def fanduel_j1(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "J1")
+        process_fanduel_markets(markets, seen_event_ids, result, "J1", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_j1.json')
         return result
 
 
-def fanduel_ligue1(save_to_file=False):
+def fanduel_ligue1(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes French Ligue 1 data from Fanduel.
     """
@@ -663,12 +799,12 @@ def fanduel_ligue1(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "L1")
+        process_fanduel_markets(markets, seen_event_ids, result, "L1", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_ligue1.json')
@@ -676,7 +812,7 @@ def fanduel_ligue1(save_to_file=False):
     return {}
 
 
-def fanduel_women_friendlies(save_to_file=False):
+def fanduel_women_friendlies(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes International Women Friendlies data from Fanduel.
     """
@@ -703,13 +839,13 @@ def fanduel_women_friendlies(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "IWF")
+        process_fanduel_markets(markets, seen_event_ids, result, "IWF", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_women_friendlies.json')
@@ -717,7 +853,7 @@ def fanduel_women_friendlies(save_to_file=False):
     return {}
 
 
-def fanduel_greek_super(save_to_file=False):
+def fanduel_greek_super(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Greek Super League data from Fanduel.
     """
@@ -744,12 +880,12 @@ def fanduel_greek_super(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "GSL")
+        process_fanduel_markets(markets, seen_event_ids, result, "GSL", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_greek_super.json')
@@ -757,7 +893,7 @@ def fanduel_greek_super(save_to_file=False):
     return {}
 
 
-def fanduel_cba(save_to_file=False):
+def fanduel_cba(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Chinese Basketball Association data from Fanduel.
     """
@@ -784,12 +920,12 @@ def fanduel_cba(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "CBA")
+        process_fanduel_markets(markets, seen_event_ids, result, "CBA", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_cba.json')
@@ -797,7 +933,7 @@ def fanduel_cba(save_to_file=False):
     return {}
 
 
-def fanduel_ao(save_to_file=False):
+def fanduel_ao(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Australian Open data from Fanduel.
     """
@@ -828,21 +964,21 @@ def fanduel_ao(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         display = data.get("layout", {}).get("coupons", {}).get(
             "39449", {}).get("display", [])
         rows = display[0].get("rows", []) if display else []
-        result, seen_event_ids = process_fanduel_rows(rows, data, shorten_names=True)
+        result, seen_event_ids = process_fanduel_rows(rows, data, shorten_names=True, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "AO")
+        process_fanduel_markets(markets, seen_event_ids, result, "AO", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_ao.json')
         return result
 
 
-def fanduel_nbb(save_to_file=False):
+def fanduel_nbb(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes Brazilian Novo Basquete Brasil data from Fanduel.
     """
@@ -869,12 +1005,12 @@ def fanduel_nbb(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "NBB")
+        process_fanduel_markets(markets, seen_event_ids, result, "NBB", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_nbb.json')
@@ -882,7 +1018,7 @@ def fanduel_nbb(save_to_file=False):
     return {}
 
 
-def fanduel_euroleague(save_to_file=False):
+def fanduel_euroleague(save_to_file=False, market_types=None, request=get_response, now=None):
     """
     Fetches and processes EuroLeague basketball data from Fanduel.
     """
@@ -909,13 +1045,13 @@ def fanduel_euroleague(save_to_file=False):
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    data = get_response(url, headers, params)
+    data = request(url, headers, params)
     if data:
         # Get all events from the events section
         rows = list(data.get("attachments", {}).get("events", {}).values())
-        result, seen_event_ids = process_fanduel_rows(rows, data)
+        result, seen_event_ids = process_fanduel_rows(rows, data, now=now)
         markets = data.get("attachments", {}).get("markets", {})
-        process_fanduel_markets(markets, seen_event_ids, result, "EUROLEAGUE")
+        process_fanduel_markets(markets, seen_event_ids, result, "EUROLEAGUE", market_types)
 
         if save_to_file:
             save_result_to_file(result, 'example_fanduel_euroleague.json')
@@ -923,21 +1059,38 @@ def fanduel_euroleague(save_to_file=False):
     return {}
 
 
-def process_matchups(matchups_data, switch_home_away=False, shorten_names=False):
+@timed("parse")
+def process_matchups(matchups_data, switch_home_away=False, shorten_names=False,
+                     window_hours=TIME_WINDOW_HOURS, now=None):
     """
     Processes the matchups data from Pinnacle to extract matchup IDs and names.
 
+    Matchups starting outside the time window are dropped here, so their specials and markets are
+    never processed or matched.
+
     Args:
         matchups_data (list): The list of matchups to process.
+        window_hours (float, optional): Only keep matchups starting within this many hours. None keeps all.
+            Matchups without a start time are always kept.
+        now (float, optional): The current time in seconds since the epoch.
 
     Returns:
-        dict: A dictionary of matchup IDs and names.
+        ScrapeResult: A dictionary of matchup IDs and names (and start times, when known).
     """
-    result = {}
+    result = ScrapeResult()
+    if now is None:
+        now = time.time()
+    window_end = None if window_hours is None else now + window_hours * 3600
     for matchup in matchups_data:
         parent = matchup.get("parentId")
         if parent is not None:
             continue
+        start_time = matchup.get("startTime")
+        if start_time:
+            start_time = parse_start_time(start_time)
+            result.start_times.append(start_time)
+            if window_end is not None and not now < start_time < window_end:
+                continue
         participants = matchup.get("participants", [])
         if len(participants) == 2 and "(" not in participants[0].get("name"):
             home = participants[0]
@@ -962,124 +1115,194 @@ def process_matchups(matchups_data, switch_home_away=False, shorten_names=False)
                     "name": matchup_name,
                     "markets": []  # Add empty markets list
                 }
+                if start_time:
+                    result[matchup_id]["start_time"] = start_time
     return result
 
 
+@timed("parse")
 def process_specials(matchups_data, result):
     """
-    Processes the specials data from Pinnacle to extract special IDs and their parent IDs.
+    Processes the specials data from Pinnacle to extract special IDs and their descriptions.
 
     Args:
         matchups_data (list): The list of matchups to process.
         result (dict): The dictionary to store the processed special information.
 
     Returns:
-        dict: A dictionary with special IDs as keys and their parent IDs as values.
+        dict: A dictionary with special IDs as keys and the market entries added to result as values,
+            so process_markets can attach prices without searching the parent's markets.
     """
-    special_to_parent = {}
+    special_markets = {}
     for matchup in matchups_data:
         matchup_id = matchup.get("parentId")
         if matchup_id is None:
             continue
-        market_info = {}
         special = matchup.get("special")
         if special:
             description = special.get("description")
-            if description:
-                market_info["id"] = matchup["id"]
-                market_info["description"] = description
-                special_to_parent[matchup["id"]] = matchup_id
             if matchup_id in result and description and "Range" not in description:
+                market_info = {"id": matchup["id"], "description": description}
                 result[matchup_id]["markets"].append(market_info)
-    # print(special_to_parent)
-    return special_to_parent
+                special_markets[matchup["id"]] = market_info
+    return special_markets
+
+
+# A Pinnacle market key such as "s;0;tt;111.5;home", parsed once: period ("0" for the full game),
+# market type ("m", "s", "ou", "tt"), threshold (e.g. "111.5") and side ("home"/"away"), the last
+# two None when absent
+MarketKey = namedtuple("MarketKey", ["period", "type", "threshold", "side"])
 
 
-def process_markets(markets_data, result, special_to_parent):
+@lru_cache(maxsize=4096)
+def parse_market_key(key):
+    """
+    Parses a Pinnacle straight market key. Keys repeat across markets, so results are cached.
+
+    Args:
+        key (str): The market key, e.g. "s;0;ou;230.5".
+
+    Returns:
+        MarketKey: The parsed key, or None if it isn't a straight market key.
+    """
+    parts = key.split(";")
+    if parts[0] != "s" or not 3 <= len(parts) <= 5:
+        return None
+    return MarketKey(parts[1], parts[2], parts[3] if len(parts) > 3 else None, parts[4] if len(parts) > 4 else None)
+
+
+def _market_limit(market):
+    limits = market.get("limits")
+    return limits[0].get("amount") if limits else None
+
+
+def _moneyline_market(market_key, matchup_id, market, prices, result, special_markets):
+    if matchup_id in result:
+        if prices[0].get("points") is None:
+            result[matchup_id]["markets"].append({
+                "description": "moneyline",
+                "prices": prices,
+                "limit": _market_limit(market)
+            })
+    else:
+        _special_two_way(market_key, matchup_id, market, prices, result, special_markets)
+
+
+def _team_total_market(market_key, matchup_id, market, prices, result, special_markets):
+    if matchup_id in result and len(prices) == 2 and market_key.side in ("home", "away"):
+        result[matchup_id]["markets"].append({
+            "description": "team total",
+            "team": market_key.side,
+            "threshold": market_key.threshold,
+            "prices": prices,
+            "limit": _market_limit(market)
+        })
+
+
+def _handicap_market(market_key, matchup_id, market, prices, result, special_markets):
+    if matchup_id in result:
+        handicap_prices = []
+        for price in prices:
+            handicap_price = dict(price)
+            if "points" in handicap_price:
+                handicap_price["handicap"] = handicap_price.pop("points")
+            if "designation" in handicap_price:
+                handicap_price["team"] = handicap_price.pop("designation")
+            handicap_prices.append(handicap_price)
+        result[matchup_id]["markets"].append({
+            "description": "handicap",
+            "prices": handicap_prices,
+            "limit": _market_limit(market)
+        })
+
+
+def _total_points_market(market_key, matchup_id, market, prices, result, special_markets):
+    if matchup_id in result and market_key.side is None and len(prices) == 2:
+        result[matchup_id]["markets"].append({
+            "description": "total points",
+            "threshold": market_key.threshold,
+            "prices": prices,
+            "limit": _market_limit(market)
+        })
+
+
+# Designations of the two sides of a yes/no or odd/even special, by period
+SPECIAL_DESIGNATIONS = {
+    "1": ("odd", "even"),
+    "0": ("yes", "no"),
+}
+
+
+# The special handlers build new price entries, ordered by participant, rather than edited copies:
+# a special's price only carries its price, its designation and, on over/unders, its points
+def _special_over_under(market_key, matchup_id, market, prices, result, special_markets):
+    existing_market = special_markets.get(matchup_id)
+    if existing_market is None or len(prices) != 2 or "points" not in prices[0]:
+        # Player props carry their line in the prices
+        return
+    over, under = prices
+    if over.get("participantId", 0) > under.get("participantId", 0):
+        over, under = under, over
+    existing_market["prices"] = [{"points": over["points"], "price": over["price"], "designation": "over"},
+                                 {"points": under.get("points"), "price": under["price"], "designation": "under"}]
+    existing_market["limit"] = _market_limit(market)
+
+
+def _special_two_way(market_key, matchup_id, market, prices, result, special_markets):
+    existing_market = special_markets.get(matchup_id)
+    if existing_market is None or len(prices) != 2:
+        return
+    first, second = prices
+    if first.get("participantId", 0) > second.get("participantId", 0):
+        first, second = second, first
+    first_designation, second_designation = SPECIAL_DESIGNATIONS[market_key.period]
+    existing_market["prices"] = [{"price": first["price"], "designation": first_designation},
+                                 {"price": second["price"], "designation": second_designation}]
+    existing_market["limit"] = _market_limit(market)
+
+
+# (period, market type, whether the key has a threshold)
+#   -> handler(market_key, matchup_id, market, prices, result, special_markets)
+MARKET_HANDLERS = {
+    ("0", "m", False): _moneyline_market,
+    ("1", "m", False): _special_two_way,
+    ("0", "tt", True): _team_total_market,
+    ("0", "s", True): _handicap_market,
+    ("0", "ou", True): _total_points_market,
+    ("0", "ou", False): _special_over_under,
+}
+
+
+@timed("parse")
+def process_markets(markets_data, result, special_markets):
     """
     Processes the markets data from Pinnacle to extract market information.
 
+    Each distinct market key is parsed and resolved to the handler for its type once, and
+    every market is handed to its handler. Handlers build new price records wherever prices are
+    renamed or reordered, so markets_data is left untouched.
+
     Args:
         markets_data (list): The list of markets to process.
         result (dict): The dictionary to store the processed market information.
-        special_to_parent (dict): A dictionary with special IDs as keys and their parent IDs as values.
+        special_markets (dict): Special IDs -> market entries, as returned by process_specials.
     """
+    dispatch = {}  # market key -> (MarketKey, handler)
     for market in markets_data:
+        key = market.get("key", "")
+        entry = dispatch.get(key)
+        if entry is None:
+            market_key = parse_market_key(key)
+            handler = None if market_key is None else MARKET_HANDLERS.get(
+                (market_key.period, market_key.type, market_key.threshold is not None))
+            entry = dispatch[key] = (market_key, handler)
+        market_key, handler = entry
         prices = market.get("prices")
-        if (market.get("key") == "s;0;m"
-            and (market.get("matchupId") in result)
-                and prices[0].get("points") is None):
-            market_info = {
-                "description": "moneyline",
-                "prices": prices,
-                "limit": market.get("limits", [{}])[0].get("amount")
-            }
-            result[market.get("matchupId")]["markets"].append(market_info)
-        elif market.get("key").startswith("s;0;tt;") and market.get("matchupId") in result and len(market.get("prices", [])) == 2:
-            parts = market.get("key").split(";")
-            if len(parts) == 5 and parts[4] in ["home", "away"]:
-                team = parts[4]
-                threshold = parts[3]
-                market_info = {
-                    "description": "team total",
-                    "team": team,
-                    "threshold": threshold,
-                    "prices": prices,
-                    "limit": market.get("limits", [{}])[0].get("amount")
-                }
-                result[market.get("matchupId")]["markets"].append(market_info)
-        elif market.get("key").startswith("s;0;s;") and market.get("matchupId") in result:
-            for price in prices:
-                if "points" in price:
-                    price["handicap"] = price.pop("points")
-                if "designation" in price:
-                    price["team"] = price.pop("designation")
-            market_info = {
-                "description": "handicap",
-                "prices": prices,
-                "limit": market.get("limits", [{}])[0].get("amount")
-            }
-            result[market.get("matchupId")]["markets"].append(market_info)
-
-        # Add processing for over/under markets
-        elif (((market.get("key") == "s;0;ou" and "points" in prices[0])
-                or (market.get("key") == "s;0;m" or market.get("key") == "s;1;m"))
-              and special_to_parent.get(market.get("matchupId")) in result):
-            matchup_id = market.get("matchupId")
-            if len(prices) == 2:
-                parent_matchup_id = special_to_parent.get(matchup_id)
-                if parent_matchup_id:
-                    for existing_market in result[parent_matchup_id]["markets"]:
-                        market_id = existing_market.get("id")
-                        if market_id == matchup_id:
-                            if prices[0].get("participantId", 0) > prices[1].get("participantId", 0):
-                                prices[0], prices[1] = prices[1], prices[0]
-                            prices[0]["designation"] = "over" if market.get(
-                                "key") == "s;0;ou" else "odd" if market.get("key") == "s;1;m" else "yes"
-                            prices[1]["designation"] = "under" if market.get(
-                                "key") == "s;0;ou" else "even" if market.get("key") == "s;1;m" else "no"
-                            prices[0].pop("participantId")
-                            prices[1].pop("participantId")
-                            if market.get("key") != "s;0;ou" and "points" in prices[0]:
-                                prices[0].pop("points")
-                                prices[1].pop("points")
-                            existing_market["prices"] = prices
-                            existing_market["limit"] = market.get("limits", [{}])[0].get("amount")
-        # Add processing for total points markets
-        elif market.get("key").startswith("s;0;ou;") and market.get("matchupId") in result:
-            parts = market.get("key").split(";")
-            if len(parts) == 4 and len(prices) == 2:
-                threshold = parts[3]
-                market_info = {
-                    "description": "total points",
-                    "threshold": threshold,
-                    "prices": prices,
-                    "limit": market.get("limits", [{}])[0].get("amount")
-                }
-                result[market.get("matchupId")]["markets"].append(market_info)
+        if handler is not None and prices:
+            handler(market_key, market.get("matchupId"), market, prices, result, special_markets)
 
 
-def pinnacle_nba(save_to_file=False):
+def pinnacle_nba(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes NBA data from Pinnacle.
     """
@@ -1096,15 +1319,15 @@ def pinnacle_nba(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/487/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/487/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_nba.json')
@@ -1112,7 +1335,7 @@ def pinnacle_nba(save_to_file=False):
     return {}
 
 
-def pinnacle_nfl(save_to_file=False):
+def pinnacle_nfl(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes NFL data from Pinnacle.
     """
@@ -1129,15 +1352,15 @@ def pinnacle_nfl(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/889/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/889/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_nfl.json')
@@ -1145,7 +1368,7 @@ def pinnacle_nfl(save_to_file=False):
     return {}
 
 
-def pinnacle_nhl(save_to_file=False):
+def pinnacle_nhl(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes NHL data from Pinnacle.
     """
@@ -1162,15 +1385,15 @@ def pinnacle_nhl(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1456/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1456/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_nhl.json')
@@ -1178,7 +1401,7 @@ def pinnacle_nhl(save_to_file=False):
     return {}
 
 
-def pinnacle_ncaaf(save_to_file=False):
+def pinnacle_ncaaf(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes NCAAF data from Pinnacle.
     """
@@ -1195,15 +1418,15 @@ def pinnacle_ncaaf(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/880/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/880/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_ncaaf.json')
@@ -1211,7 +1434,7 @@ def pinnacle_ncaaf(save_to_file=False):
     return {}
 
 
-def pinnacle_ncaab(save_to_file=False):
+def pinnacle_ncaab(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes NCAAB data from Pinnacle.
     """
@@ -1228,15 +1451,15 @@ def pinnacle_ncaab(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/493/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/493/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_ncaab.json')
@@ -1244,7 +1467,7 @@ def pinnacle_ncaab(save_to_file=False):
     return {}
 
 
-def pinnacle_ucl(save_to_file=False):
+def pinnacle_ucl(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes UEFA Champions League data from Pinnacle.
     """
@@ -1261,15 +1484,15 @@ def pinnacle_ucl(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2627/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2627/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_ucl.json')
@@ -1277,7 +1500,7 @@ def pinnacle_ucl(save_to_file=False):
     return {}
 
 
-def pinnacle_epl(save_to_file=False):
+def pinnacle_epl(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes English Premier League data from Pinnacle.
     """
@@ -1294,15 +1517,15 @@ def pinnacle_epl(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1980/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1980/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_epl.json')
@@ -1310,7 +1533,7 @@ def pinnacle_epl(save_to_file=False):
     return {}
 
 
-def pinnacle_shl(save_to_file=False):
+def pinnacle_shl(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Swedish Hockey League data from Pinnacle.
     """
@@ -1327,15 +1550,15 @@ def pinnacle_shl(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1517/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1517/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_shl.json')
@@ -1343,7 +1566,7 @@ def pinnacle_shl(save_to_file=False):
     return {}
 
 
-def pinnacle_nla(save_to_file=False):
+def pinnacle_nla(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Swiss National League A (NLA) data from Pinnacle.
     """
@@ -1360,15 +1583,15 @@ def pinnacle_nla(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1532/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/1532/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_nla.json')
@@ -1376,7 +1599,7 @@ def pinnacle_nla(save_to_file=False):
     return {}
 
 
-def pinnacle_turkish_first(save_to_file=False):
+def pinnacle_turkish_first(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Turkish 1st League data from Pinnacle.
     """
@@ -1393,15 +1616,15 @@ def pinnacle_turkish_first(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2578/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2578/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_turkish_first.json')
@@ -1409,7 +1632,7 @@ def pinnacle_turkish_first(save_to_file=False):
     return {}
 
 
-def pinnacle_turkish_super(save_to_file=False):
+def pinnacle_turkish_super(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Turkish Super League data from Pinnacle.
     """
@@ -1426,15 +1649,15 @@ def pinnacle_turkish_super(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2592/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2592/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_turkish_super.json')
@@ -1442,7 +1665,7 @@ def pinnacle_turkish_super(save_to_file=False):
     return {}
 
 
-def pinnacle_j1(save_to_file=False):
+def pinnacle_j1(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Japanese J1 League data from Pinnacle.
     """
@@ -1459,15 +1682,15 @@ def pinnacle_j1(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2157/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2157/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_j1.json')
@@ -1475,7 +1698,7 @@ def pinnacle_j1(save_to_file=False):
     return {}
 
 
-def pinnacle_ligue1(save_to_file=False):
+def pinnacle_ligue1(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes French Ligue 1 data from Pinnacle.
     """
@@ -1492,15 +1715,15 @@ def pinnacle_ligue1(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2036/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2036/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_ligue1.json')
@@ -1508,7 +1731,7 @@ def pinnacle_ligue1(save_to_file=False):
     return {}
 
 
-def pinnacle_women_friendlies(save_to_file=False):
+def pinnacle_women_friendlies(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes International Women Friendlies data from Pinnacle.
     """
@@ -1525,15 +1748,15 @@ def pinnacle_women_friendlies(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2116/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2116/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_women_friendlies.json')
@@ -1541,7 +1764,7 @@ def pinnacle_women_friendlies(save_to_file=False):
     return {}
 
 
-def pinnacle_greek_super(save_to_file=False):
+def pinnacle_greek_super(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Greek Super League data from Pinnacle.
     """
@@ -1558,15 +1781,15 @@ def pinnacle_greek_super(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2081/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/2081/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_greek_super.json')
@@ -1574,7 +1797,7 @@ def pinnacle_greek_super(save_to_file=False):
     return {}
 
 
-def pinnacle_cba(save_to_file=False):
+def pinnacle_cba(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Chinese Basketball Association data from Pinnacle.
     """
@@ -1591,15 +1814,15 @@ def pinnacle_cba(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/303/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/303/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_cba.json')
@@ -1607,7 +1830,7 @@ def pinnacle_cba(save_to_file=False):
     return {}
 
 
-def pinnacle_ao(save_to_file=False):
+def pinnacle_ao(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Australian Open tennis data from Pinnacle.
     """
@@ -1624,15 +1847,15 @@ def pinnacle_ao(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/sports/33/matchups?withSpecials=false&brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/sports/33/markets/straight?primaryOnly=false&withSpecials=false', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data, switch_home_away=True, shorten_names=True)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, switch_home_away=True, shorten_names=True, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_ao.json')
@@ -1640,7 +1863,7 @@ def pinnacle_ao(save_to_file=False):
     return {}
 
 
-def pinnacle_nbb(save_to_file=False):
+def pinnacle_nbb(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes Brazilian Novo Basquete Brasil data from Pinnacle.
     """
@@ -1657,15 +1880,15 @@ def pinnacle_nbb(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/303/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/303/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_cba.json')
@@ -1673,7 +1896,7 @@ def pinnacle_nbb(save_to_file=False):
     return {}
 
 
-def pinnacle_euroleague(save_to_file=False):
+def pinnacle_euroleague(save_to_file=False, request=get_response_no_params, now=None):
     """
     Fetches and processes EuroLeague basketball data from Pinnacle.
     """
@@ -1690,15 +1913,15 @@ def pinnacle_euroleague(save_to_file=False):
         'Content-Type': 'application/json'
     }
 
-    matchups_data = get_response_no_params(
+    matchups_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/382/matchups?brandId=0', headers)
-    markets_data = get_response_no_params(
+    markets_data = request(
         'https://guest.api.arcadia.pinnacle.com/0.1/leagues/382/markets/straight', headers)
 
     if matchups_data and markets_data:
-        result = process_matchups(matchups_data)
-        special_to_parent = process_specials(matchups_data, result)
-        process_markets(markets_data, result, special_to_parent)
+        result = process_matchups(matchups_data, now=now)
+        special_markets = process_specials(matchups_data, result)
+        process_markets(markets_data, result, special_markets)
 
         if save_to_file:
             save_result_to_file(result, 'example_pinnacle_euroleague.json')
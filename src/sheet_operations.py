@@ -1,35 +1,41 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-
-# Use credentials to create gspread client
 SCOPE = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-CREDS = ServiceAccountCredentials.from_json_keyfile_name('credentials.json', SCOPE)
-CLIENT = gspread.authorize(CREDS)
+CREDENTIALS_FILE = 'credentials.json'
+SPREADSHEET = 'Betting'
+WORKSHEET = 'Devig'  # Replace with your sheet name
 
-# Open the spreadsheet
-SHEET = CLIENT.open('Betting').worksheet('Devig')  # Replace with your sheet name
+# The gspread client and worksheet, created by the first write rather than at import, so launching
+# (or importing this module in tests) doesn't need credentials or a network round trip
+CLIENT = None
+SHEET = None
 
 
-def write_to_sheet(values):
-    try:
-        SHEET.append_row(values, value_input_option='USER_ENTERED')
-    except gspread.exceptions.APIError:
-        # Refresh credentials if expired
-        global CLIENT
-        CLIENT = gspread.authorize(CREDS)
-        SHEET.append_row(values)
+def open_worksheet():
+    """
+    Authorizes and opens the worksheet, replacing the cached one (e.g. after the credentials expired).
+    """
+    global CLIENT, SHEET
+    # Imported here: gspread and oauth2client take a while to import and aren't needed until then
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
 
+    creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, SCOPE)
+    CLIENT = gspread.authorize(creds)
+    SHEET = CLIENT.open(SPREADSHEET).worksheet(WORKSHEET)
+    return SHEET
+
+
+def get_worksheet():
+    """
+    Returns the cached worksheet, opening it on first use.
+    """
+    return SHEET if SHEET is not None else open_worksheet()
+
+
+def write_to_sheet(values):
+    import gspread
 
-def write_to_column(column, value):
     try:
-        # Get all values in the column
-        col_values = SHEET.col_values(column)
-        # Find first empty row
-        next_row = len(col_values) + 1
-        # Write value to next empty cell
-        SHEET.update_cell(next_row, column, value)
+        get_worksheet().append_row(values, value_input_option='USER_ENTERED')
     except gspread.exceptions.APIError:
         # Refresh credentials if expired
-        global CLIENT
-        CLIENT = gspread.authorize(CREDS)
-        write_to_column(column, value)
+        open_worksheet().append_row(values)
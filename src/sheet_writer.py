@@ -0,0 +1,118 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+
+# How long the writer waits for more bets before sending a batch, in seconds
+BATCH_DELAY = 0.5
+# Attempts per batch, and the wait before the first retry (doubled after each failure), in seconds
+ATTEMPTS = 4
+RETRY_DELAY = 2.0
+
+# token: what the caller passed to write() (e.g. the bet list item ID)
+# error: the exception of the last attempt if the bet couldn't be written, otherwise None
+SheetWrite = namedtuple("SheetWrite", ["token", "error"])
+
+
+class SheetWriter:
+    """
+    Writes bets to a sink (the Google sheet, or a local file) on a background thread.
+
+    Each bet is a row plus a second value (its league). write() only queues the bet; the thread hands
+    whatever has queued up to the sink as one batch. A failed batch is retried after reset()ting the
+    sink, with a growing delay. poll() hands the outcome of each bet to the Tk thread.
+    """
+
+    def __init__(self, sink, batch_delay=BATCH_DELAY, attempts=ATTEMPTS, retry_delay=RETRY_DELAY,
+                 sleep=time.sleep):
+        """
+        Args:
+            sink: Where the bets go (see bet_sinks): write(rows, column_values) writes a batch and
+                reset() recovers after a failed one.
+            batch_delay (float): How long to wait for more bets before sending a batch, in seconds.
+            attempts (int): How many times a batch is tried before its bets are reported as failed.
+            retry_delay (float): The wait before the first retry, in seconds; doubled after each failure.
+            sleep (callable): Waits a number of seconds.
+        """
+        self.sink = sink
+        self.batch_delay = batch_delay
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+        self._sleep = sleep
+        self._pending = queue.Queue()
+        self._results = queue.Queue()
+        self._unfinished = 0
+        self._lock = threading.Condition()
+        self._thread = None
+
+    def write(self, token, row, column_value):
+        """
+        Queues a bet.
+
+        Args:
+            token: Identifies the bet in the SheetWrite reported by poll().
+            row (list): The values appended as a new row.
+            column_value (str): The value written to the first empty cell of the column.
+        """
+        with self._lock:
+            self._unfinished += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+                self._thread.start()
+        self._pending.put((token, row, column_value))
+
+    def poll(self):
+        """
+        Returns the outcome of every bet finished since the last poll, without blocking.
+
+        Returns:
+            list: SheetWrite tuples, in the order the bets were written.
+        """
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def flush(self, timeout=None):
+        """
+        Waits until every queued bet has been written or has failed.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._lock:
+            return self._lock.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._pending.get()]
+            if self.batch_delay:
+                self._sleep(self.batch_delay)
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            error = self._send([row for _, row, _ in batch], [value for _, _, value in batch])
+            for token, _, _ in batch:
+                self._results.put(SheetWrite(token, error))
+            with self._lock:
+                self._unfinished -= len(batch)
+                self._lock.notify_all()
+
+    def _send(self, rows, column_values):
+        delay = self.retry_delay
+        for attempt in range(self.attempts):
+            try:
+                self.sink.write(rows, column_values)
+                return None
+            except Exception as e:
+                print(f"Sheet write failed (attempt {attempt + 1} of {self.attempts}): {e}")
+                # Reconnect (e.g. expired credentials) before retrying
+                self.sink.reset()
+                if attempt + 1 == self.attempts:
+                    return e
+                self._sleep(delay)
+                delay *= 2
@@ -0,0 +1,236 @@
+import sqlite3
+import time
+from array import array
+
+# Cycles kept at full detail; older cycles only keep the rows whose odds or limit changed
+FULL_CYCLES = 48
+
+# A selection is one side of one market of one event on one book; odds rows refer to it by ID.
+# odds only holds the rows whose odds or limit changed, so writing a cycle and keeping odds indexed
+# by selection stay cheap. A cycle's odds rows are a range of row IDs. A full-detail cycle also keeps
+# the IDs of every selection it saw, in order, negated for the ones it wrote a row for (seen, an
+# array of 64-bit integers); compacting it drops them
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    first_row INTEGER,
+    last_row INTEGER,
+    compacted INTEGER NOT NULL DEFAULT 0,
+    seen BLOB
+);
+CREATE TABLE IF NOT EXISTS selections (
+    id INTEGER PRIMARY KEY,
+    book TEXT NOT NULL,
+    league TEXT NOT NULL,
+    event TEXT NOT NULL,
+    market TEXT NOT NULL,
+    selection TEXT,
+    line REAL
+);
+CREATE INDEX IF NOT EXISTS selections_event ON selections (event);
+CREATE INDEX IF NOT EXISTS selections_market ON selections (market);
+CREATE TABLE IF NOT EXISTS odds (
+    id INTEGER PRIMARY KEY,
+    cycle INTEGER NOT NULL,
+    selection INTEGER NOT NULL REFERENCES selections (id),
+    odds INTEGER,
+    stake_limit REAL
+);
+CREATE INDEX IF NOT EXISTS odds_selection ON odds (selection, cycle);
+"""
+
+
+def pinnacle_rows(league, result):
+    """
+    Flattens a Pinnacle scrape result into (book, league, event, market, selection, line, odds, limit) rows.
+    """
+    for event in result.values():
+        for market in event.get("markets", []):
+            description = market["description"]
+            threshold = market.get("threshold")
+            for price in market.get("prices", []):
+                selection = price.get("designation", price.get("team"))
+                if description == "team total":
+                    selection = f"{market['team']} {selection}"
+                line = price.get("points", price.get("handicap", threshold))
+                yield "pinnacle", league, event["name"], description, selection, line, price.get("price"), \
+                    market.get("limit")
+
+
+def fanduel_rows(league, result):
+    """
+    Flattens a FanDuel scrape result into (book, league, event, market, selection, line, odds, limit) rows.
+    FanDuel doesn't publish limits.
+    """
+    for event in result.values():
+        for market in event.get("markets", []):
+            for runner in market["runners"]:
+                yield "fanduel", league, event["name"], market["marketType"], runner["runnerName"], \
+                    runner["handicap"], runner["winRunnerOdds"], None
+
+
+class SnapshotStore:
+    """
+    Appends the parsed odds of every scrape cycle to a SQLite database, one row per
+    (cycle, book, league, event, market, selection, line, odds, limit). The book-to-line part is
+    stored once per selection, indexed by event and by market; odds rows refer to it.
+
+    Leagues are added as they are scraped and written together by commit(), in one transaction.
+    Only the rows whose odds or limit differ from the last time their selection was seen are
+    written, and each cycle lists the selections it saw: its unchanged rows are read back from
+    their selections' last changes. Once a cycle is more than full_cycles old, the list is dropped,
+    so a compacted cycle only has its changed rows, each holding until the next row of the same
+    selection.
+
+    The scan thread writes while the GUI thread may read, so the connection is shared across
+    threads; it is only used by one thread at a time.
+    """
+
+    def __init__(self, path, full_cycles=FULL_CYCLES, clock=time.time):
+        """
+        Args:
+            path (str): The database file, created if missing. ":memory:" keeps it in memory.
+            full_cycles (int): The number of recent cycles kept at full detail.
+            clock (callable): Returns the current time in seconds since the epoch.
+        """
+        self.full_cycles = full_cycles
+        self._clock = clock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        # (book, league, event, market, selection, line) -> selection ID
+        self._selections = {tuple(row[1:]): row[0] for row in self._connection.execute("SELECT * FROM selections")}
+        self._pending = []  # rows of the cycle being scraped
+        self._last = {}  # selection ID -> (odds, limit, cycle) when last seen
+
+    def add(self, league, pinnacle, fanduel):
+        """
+        Adds a scraped league to the current cycle.
+
+        Args:
+            league (str): The league label.
+            pinnacle (dict): The Pinnacle scrape result.
+            fanduel (dict): The FanDuel scrape result.
+        """
+        self._pending.extend(pinnacle_rows(league, pinnacle))
+        self._pending.extend(fanduel_rows(league, fanduel))
+
+    def commit(self, now=None):
+        """
+        Writes the leagues added since the last commit as one cycle, then compacts the cycle that
+        just fell out of the full-detail window. Does nothing if nothing was added.
+
+        Returns:
+            int: The cycle's ID, or None if nothing was written.
+        """
+        if not self._pending:
+            return None
+        now = self._clock() if now is None else now
+        rows, self._pending = self._pending, []
+        selections = dict(self._selections)
+        new_selections = []
+        changes = {}
+        with self._connection:
+            cycle = self._connection.execute("INSERT INTO cycles (time) VALUES (?)", (now,)).lastrowid
+            seen = array('q')
+            changed = []
+            for row in rows:
+                key, value = row[:6], row[6:]
+                selection = selections.get(key)
+                if selection is None:
+                    selection = selections[key] = len(selections) + 1
+                    new_selections.append((selection, *key))
+                last = changes.get(selection) or self._last.get(selection)
+                if last is None or last[:2] != value:
+                    changed.append((cycle, selection, *value))
+                    seen.append(-selection)
+                else:
+                    seen.append(selection)
+                changes[selection] = (*value, cycle)
+            self._connection.executemany("INSERT INTO selections VALUES (?, ?, ?, ?, ?, ?, ?)", new_selections)
+            first_row = self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM odds").fetchone()[0]
+            self._connection.executemany(
+                "INSERT INTO odds (cycle, selection, odds, stake_limit) VALUES (?, ?, ?, ?)", changed)
+            self._connection.execute("UPDATE cycles SET first_row = ?, last_row = ?, seen = ? WHERE id = ?",
+                                     (first_row, first_row + len(changed) - 1, seen.tobytes(), cycle))
+            self._compact(cycle - self.full_cycles)
+        self._selections = selections
+        self._last.update(changes)
+        return cycle
+
+    def _compact(self, before):
+        # Every cycle that fell out of the window at once: only their lists of selections go
+        stale = self._connection.execute(
+            "UPDATE cycles SET compacted = 1, seen = NULL WHERE compacted = 0 AND id <= ?", (before,)).rowcount
+        if stale:
+            # Forget selections not seen since; if they come back their rows are written again
+            self._last = {key: value for key, value in self._last.items() if value[2] > before}
+
+    def cycles(self):
+        """
+        Returns (cycle ID, time, compacted) for every cycle, oldest first.
+        """
+        return self._connection.execute("SELECT id, time, compacted FROM cycles ORDER BY id").fetchall()
+
+    def rows(self, cycle=None, event=None, market=None):
+        """
+        Returns the stored rows as (cycle, book, league, event, market, selection, line, odds, limit),
+        optionally only those of a cycle, an event or a market: every selection seen by a full-detail
+        cycle, and the changed ones of a compacted cycle.
+        """
+        conditions, params = [], []
+        for column, value in (("event", event), ("market", market)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        cycles = self._connection.execute(
+            "SELECT id, first_row, last_row, seen FROM cycles" + (" WHERE id = ?" if cycle is not None else "") +
+            " ORDER BY id", () if cycle is None else (cycle,)).fetchall()
+        if not cycles:
+            return []
+
+        # cycle -> its changed rows as (cycle, selection ID, book, ..., odds, limit), in the order
+        # written. A cycle's rows are a range of IDs, so the primary key finds them
+        changed = {}
+        for row in self._connection.execute(
+                "SELECT odds.cycle, odds.selection, book, league, event, market, selections.selection, line, "
+                "odds, stake_limit FROM odds JOIN selections ON selections.id = odds.selection WHERE " +
+                " AND ".join(["odds.id BETWEEN ? AND ?"] + conditions) + " ORDER BY odds.id",
+                [cycles[0][1], cycles[-1][2]] + params):
+            changed.setdefault(row[0], []).append(row)
+        rows = [(row[0], *row[2:]) for cycle, _, _, seen in cycles if seen is None
+                for row in changed.get(cycle, ())]
+        full = [(cycle, first_row, seen) for cycle, first_row, _, seen in cycles if seen is not None]
+        if not full:
+            return rows
+
+        # Full-detail cycles come last. What their selections stood at before the first of them is
+        # their last change
+        labels = {row[0]: row[1:] for row in self._connection.execute(
+            "SELECT * FROM selections" + (" WHERE " + " AND ".join(conditions) if conditions else ""), params)}
+        current = {selection: (odds, limit) for selection, odds, limit, _ in self._connection.execute(
+            "SELECT odds.selection, odds, stake_limit, MAX(odds.id) FROM odds JOIN selections "
+            "ON selections.id = odds.selection WHERE " + " AND ".join(["odds.id < ?"] + conditions) +
+            " GROUP BY odds.selection", [full[0][1]] + params)}
+        # The selections asked for, with either sign (see SCHEMA)
+        wanted = set(labels).union(-selection for selection in labels) if conditions else None
+        for cycle, _, seen in full:
+            pending = {}  # selection -> its changes in the cycle, in order
+            for row in changed.get(cycle, ()):
+                pending.setdefault(row[1], []).append(row[8:])
+            selections = array('q')
+            selections.frombytes(seen)
+            if wanted is not None:
+                selections = [selection for selection in selections if selection in wanted]
+            for selection in selections:
+                # Negative: the selection's row was written, so it is the next of its changes
+                if selection < 0:
+                    selection = -selection
+                    current[selection] = pending[selection].pop(0)
+                rows.append((cycle, *labels[selection], *current[selection]))
+        return rows
+
+    def close(self):
+        self._connection.close()
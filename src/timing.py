@@ -0,0 +1,171 @@
+import functools
+import os
+import threading
+import time
+
+# Stages in pipeline order, as the columns of the summary; stages not listed come after them
+STAGES = ("fetch", "wait", "parse", "match", "devig", "filter", "render")
+# Set to anything to time every cycle from startup (the daemon also has --timings)
+ENABLE_VARIABLE = "DEVIGGER_TIMINGS"
+
+
+class _NoSpan:
+    """
+    What span() returns while timing is disabled: entering and leaving it does nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("timer", "stage", "league", "start")
+
+    def __init__(self, timer, stage, league):
+        self.timer = timer
+        self.stage = stage
+        self.league = league
+
+    def __enter__(self):
+        self.start = self.timer.clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.stage, self.league, self.timer.clock() - self.start)
+        return False
+
+
+class _LeagueScope:
+    __slots__ = ("local", "league", "previous")
+
+    def __init__(self, local, league):
+        self.local = local
+        self.league = league
+
+    def __enter__(self):
+        self.previous = getattr(self.local, "league", None)
+        self.local.league = self.league
+        return self
+
+    def __exit__(self, *exc_info):
+        self.local.league = self.previous
+        return False
+
+
+class StageTimer:
+    """
+    Adds up the time spent in each stage of the scan pipeline, per league, for one cycle at a time.
+
+    Code is timed with span() blocks (or the timed() decorator). A span's league is the one given,
+    or else the one set on its thread by the enclosing league() block, so functions that don't know
+    their league (the parse functions) are attributed to the league being scanned. While the timer
+    is disabled, span() and league() return a shared no-op, so instrumented code only pays for a
+    call and an attribute check.
+
+    Parses run in worker processes with parse workers, where they aren't timed: the time the scan
+    waited for them shows as "wait".
+    """
+
+    def __init__(self, enabled=False, clock=time.perf_counter):
+        """
+        Args:
+            enabled (bool): Whether spans are recorded.
+            clock (callable): Returns a monotonic time in seconds.
+        """
+        self.enabled = enabled
+        self.clock = clock
+        self._totals = {}  # (league, stage) -> [seconds, spans]
+        self._lock = threading.Lock()  # the scan thread and the GUI thread both record spans
+        self._local = threading.local()
+
+    def span(self, stage, league=None):
+        """
+        Returns a context manager timing a block as a stage of a league (default: the current league).
+        """
+        if not self.enabled:
+            return NO_SPAN
+        return _Span(self, stage, league if league is not None else getattr(self._local, "league", None))
+
+    def league(self, league):
+        """
+        Returns a context manager making a league the current league of the thread's spans.
+        """
+        if not self.enabled:
+            return NO_SPAN
+        return _LeagueScope(self._local, league)
+
+    def add(self, stage, league, seconds):
+        with self._lock:
+            total = self._totals.get((league, stage))
+            if total is None:
+                self._totals[(league, stage)] = [seconds, 1]
+            else:
+                total[0] += seconds
+                total[1] += 1
+
+    def totals(self):
+        """
+        Returns {(league, stage): (seconds, spans)} since the last reset.
+        """
+        with self._lock:
+            return {key: tuple(total) for key, total in self._totals.items()}
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+    def summary(self):
+        """
+        Returns the totals since the last reset as a table of milliseconds: a row per league (spans
+        outside any league are "-"), a column per stage, and totals.
+        """
+        totals = self.totals()
+        leagues = list(dict.fromkeys(league for league, _ in totals))
+        recorded = {stage for _, stage in totals}
+        stages = [stage for stage in STAGES if stage in recorded] + sorted(recorded.difference(STAGES))
+        width = max([len("league")] + [len(league or "-") for league in leagues])
+
+        lines = [f"{'league':<{width}}" + "".join(f" {stage:>9}" for stage in stages) + f" {'total':>9}"]
+        stage_totals = dict.fromkeys(stages, 0.0)
+        for league in leagues:
+            row = [totals.get((league, stage), (0.0, 0))[0] for stage in stages]
+            for stage, seconds in zip(stages, row):
+                stage_totals[stage] += seconds
+            lines.append(f"{league or '-':<{width}}" + "".join(f" {seconds * 1e3:>9.1f}" for seconds in row) +
+                         f" {sum(row) * 1e3:>9.1f}")
+        lines.append(f"{'total':<{width}}" + "".join(f" {seconds * 1e3:>9.1f}" for seconds in stage_totals.values()) +
+                     f" {sum(stage_totals.values()) * 1e3:>9.1f}")
+        return "\n".join(lines)
+
+
+# The process's timer, shared by every instrumented module
+TIMER = StageTimer(enabled=bool(os.environ.get(ENABLE_VARIABLE)))
+
+
+def span(stage, league=None):
+    """
+    Times a block as a stage on TIMER; see StageTimer.span.
+    """
+    return TIMER.span(stage, league)
+
+
+def timed(stage):
+    """
+    Decorates a function so each call is timed as a stage on TIMER, while it is enabled.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not TIMER.enabled:
+                return function(*args, **kwargs)
+            with TIMER.span(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import cached_property
 
 
 class StatCategory(Enum):
@@ -32,6 +33,41 @@ class OverUnder(Enum):
     UNDER = 2
 
 
+# Scoring unit for totals in each league
+UNIT_MAP = {
+    "NFL": "Points",
+    "NHL": "Goals",
+    "NCAAFB": "Points",
+    "NCAAB": "Points",
+    "UCL": "Goals",
+    "EPL": "Goals",
+    "SHL": "Goals",
+    "NL": "Goals",
+    "TFL": "Goals",
+    "TSL": "Goals",
+    "J1": "Goals",
+    "L1": "Goals",
+    "IWF": "Goals",
+    "GSL": "Goals",
+    "CBA": "Points",
+    "AO": "Points",
+    "NBB": "Points"
+}
+
+
+def wager_key_str(key):
+    """
+    Formats a wager key as a string for logs and sheets.
+
+    :param key: The wager key (tuple of external market ID, selection ID and line).
+    :return: The key as a string, e.g. "42.476476655:26799192" or "42.476476655:26799192:221.5".
+    """
+    external_market_id, selection_id, line = key
+    if line is None:
+        return f"{external_market_id}:{selection_id}"
+    return f"{external_market_id}:{selection_id}:{line:g}"
+
+
 class Wager:
     def __init__(self, game: str, fanduel_odds: int, pinnacle_odds: int, pinnacle_opposing_odds: int,
                  pinnacle_limit: int, external_market_id: str, selection_id: int, league: str):
@@ -56,6 +92,17 @@ class Wager:
         self.selection_id = selection_id
         self.league = league
 
+    # The line (spread, total or prop value) of the bet. None for markets without a line.
+    line = None
+
+    @cached_property
+    def key(self):
+        """
+        Stable, hashable identity of the bet: (external market ID, selection ID, line).
+        Use this instead of pretty() to compare, index or log bets.
+        """
+        return (self.external_market_id, self.selection_id, self.line)
+
 
 class Moneyline(Wager):
     def __init__(self, game: str, fanduel_odds: int, pinnacle_odds: int, pinnacle_limit: int,
@@ -165,6 +212,10 @@ class PlayerProps(Wager):
         self.stat = stat
         self.value = value
 
+    @property
+    def line(self):
+        return self.value
+
     def __repr__(self):
         """
         Provide a string representation of the PlayerProps object.
@@ -242,6 +293,10 @@ class TeamTotal(Wager):
         self.over_under = over_under
         self.value = value
 
+    @property
+    def line(self):
+        return self.value
+
     def __repr__(self):
         """
         Provide a string representation of the TeamTotal object.
@@ -254,27 +309,7 @@ class TeamTotal(Wager):
         """
         Provide a pretty string representation of the TeamTotal object.
         """
-
-        unit_map = {
-            "NFL": "Points",
-            "NHL": "Goals",
-            "NCAAFB": "Points",
-            "NCAAB": "Points",
-            "UCL": "Goals",
-            "EPL": "Goals",
-            "SHL": "Goals",
-            "NL": "Goals",
-            "TFL": "Goals",
-            "TSL": "Goals",
-            "J1": "Goals",
-            "L1": "Goals",
-            "IWF": "Goals",
-            "GSL": "Goals",
-            "CBA": "Points",
-            "AO": "Points"
-        }
-
-        return f"{self.team} {self.over_under.name.capitalize()} {self.value} {unit_map.get(self.league)} {self.game}"
+        return f"{self.team} {self.over_under.name.capitalize()} {self.value} {UNIT_MAP.get(self.league)} {self.game}"
 
 
 class Spread(Wager):
@@ -301,6 +336,10 @@ class Spread(Wager):
         self.opponent = opponent
         self.spread = spread
 
+    @property
+    def line(self):
+        return self.spread
+
     def __repr__(self):
         """
         Provide a string representation of the Spread object.
@@ -338,6 +377,10 @@ class TotalPoints(Wager):
         self.over_under = over_under
         self.value = value
 
+    @property
+    def line(self):
+        return self.value
+
     def __repr__(self):
         """
         Provide a string representation of the TotalPoints object.
@@ -350,25 +393,4 @@ class TotalPoints(Wager):
         """
         Provide a pretty string representation of the TotalPoints object.
         """
-
-        unit_map = {
-            "NFL": "Points",
-            "NHL": "Goals",
-            "NCAAFB": "Points",
-            "NCAAB": "Points",
-            "UCL": "Goals",
-            "EPL": "Goals",
-            "SHL": "Goals",
-            "NL": "Goals",
-            "TFL": "Goals",
-            "TSL": "Goals",
-            "J1": "Goals",
-            "L1": "Goals",
-            "IWF": "Goals",
-            "GSL": "Goals",
-            "CBA": "Points",
-            "AO": "Points",
-            "NBB": "Points"
-        }
-
-        return f"{self.over_under.name.capitalize()} {self.value} Total {unit_map.get(self.league)} {self.game}"
+        return f"{self.over_under.name.capitalize()} {self.value} Total {UNIT_MAP.get(self.league)} {self.game}"
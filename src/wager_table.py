@@ -0,0 +1,326 @@
+import math
+from array import array
+
+from src.devig import DevigMethod, american_to_probability, devig, devig3, get_confidence_value, kelly_criterion
+from src.timing import timed
+from src.wager import Draw, Moneyline, PlayerProps, PlayerPropsYes, Spread, TeamTotal, TotalPoints
+
+# Market type codes stored in the market_type column. The order matters: the code is the index.
+MARKET_TYPES = (Moneyline, Draw, Spread, TotalPoints, PlayerProps, PlayerPropsYes, TeamTotal)
+MONEYLINE, DRAW, SPREAD, TOTAL_POINTS, PLAYER_PROPS, PLAYER_PROPS_YES, TEAM_TOTAL = range(len(MARKET_TYPES))
+
+# American odds are never 0, so 0 marks missing odds (same convention as pinnacle_draw_odds)
+MISSING_ODDS = 0
+
+MAX_RISK_PERCENTAGE = 2.5
+
+
+class WagerTable:
+    """
+    Columnar storage for every wager matched in a scrape.
+
+    Each row is one FanDuel selection paired with the Pinnacle prices used to devig it. Numeric
+    fields live in typed arrays, which evaluate() and filtering read with one loop over the row
+    indices (no Wager per row), and Wager objects are only built by wager() for the rows that end
+    up being displayed.
+    """
+
+    def __init__(self):
+        self.market_type = array('B')
+        self.league = array('H')
+        self.fanduel_odds = array('l')
+        self.pinnacle_odds = array('l')
+        self.pinnacle_opposing_odds = array('l')
+        self.pinnacle_third_odds = array('l')
+        self.limit = array('d')
+        self.line = array('d')
+
+        # Filled by evaluate()
+        self.fair_prob = array('d')
+        self.fanduel_prob = array('d')
+        self.ev = array('d')
+        self.kelly = array('d')
+        self.confidence = array('d')
+        self.risk = array('d')
+
+        # Columns that cannot be typed arrays
+        self.game = []
+        self.team = []
+        self.opponent = []
+        self.stat = []
+        self.over_under = []
+        self.external_market_id = []
+        self.selection_id = []
+
+        self.leagues = []
+        self._league_codes = {}
+
+    def __len__(self):
+        return len(self.market_type)
+
+    def league_code(self, league):
+        """
+        Returns the integer code for a league, registering it if it has not been seen yet.
+
+        Args:
+            league (str): The league name.
+
+        Returns:
+            int: The league code.
+        """
+        code = self._league_codes.get(league)
+        if code is None:
+            code = len(self.leagues)
+            self.leagues.append(league)
+            self._league_codes[league] = code
+        return code
+
+    def find_league_code(self, league):
+        """
+        Returns the integer code for a league without registering it.
+
+        Args:
+            league (str): The league name.
+
+        Returns:
+            int: The league code, or None if no row has been added for the league.
+        """
+        return self._league_codes.get(league)
+
+    def _append(self, market_type, game, fanduel_odds, pinnacle_odds, pinnacle_opposing_odds,
+                pinnacle_third_odds, pinnacle_limit, line, team, opponent, stat, over_under,
+                external_market_id, selection_id, league):
+        self.market_type.append(market_type)
+        self.league.append(self.league_code(league))
+        self.fanduel_odds.append(MISSING_ODDS if fanduel_odds is None else fanduel_odds)
+        self.pinnacle_odds.append(pinnacle_odds)
+        self.pinnacle_opposing_odds.append(pinnacle_opposing_odds)
+        self.pinnacle_third_odds.append(pinnacle_third_odds)
+        self.limit.append(0 if pinnacle_limit is None else pinnacle_limit)
+        self.line.append(math.nan if line is None else line)
+        self.game.append(game)
+        self.team.append(team)
+        self.opponent.append(opponent)
+        self.stat.append(stat)
+        self.over_under.append(over_under)
+        self.external_market_id.append(external_market_id)
+        self.selection_id.append(selection_id)
+
+    def add_moneyline(self, game, fanduel_odds, pinnacle_odds, pinnacle_limit, team, opponent,
+                      pinnacle_opposing_odds, pinnacle_draw_odds, external_market_id, selection_id, league):
+        """
+        Adds a moneyline row. Arguments match the Moneyline constructor.
+        """
+        self._append(MONEYLINE, game, fanduel_odds, pinnacle_odds, pinnacle_opposing_odds, pinnacle_draw_odds,
+                     pinnacle_limit, None, team, opponent, None, None, external_market_id, selection_id, league)
+
+    def add_draw(self, game, fanduel_draw_odds, pinnacle_odds, pinnacle_home_odds, pinnacle_away_odds,
+                 pinnacle_limit, external_market_id, selection_id, league):
+        """
+        Adds a draw row. Arguments match the Draw constructor.
+        """
+        self._append(DRAW, game, fanduel_draw_odds, pinnacle_odds, pinnacle_home_odds, pinnacle_away_odds,
+                     pinnacle_limit, None, None, None, None, None, external_market_id, selection_id, league)
+
+    def add_spread(self, game, fanduel_odds, pinnacle_odds, pinnacle_limit, team, opponent, spread,
+                   pinnacle_opposing_odds, external_market_id, selection_id, league):
+        """
+        Adds a spread row. Arguments match the Spread constructor.
+        """
+        self._append(SPREAD, game, fanduel_odds, pinnacle_odds, pinnacle_opposing_odds, MISSING_ODDS,
+                     pinnacle_limit, spread, team, opponent, None, None, external_market_id, selection_id, league)
+
+    def add_total_points(self, game, fanduel_odds, pinnacle_odds, pinnacle_limit, over_under, value,
+                         pinnacle_opposing_odds, external_market_id, selection_id, league):
+        """
+        Adds a total points row. Arguments match the TotalPoints constructor.
+        """
+        self._append(TOTAL_POINTS, game, fanduel_odds, pinnacle_odds, pinnacle_opposing_odds, MISSING_ODDS,
+                     pinnacle_limit, value, None, None, None, over_under, external_market_id, selection_id, league)
+
+    def add_team_total(self, game, fanduel_odds, pinnacle_odds, pinnacle_limit, team, over_under, value,
+                       pinnacle_opposing_odds, external_market_id, selection_id, league):
+        """
+        Adds a team total row. Arguments match the TeamTotal constructor.
+        """
+        self._append(TEAM_TOTAL, game, fanduel_odds, pinnacle_odds, pinnacle_opposing_odds, MISSING_ODDS,
+                     pinnacle_limit, value, team, None, None, over_under, external_market_id, selection_id, league)
+
+    def add_player_props(self, game, fanduel_odds, pinnacle_odds, pinnacle_limit, player, stat, over_under, value,
+                         pinnacle_opposing_odds, external_market_id, selection_id, league):
+        """
+        Adds a player props over/under row. Arguments match the PlayerProps constructor.
+        """
+        self._append(PLAYER_PROPS, game, fanduel_odds, pinnacle_odds, pinnacle_opposing_odds, MISSING_ODDS,
+                     pinnacle_limit, value, player, None, stat, over_under, external_market_id, selection_id, league)
+
+    def add_player_props_yes(self, game, fanduel_odds, pinnacle_odds, pinnacle_limit, player, stat,
+                             pinnacle_opposing_odds, external_market_id, selection_id, league):
+        """
+        Adds a player props yes row. Arguments match the PlayerPropsYes constructor.
+        """
+        self._append(PLAYER_PROPS_YES, game, fanduel_odds, pinnacle_odds, pinnacle_opposing_odds, MISSING_ODDS,
+                     pinnacle_limit, None, player, None, stat, None, external_market_id, selection_id, league)
+
+    @timed("devig")
+    def evaluate(self, devig_method=DevigMethod.POWER, rows=None):
+        """
+        Fills the fair probability, EV, Kelly, confidence and risk columns for every row, or only for
+        some rows (the others are left at 0).
+
+        Three-way markets (draws and moneylines with draw odds) are devigged with devig3, everything
+        else with devig. Devig results are memoized on the Pinnacle prices because the same pair of
+        prices shows up many times on a slate.
+
+        Args:
+            devig_method (DevigMethod): The method to use for devigging.
+            rows (list, optional): The row indices to evaluate. Defaults to every row.
+        """
+        n = len(self)
+        fair_prob = array('d', bytes(8 * n))
+        fanduel_prob = array('d', bytes(8 * n))
+        ev = array('d', bytes(8 * n))
+        kelly = array('d', bytes(8 * n))
+        confidence = array('d', bytes(8 * n))
+        risk = array('d', bytes(8 * n))
+
+        devig_cache = {}
+        confidence_cache = {}
+        for i in range(n) if rows is None else rows:
+            odds = self.pinnacle_odds[i]
+            opposing = self.pinnacle_opposing_odds[i]
+            third = self.pinnacle_third_odds[i]
+            three_way = third != MISSING_ODDS and self.market_type[i] in (MONEYLINE, DRAW)
+            key = (odds, opposing, third) if three_way else (odds, opposing)
+            true_prob = devig_cache.get(key)
+            if true_prob is None:
+                true_prob = devig3(odds, opposing, third, devig_method) if three_way else \
+                    devig(odds, opposing, devig_method)
+                devig_cache[key] = true_prob
+            fair_prob[i] = true_prob
+
+            limit = self.limit[i]
+            conf = confidence_cache.get(limit)
+            if conf is None:
+                conf = confidence_cache[limit] = get_confidence_value(limit)
+            confidence[i] = conf
+
+            fanduel_odds = self.fanduel_odds[i]
+            if fanduel_odds == MISSING_ODDS:
+                continue
+            implied = american_to_probability(fanduel_odds)
+            fanduel_prob[i] = implied
+            if true_prob > implied:
+                ev[i] = (true_prob - implied) / implied * 100
+                kelly[i] = kelly_criterion(true_prob, implied) * 100
+                risk[i] = min(MAX_RISK_PERCENTAGE, kelly[i] * conf / 10)
+
+        self.fair_prob = fair_prob
+        self.fanduel_prob = fanduel_prob
+        self.ev = ev
+        self.kelly = kelly
+        self.confidence = confidence
+        self.risk = risk
+
+    def positive_ev(self):
+        """
+        Returns the indices of rows whose fair probability beats the FanDuel implied probability.
+        Must be called after evaluate().
+
+        Returns:
+            list: The row indices.
+        """
+        ev = self.ev
+        return [i for i in range(len(ev)) if ev[i] > 0]
+
+    def ranked(self, indices, column="risk"):
+        """
+        Sorts row indices by a numeric column, highest first.
+
+        Args:
+            indices (list): The row indices to sort.
+            column (str): The column to sort by (e.g. "risk" or "ev").
+
+        Returns:
+            list: The sorted row indices.
+        """
+        values = getattr(self, column)
+        return sorted(indices, key=values.__getitem__, reverse=True)
+
+    def key(self, i):
+        """
+        Returns the key of a row without materializing it. Equal to self.wager(i).key.
+
+        Args:
+            i (int): The row index.
+
+        Returns:
+            tuple: (external market ID, selection ID, line).
+        """
+        line = self.line[i]
+        return (self.external_market_id[i], self.selection_id[i], None if math.isnan(line) else line)
+
+    def keys(self):
+        """
+        Returns the key of every row, in a single column pass. Equal to [self.key(i) for i in range(len(self))].
+        """
+        # NaN is the only value unequal to itself
+        lines = [None if line != line else line for line in self.line]
+        return list(zip(self.external_market_id, self.selection_id, lines))
+
+    def wager(self, i):
+        """
+        Materializes a single row as a Wager object.
+
+        Args:
+            i (int): The row index.
+
+        Returns:
+            Wager: The wager for that row.
+        """
+        market_type = self.market_type[i]
+        game = self.game[i]
+        fanduel_odds = self.fanduel_odds[i]
+        if fanduel_odds == MISSING_ODDS:
+            fanduel_odds = None
+        pinnacle_odds = self.pinnacle_odds[i]
+        opposing = self.pinnacle_opposing_odds[i]
+        third = self.pinnacle_third_odds[i]
+        limit = self.limit[i]
+        limit = int(limit) if limit.is_integer() else limit
+        line = self.line[i]
+        team = self.team[i]
+        external_market_id = self.external_market_id[i]
+        selection_id = self.selection_id[i]
+        league = self.leagues[self.league[i]]
+
+        if market_type == MONEYLINE:
+            return Moneyline(game, fanduel_odds, pinnacle_odds, limit, team, self.opponent[i], opposing, third,
+                             external_market_id, selection_id, league)
+        elif market_type == DRAW:
+            return Draw(game, fanduel_odds, pinnacle_odds, opposing, third, limit, external_market_id,
+                        selection_id, league)
+        elif market_type == SPREAD:
+            return Spread(game, fanduel_odds, pinnacle_odds, limit, team, self.opponent[i], line, opposing,
+                          external_market_id, selection_id, league)
+        elif market_type == TOTAL_POINTS:
+            return TotalPoints(game, fanduel_odds, pinnacle_odds, limit, self.over_under[i], line, opposing,
+                               external_market_id, selection_id, league)
+        elif market_type == TEAM_TOTAL:
+            return TeamTotal(game, fanduel_odds, pinnacle_odds, limit, team, self.over_under[i], line, opposing,
+                             external_market_id, selection_id, league)
+        elif market_type == PLAYER_PROPS:
+            return PlayerProps(game, fanduel_odds, pinnacle_odds, limit, team, self.stat[i], self.over_under[i],
+                               int(line), opposing, external_market_id, selection_id, league)
+        return PlayerPropsYes(game, fanduel_odds, pinnacle_odds, limit, team, self.stat[i], opposing,
+                              external_market_id, selection_id, league)
+
+    def bets(self, indices):
+        """
+        Yields (wager, ev, risk_percentage) tuples for the given rows, materializing each wager lazily.
+
+        Args:
+            indices (list): The row indices to yield, in order.
+        """
+        for i in indices:
+            yield self.wager(i), self.ev[i], self.risk[i]
@@ -0,0 +1,33 @@
+"""
+WagerTable factories shared by the tests.
+"""
+from src.wager import OverUnder
+from src.wager_table import WagerTable
+
+
+def nba_moneylines(*rows, table=None):
+    """
+    Returns an NBA WagerTable of moneylines, one per (FanDuel odds, Pinnacle odds, limit, selection ID).
+
+    Args:
+        table (WagerTable): The table to add them to (default: a new one).
+    """
+    table = WagerTable() if table is None else table
+    for fanduel_odds, pinnacle_odds, limit, selection_id in rows:
+        table.add_moneyline("Away @ Home", fanduel_odds, pinnacle_odds, limit, "Home", "Away", 100, 0, "42.1",
+                            selection_id, "NBA")
+    return table
+
+
+def nba_totals(*rows, table=None):
+    """
+    Returns an NBA WagerTable of overs, one per (FanDuel odds, Pinnacle odds, line, selection ID).
+
+    Args:
+        table (WagerTable): The table to add them to (default: a new one).
+    """
+    table = WagerTable() if table is None else table
+    for fanduel_odds, pinnacle_odds, line, selection_id in rows:
+        table.add_total_points("Away @ Home", fanduel_odds, pinnacle_odds, 2000, OverUnder.OVER, line, 100,
+                               "42.1", selection_id, "NBA")
+    return table
@@ -0,0 +1,153 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src import bet_list
+from src.bet_list import ALL_LEAGUES, BetListView
+
+
+class FakeVar:
+    """
+    Stands in for tk.StringVar.
+    """
+
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeTree:
+    """
+    Stands in for ttk.Treeview: keeps the shown rows in order, and detached rows aside, as Tk does.
+    Idle callbacks wait in idle until run_idle().
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.children = []
+        self.items = {}  # item ID -> {"values": list, "tags": tuple}
+        self.idle = []
+
+    def insert(self, parent, index, iid, values, tags):
+        self.items[iid] = {"values": values, "tags": tags}
+        self.children.insert(len(self.children) if index == "end" else index, iid)
+
+    def move(self, iid, parent, index):
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def detach(self, iid):
+        if iid in self.children:
+            self.children.remove(iid)
+
+    def delete(self, iid):
+        self.detach(iid)
+        del self.items[iid]
+
+    def item(self, iid, option=None, **kwargs):
+        if option is not None:
+            return self.items[iid][option]
+        self.items[iid].update(kwargs)
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def run_idle(self):
+        idle, self.idle = self.idle, []
+        for callback in idle:
+            callback()
+
+    def __getattr__(self, name):
+        # heading, column, tag_configure, pack, bind...: layout calls with nothing to check
+        return mock.Mock()
+
+
+def view():
+    tk = SimpleNamespace(Frame=mock.Mock(), Label=mock.Mock(), Button=mock.Mock(), Menu=mock.Mock(),
+                         StringVar=FakeVar)
+    ttk = SimpleNamespace(Combobox=mock.MagicMock(), Treeview=FakeTree, Scrollbar=mock.Mock())
+    with mock.patch.object(bet_list, "tk", tk), mock.patch.object(bet_list, "ttk", ttk):
+        return BetListView(parent=None, actions=[])
+
+
+class TestBetListView(unittest.TestCase):
+
+    def setUp(self):
+        self.view = view()
+        self.tree = self.view.tree
+
+    def insert(self, iid, league, ev, at_top=True):
+        self.view.insert(iid, {"bet": iid, "ev": f"{ev}%", "league": league}, league, {"ev": ev}, at_top=at_top)
+
+    def test_new_rows_go_on_top_or_at_the_bottom(self):
+        self.insert("a", "NBA", 1.0)
+        self.insert("b", "NBA", 2.0)
+        self.insert("c", "NHL", 3.0, at_top=False)
+        self.insert("d", "NBA", 4.0)
+        self.assertEqual(self.tree.children, ["d", "b", "a", "c"])
+        self.assertEqual(len(self.view), 4)
+        self.assertIn("c", self.view)
+        self.assertEqual(self.tree.items["a"]["values"], ["a", "", "1.0%", "", "", "NBA", ""])
+
+    def test_removed_rows_leave_the_order_of_the_rest(self):
+        for iid in "abcd":
+            self.insert(iid, "NBA", 1.0, at_top=False)
+        self.view.remove("b")
+        self.view.remove("b")
+        self.view.remove("x")
+        self.assertEqual(self.tree.children, ["a", "c", "d"])
+        self.assertNotIn("b", self.view)
+
+        # Positions freed by removals aren't reused
+        self.insert("e", "NBA", 1.0)
+        self.insert("f", "NBA", 1.0, at_top=False)
+        self.view._relayout()
+        self.assertEqual(self.tree.children, ["e", "a", "c", "d", "f"])
+
+    def test_sorting_by_a_column(self):
+        self.insert("a", "NBA", 2.0)
+        self.insert("b", "NHL", 5.0)
+        self.insert("c", "NBA", 1.0)
+        self.view.sort_by("ev")
+        self.assertEqual(self.tree.children, ["b", "a", "c"])
+        self.view.sort_by("ev")
+        self.assertEqual(self.tree.children, ["c", "a", "b"])
+        self.view.sort_by("bet")
+        self.assertEqual(self.tree.children, ["a", "b", "c"])
+
+        # Inserts and updates while sorted are re-sorted once, when Tk is idle
+        self.view.sort_by("ev")
+        self.insert("d", "NBA", 3.0)
+        self.view.update("a", {"bet": "a", "ev": "9.0%"}, {"ev": 9.0})
+        self.assertEqual(len(self.tree.idle), 1)
+        self.tree.run_idle()
+        self.assertEqual(self.tree.children, ["a", "b", "d", "c"])
+
+    def test_league_filter(self):
+        self.insert("a", "NBA", 1.0, at_top=False)
+        self.insert("b", "NHL", 1.0, at_top=False)
+        self.insert("c", "NBA", 1.0, at_top=False)
+        self.view.league_menu.__setitem__.assert_called_with("values", [ALL_LEAGUES, "NBA", "NHL"])
+
+        self.view.league_var.set("NBA")
+        self.view._relayout()
+        self.assertEqual(self.tree.children, ["a", "c"])
+
+        # Rows of other leagues are hidden as they come in, and removable while hidden
+        self.insert("d", "NHL", 1.0)
+        self.insert("e", "NBA", 1.0)
+        self.view.remove("b")
+        self.assertEqual(self.tree.children, ["e", "a", "c"])
+
+        self.view.league_var.set(ALL_LEAGUES)
+        self.view._relayout()
+        self.assertEqual(self.tree.children, ["e", "d", "a", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
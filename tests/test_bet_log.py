@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from src.bet_log import BetLog, SqliteBetLog
+
+
+class TestBetLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.directory.name, "logged_bets")
+        self.legacy_file = os.path.join(self.directory.name, "logged_bets.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_log_is_partitioned_by_day(self):
+        bet_log = BetLog(self.log_dir)
+        self.assertFalse(bet_log.is_logged("01/31/2025", "42.1:11"))
+        bet_log.log("01/31/2025", "42.1:11")
+        bet_log.log("01/31/2025", "42.1:11")
+        bet_log.log("02/01/2025", "42.1:12:-1.5")
+        self.assertTrue(bet_log.is_logged("01/31/2025", "42.1:11"))
+        self.assertFalse(bet_log.is_logged("02/01/2025", "42.1:11"))
+
+        self.assertEqual(sorted(os.listdir(self.log_dir)), ["2025-01-31.txt", "2025-02-01.txt"])
+        with open(os.path.join(self.log_dir, "2025-01-31.txt")) as f:
+            self.assertEqual(f.read(), "42.1:11\n")
+        # A new log reads the days back from disk
+        self.assertTrue(BetLog(self.log_dir).is_logged("02/01/2025", "42.1:12:-1.5"))
+
+    def test_legacy_file_is_migrated_once(self):
+        with open(self.legacy_file, "w") as f:
+            f.write("01/31/2025-42.1:11\n01/31/2025-42.1:11\n02/01/2025-42.1:12:-1.5\n")
+        bet_log = BetLog(self.log_dir, legacy_file=self.legacy_file)
+        self.assertTrue(bet_log.is_logged("01/31/2025", "42.1:11"))
+        self.assertTrue(bet_log.is_logged("02/01/2025", "42.1:12:-1.5"))
+        self.assertFalse(os.path.exists(self.legacy_file))
+        self.assertTrue(os.path.exists(self.legacy_file + ".migrated"))
+        with open(os.path.join(self.log_dir, "2025-01-31.txt")) as f:
+            self.assertEqual(f.read(), "42.1:11\n")
+
+    def test_sqlite_log(self):
+        with open(self.legacy_file, "w") as f:
+            f.write("01/31/2025-42.1:11\n")
+        bet_log = SqliteBetLog(os.path.join(self.directory.name, "bets.db"), legacy_file=self.legacy_file)
+        self.assertTrue(bet_log.is_logged("01/31/2025", "42.1:11"))
+        self.assertFalse(bet_log.is_logged("02/01/2025", "42.1:11"))
+        bet_log.log("02/01/2025", "42.1:11")
+        bet_log.log("02/01/2025", "42.1:11")
+        self.assertTrue(bet_log.is_logged("02/01/2025", "42.1:11"))
+        bet_log.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from src.bet_registry import BetRegistry
+
+
+class TestBetRegistry(unittest.TestCase):
+
+    def test_add_update_remove(self):
+        bets = BetRegistry()
+        key = ("42.1", 11, None)
+        frame = object()
+        bets.add(key, frame, ["01/01/2025", "Home Moneyline Away @ Home", "-150", "10.0"], "NBA")
+
+        self.assertIn(key, bets)
+        self.assertIs(bets.frame(key), frame)
+        self.assertEqual(bets.data(key)[1], "NBA")
+
+        bets.update(key, ["01/01/2025", "Home Moneyline Away @ Home", "-160", "12.5"])
+        self.assertEqual(bets.data(key)[0][2], "-160")
+        self.assertIs(bets.frame(key), frame)
+
+        self.assertIs(bets.remove(key), frame)
+        self.assertNotIn(key, bets)
+        self.assertIsNone(bets.frame(key))
+        self.assertIsNone(bets.data(key))
+        self.assertIsNone(bets.remove(key))
+        self.assertEqual(len(bets), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
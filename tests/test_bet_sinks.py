@@ -0,0 +1,52 @@
+import csv
+import os
+import tempfile
+import unittest
+from src import sheet_operations
+from src.bet_sinks import CsvSink, SqliteSink, column_letter, make_sink
+
+
+class TestBetSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_column_letter(self):
+        self.assertEqual(column_letter(1), "A")
+        self.assertEqual(column_letter(8), "H")
+        self.assertEqual(column_letter(28), "AB")
+
+    def test_sheets_sink_connects_on_first_write(self):
+        # Importing sheet_operations and creating the sink doesn't authorize with Google
+        make_sink("sheets")
+        self.assertIsNone(sheet_operations.CLIENT)
+        self.assertIsNone(sheet_operations.SHEET)
+        with self.assertRaises(ValueError):
+            make_sink("paper")
+
+    def test_csv_sink(self):
+        path = os.path.join(self.directory.name, "bets.csv")
+        sink = CsvSink(path, column=6)
+        sink.write([["1/31", "A @ B", "+150", "10.5"], ["1/31", "C @ D", "-110", "20"]], ["NBA", "NHL"])
+        sink.write([["2/1", "E @ F", "+200", "5"]], ["MLB"])
+        with open(path, newline="") as f:
+            self.assertEqual(list(csv.reader(f)), [["1/31", "A @ B", "+150", "10.5", "", "NBA"],
+                                                   ["1/31", "C @ D", "-110", "20", "", "NHL"],
+                                                   ["2/1", "E @ F", "+200", "5", "", "MLB"]])
+
+    def test_sqlite_sink(self):
+        path = os.path.join(self.directory.name, "bets.db")
+        sink = SqliteSink(path, clock=lambda: 1000.0)
+        sink.write([["1/31", "A @ B", "+150", "10.5"]], ["NBA"])
+        sink.reset()
+        sink.write([["2/1", "E @ F", "+200", "5"]], ["MLB"])
+        sink.reset()
+        self.assertEqual(SqliteSink(path).rows(), [(["1/31", "A @ B", "+150", "10.5"], "NBA"),
+                                                   (["2/1", "E @ F", "+200", "5"], "MLB")])
+
+
+if __name__ == '__main__':
+    unittest.main()
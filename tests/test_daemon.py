@@ -0,0 +1,161 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from daemon import Account, HeadlessDaemon, JsonLinesOutput, parse_account
+from goodbets import LeagueScan
+from src.bet_log import BetLog, DAY_FORMAT
+from src.opportunity_server import OpportunityBoard
+from src.poll_scheduler import PollScheduler
+from src.devig import bet_amount
+from helpers import nba_moneylines
+
+
+class TestHeadlessDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.now = 1_700_000_000.0
+        self.records = []
+        self.cycles = []  # the NBA WagerTable of each scan, None to skip the league, or an error to raise
+        self.scheduler = PollScheduler(["NBA", "NHL"], clock=lambda: self.now)
+        self.daemon = HeadlessDaemon(
+            [Account("small", 1000, 10), Account("big", 10000, 50)], self.records.append,
+            scheduler=self.scheduler, bet_log=BetLog(os.path.join(self.directory.name, "log")),
+            scan=self.scan, clock=lambda: self.now, sleep=self.sleep)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def scan(self, devig_method, good_only=False, leagues=None, parse_pool=None, snapshots=None, deltas=None,
+             history=None):
+        self.assertTrue(good_only)
+        self.assertEqual(sorted(label for label, _, _ in leagues), ["NBA", "NHL"])
+        wagers = self.cycles.pop(0)
+        if isinstance(wagers, Exception):
+            raise wagers
+        if wagers is None:
+            yield LeagueScan("NBA", [], [], None, 3, deltas.clear("NBA"))
+        else:
+            alerts = history.record("NBA", wagers)
+            good_bets, events = deltas.apply("NBA", wagers, devig_method)
+            yield LeagueScan("NBA", good_bets, [self.now + 3600], {}, 0, events, alerts)
+        yield LeagueScan("NHL", [], [], None, 3, deltas.clear("NHL"))
+        return False
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def test_new_updated_and_removed_bets_are_emitted_once_per_scrape(self):
+        self.cycles = [nba_moneylines((150, -120, 1000, 11)), nba_moneylines((150, -120, 1000, 11)),
+                       nba_moneylines((160, -120, 1000, 11)), None]
+        for _ in range(4):
+            self.daemon.run_cycle()
+            self.sleep(3 * 3600)
+
+        self.assertEqual([record["event"] for record in self.records],
+                         ["new", "cycle", "cycle", "update", "cycle", "remove", "cycle"])
+        new = self.records[0]
+        self.assertEqual((new["league"], new["market"], new["key"], new["fanduel_odds"]),
+                         ("NBA", "Moneyline", "42.1:11", 150))
+        risk = new["risk_percentage"]
+        self.assertEqual(new["stakes"], {"small": {"amount": bet_amount(risk, 1000),
+                                                   "units": round(bet_amount(risk, 1000) / 10, 1)},
+                                         "big": {"amount": bet_amount(risk, 10000),
+                                                 "units": round(bet_amount(risk, 10000) / 50, 1)}})
+        self.assertEqual(self.records[3]["fanduel_odds"], 160)
+        self.assertEqual(self.records[5]["key"], "42.1:11")
+        cycle = self.records[1]
+        self.assertEqual((cycle["cycle"], cycle["leagues"], cycle["scraped"], cycle["skipped"],
+                          cycle["requests_skipped"], cycle["good_bets"], cycle["new"], cycle["error"]),
+                         (1, 2, 1, 1, 3, 1, 1, None))
+        self.assertEqual(self.records[6]["removed"], 1)
+
+    def test_logged_bets_are_not_new_after_a_restart(self):
+        self.cycles = [nba_moneylines((150, -120, 1000, 11))]
+        self.daemon.run_cycle()
+        restarted = HeadlessDaemon([Account("small", 1000, 10)], self.records.append,
+                                   scheduler=PollScheduler(["NBA", "NHL"], clock=lambda: self.now),
+                                   bet_log=self.daemon.bet_log, scan=self.scan, clock=lambda: self.now)
+        self.cycles = [nba_moneylines((150, -120, 1000, 11))]
+        restarted.run_cycle()
+        self.assertEqual([record["event"] for record in self.records], ["new", "cycle", "cycle"])
+
+    def test_bets_good_again_after_a_removal_are_new_again(self):
+        # 11 was announced before a restart, 12 by this process
+        self.daemon.bet_log.log(datetime.fromtimestamp(self.now).strftime(DAY_FORMAT), "42.1:11")
+        self.cycles = [nba_moneylines((150, -120, 1000, 11), (150, -120, 1000, 12)),
+                       nba_moneylines((-150, -120, 1000, 11), (-150, -120, 1000, 12)),
+                       nba_moneylines((150, -120, 1000, 11), (150, -120, 1000, 12))]
+        for _ in range(3):
+            self.daemon.run_cycle()
+            self.sleep(3 * 3600)
+        self.assertEqual([(record["event"], record["key"]) for record in self.records if record["event"] != "cycle"],
+                         [("new", "42.1:12"), ("remove", "42.1:11"), ("remove", "42.1:12"),
+                          ("new", "42.1:11"), ("new", "42.1:12")])
+
+    def test_board_follows_every_scan(self):
+        self.daemon.board = board = OpportunityBoard()
+        self.cycles = [nba_moneylines((150, -120, 1000, 11), (200, -120, 1000, 12)),
+                       nba_moneylines((150, -120, 1000, 11))]
+        self.daemon.run_cycle()
+        self.assertEqual(sorted(bet["key"] for bet in json.loads(board.snapshot()[1])["opportunities"]),
+                         ["42.1:11", "42.1:12"])
+        self.sleep(3 * 3600)
+        self.daemon.run_cycle()
+        self.assertEqual([bet["key"] for bet in json.loads(board.snapshot()[1])["opportunities"]], ["42.1:11"])
+        self.assertEqual(board.metrics["cycle"], 2)
+
+    def test_steam_is_emitted(self):
+        self.cycles = [nba_moneylines((150, -120, 1000, 11)), nba_moneylines((150, -150, 1000, 11))]
+        self.daemon.run_cycle()
+        self.sleep(3 * 3600)
+        metrics = self.daemon.run_cycle()
+        steam = [record for record in self.records if record["event"] == "steam"]
+        self.assertEqual([(record["key"], record["pinnacle_before"], record["pinnacle_odds"], record["fanduel_odds"])
+                          for record in steam], [("42.1:11", -120, -150, 150)])
+        self.assertGreater(steam[0]["move"], 0)
+        self.assertEqual(metrics["steam"], 1)
+
+    def test_scan_errors_are_reported_in_the_metrics(self):
+        self.cycles = [ValueError("bad payload")]
+        metrics = self.daemon.run_cycle()
+        self.assertEqual(metrics["error"], "ValueError: bad payload")
+        self.assertIsNone(self.daemon.run_cycle())  # nothing due until the leagues are rescheduled
+
+    def test_run_sleeps_until_leagues_are_due(self):
+        self.cycles = [nba_moneylines(), nba_moneylines()]
+        self.daemon.run(cycles=2)
+        self.assertEqual(self.daemon.cycles, 2)
+        self.assertGreater(self.now, 1_700_000_000.0)
+
+
+class TestJsonLinesOutput(unittest.TestCase):
+
+    def test_stream_and_rotating_file(self):
+        stream = io.StringIO()
+        output = JsonLinesOutput(stream=stream)
+        output({"event": "cycle", "cycle": 1})
+        self.assertEqual(json.loads(stream.getvalue()), {"event": "cycle", "cycle": 1})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "feed.jsonl")
+            output = JsonLinesOutput(path, max_bytes=100, backups=1)
+            for cycle in range(10):
+                output({"event": "cycle", "cycle": cycle})
+            output.close()
+            self.assertEqual(sorted(os.listdir(directory)), ["feed.jsonl", "feed.jsonl.1"])
+            with open(path) as f:
+                self.assertEqual(json.loads(f.read().splitlines()[-1])["cycle"], 9)
+
+    def test_parse_account(self):
+        self.assertEqual(parse_account("1000:10"), Account("1000:10", 1000.0, 10.0))
+        self.assertEqual(parse_account("main=5000:50"), Account("main", 5000.0, 50.0))
+        with self.assertRaises(ValueError):
+            parse_account("1000")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from goodbets import good_bet_rows, rank_good_bets
+from src.delta_engine import DeltaEngine
+from src.devig import DevigMethod
+from src.wager_table import WagerTable
+from helpers import nba_totals
+
+
+def kinds(events):
+    return [(event.kind, event.key[1]) for event in events]
+
+
+class CountingTable(WagerTable):
+    """
+    A WagerTable that records which rows evaluate() was asked for.
+    """
+    evaluated = None
+
+    def evaluate(self, devig_method=DevigMethod.POWER, rows=None):
+        self.evaluated = rows
+        super().evaluate(devig_method, rows)
+
+
+class TestDeltaEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = DeltaEngine()
+        # -130 on Pinnacle against +100 makes +110 on FanDuel a positive EV bet; -120 doesn't
+        self.slate = [(110, -130, 220.5, 1), (-120, -130, 221.5, 2), (120, -140, 222.5, 3)]
+
+    def test_first_scan_matches_rank_good_bets(self):
+        good_bets, events = self.engine.apply("NBA", nba_totals(*self.slate))
+        expected = rank_good_bets(nba_totals(*self.slate))
+        self.assertEqual([(wager.key, ev, risk) for wager, ev, risk in good_bets],
+                         [(wager.key, ev, risk) for wager, ev, risk in expected])
+        self.assertEqual(sorted(kinds(events)), [("add", 1), ("add", 3)])
+
+    def test_only_changed_rows_are_evaluated(self):
+        self.engine.apply("NBA", nba_totals(*self.slate))
+        table = nba_totals(*self.slate, table=CountingTable())
+        good_bets, events = self.engine.apply("NBA", table)
+        self.assertEqual(events, [])
+        self.assertIsNone(table.evaluated)
+        self.assertEqual(len(good_bets), 2)
+
+        # Price moved on 1, limit-free row 2 turned good, 3 is gone, 4 is new
+        table = nba_totals((115, -130, 220.5, 1), (-120, -150, 221.5, 2), (105, -130, 223.5, 4),
+                           table=CountingTable())
+        good_bets, events = self.engine.apply("NBA", table)
+        self.assertEqual(table.evaluated, [0, 1, 2])
+        self.assertEqual(kinds(events), [("update", 1), ("add", 2), ("add", 4), ("remove", 3)])
+        self.assertEqual(sorted(wager.selection_id for wager, _, _ in good_bets), [1, 2, 4])
+
+    def test_bets_turning_bad_and_line_moves_are_removed(self):
+        self.engine.apply("NBA", nba_totals(*self.slate))
+        _, events = self.engine.apply("NBA", nba_totals((-150, -130, 220.5, 1), (-120, -130, 221.5, 2),
+                                                        (120, -140, 223.0, 3)))
+        self.assertEqual([(kind, key) for kind, key, _ in events],
+                         [("remove", ("42.1", 1, 220.5)), ("add", ("42.1", 3, 223.0)),
+                          ("remove", ("42.1", 3, 222.5))])
+
+    def test_select_and_settings(self):
+        # is_good_bet drops NBA totals
+        good_bets, events = self.engine.apply("NBA", nba_totals(*self.slate), select=good_bet_rows)
+        self.assertEqual((good_bets, events), ([], []))
+        # Another devig method can't reuse the stored results: everything is evaluated again
+        table = nba_totals((110, -130, 220.5, 1), table=CountingTable())
+        self.engine.apply("NBA", table, DevigMethod.MULTIPLICATIVE, select=good_bet_rows)
+        self.assertEqual(table.evaluated, [0])
+
+    def test_clear(self):
+        self.engine.apply("NBA", nba_totals(*self.slate))
+        self.assertEqual(sorted(kinds(self.engine.clear("NBA"))), [("remove", 1), ("remove", 3)])
+        self.assertEqual(self.engine.clear("NBA"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from goodbets import fetch_leagues, good_bet_rows, is_good_bet, stream_good_bets
+from src.delta_engine import DeltaEngine
+from src.line_history import LineHistory
+from src.scrape import ScrapeResult
+from src.wager_table import WagerTable
+
+
+def pinnacle(now=None):
+    return ScrapeResult({1: {"name": "Away @ Home", "markets": [
+        {"description": "moneyline", "limit": 1000,
+         "prices": [{"designation": "home", "price": -150}, {"designation": "away", "price": 130}]}]}})
+
+
+def fanduel(market_types=None, now=None):
+    # -120 on Home against Pinnacle's -150 is a positive EV bet
+    return ScrapeResult({7: {"name": "Away @ Home", "league": "NBA", "markets": [
+        {"marketType": "MONEY_LINE", "externalMarketId": "42.1", "runners": [
+            {"selectionId": 1, "handicap": 0, "runnerName": "Away", "winRunnerOdds": 110},
+            {"selectionId": 2, "handicap": 0, "runnerName": "Home", "winRunnerOdds": -120}]}]}})
+
+
+def timed_out(market_types=None, now=None):
+    raise ConnectionError("Read timed out")
+
+
+def failed(market_types=None, now=None):
+    print("FanDuel request failed with status code: 429")
+    return None
+
+
+class TestFetchLeagues(unittest.TestCase):
+
+    def test_every_book_gets_the_scans_time(self):
+        times = []
+
+        def pinnacle_at(now=None):
+            times.append(now)
+            return pinnacle()
+
+        def fanduel_at(market_types=None, now=None):
+            times.append(now)
+            return fanduel()
+
+        leagues = [("NBA", pinnacle_at, fanduel_at), ("NHL", pinnacle_at, fanduel_at)]
+        list(fetch_leagues(leagues, schedule=None, now=1700000000.0))
+        self.assertEqual(times, [1700000000.0] * 4)
+
+        times.clear()
+        list(fetch_leagues(leagues, schedule=None))
+        self.assertEqual(len(times), 4)
+        self.assertIsNotNone(times[0])
+        self.assertEqual(set(times), {times[0]})
+
+
+class TestGoodBetRows(unittest.TestCase):
+
+    def test_matches_is_good_bet_without_registering_leagues(self):
+        table = WagerTable()
+        # NBA moneylines are filtered, NHL totals are kept at -120 or shorter, EPL isn't filtered
+        for odds, league in ((-150, "NBA"), (-110, "NHL"), (-130, "NHL"), (-150, "EPL")):
+            table.add_moneyline("Away @ Home", odds, -200, 5000, "Home", "Away", 170, 0, "42.1", 11, league)
+            table.add_total_points("Away @ Home", odds, -200, 5000, None, 5.5, 170, "42.2", 12, league)
+        leagues = list(table.leagues)
+
+        good = good_bet_rows(table, range(len(table)))
+        self.assertEqual(good, [i for i in range(len(table)) if is_good_bet(table.wager(i))])
+        self.assertEqual(good, [5, 6, 7])
+        self.assertEqual(table.leagues, leagues)
+
+
+class TestStreamGoodBets(unittest.TestCase):
+
+    def setUp(self):
+        self.deltas = DeltaEngine()
+        self.history = LineHistory()
+
+    def scan(self, fanduel_fetcher):
+        scans = list(stream_good_bets(leagues=[("NBA", pinnacle, fanduel_fetcher)], schedule=None,
+                                      deltas=self.deltas, history=self.history))
+        self.assertEqual(len(scans), 1)
+        return scans[0]
+
+    def test_a_failed_book_removes_nothing(self):
+        scan = self.scan(fanduel)
+        self.assertFalse(scan.failed)
+        self.assertEqual([(event.kind, event.key[1]) for event in scan.events], [("add", 2)])
+
+        for fetcher in (timed_out, failed):
+            scan = self.scan(fetcher)
+            self.assertTrue(scan.failed)
+            self.assertEqual((scan.good_bets, scan.prices, scan.events), ([], None, None))
+        self.assertEqual(len(self.history), 2)
+
+        # The bet was never taken down, so it isn't added again either
+        scan = self.scan(fanduel)
+        self.assertEqual(len(scan.good_bets), 1)
+        self.assertEqual(scan.events, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
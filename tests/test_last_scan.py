@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from src.last_scan import LastScan, age_text
+from src.wager import Moneyline
+
+
+class TestLastScan(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "last_scan.pickle")
+        self.now = 1_000_000.0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load_keeps_recent_leagues(self):
+        wager = Moneyline("Away @ Home", 150, -120, 1000, "Home", "Away", 100, 0, "42.1", 11, "NBA")
+        last_scan = LastScan(self.path, max_age=3600, clock=lambda: self.now)
+        last_scan.update("NBA", [(wager, 3.2, 1.1)])
+        last_scan.update("NHL", [], now=self.now - 7200)
+        last_scan.save()
+
+        loaded = LastScan(self.path, max_age=3600, clock=lambda: self.now).load()
+        self.assertEqual(list(loaded), ["NBA"])
+        scanned_at, good_bets = loaded["NBA"]
+        self.assertEqual(scanned_at, self.now)
+        self.assertEqual(good_bets[0][0].key, wager.key)
+        self.assertEqual(good_bets[0][0].pretty(), wager.pretty())
+        self.assertEqual(good_bets[0][1:], (3.2, 1.1))
+
+    def test_missing_or_corrupt_file_loads_nothing(self):
+        self.assertEqual(LastScan(self.path).load(), {})
+        with open(self.path, "wb") as f:
+            f.write(b"not a pickle")
+        self.assertEqual(LastScan(self.path).load(), {})
+
+    def test_age_text(self):
+        self.assertEqual(age_text(30), "30s old")
+        self.assertEqual(age_text(12 * 60), "12m old")
+        self.assertEqual(age_text(3 * 3600), "3h old")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from src.line_history import LineBuffer, LineHistory, LineTick, alert_text
+from helpers import nba_moneylines
+
+
+class TestLineBuffer(unittest.TestCase):
+
+    def test_overwrites_the_oldest_tick(self):
+        buffer = LineBuffer(capacity=3)
+        for n in range(5):
+            buffer.append(float(n), -100 - n, 100 + n, 1000.0)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual([tick.timestamp for tick in buffer.ticks()], [2.0, 3.0, 4.0])
+        self.assertEqual(buffer.tick(-1), LineTick(4.0, -104, 104, 1000.0))
+
+
+class TestLineHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1_700_000_000.0
+        self.history = LineHistory(capacity=4, max_markets=3, threshold=0.02, window=600, clock=lambda: self.now)
+
+    def record(self, *rows, minutes=1):
+        self.now += minutes * 60
+        return self.history.record("NBA", nba_moneylines(*rows))
+
+    def test_ticks_only_when_something_moves(self):
+        self.record((150, -120, 1000, 11))
+        self.record((150, -120, 1000, 11))
+        self.record((150, -120, 2000, 11))
+        self.record((160, -120, 2000, 11))
+        key = ("42.1", 11, None)
+        self.assertEqual([(tick.fanduel_odds, tick.limit) for tick in self.history.ticks(key)],
+                         [(150, 1000), (150, 2000), (160, 2000)])
+        self.assertEqual(self.history.ticks(("42.1", 99, None)), [])
+
+    def test_steam_when_pinnacle_moves_and_fanduel_does_not(self):
+        self.assertEqual(self.record((150, -120, 1000, 11), (150, -120, 1000, 12)), [])
+        # Small moves add up within the window
+        self.assertEqual(self.record((150, -125, 1000, 11), (150, -125, 1000, 12)), [])
+        alerts = self.record((150, -135, 1000, 11), (160, -135, 1000, 12))
+        # FanDuel moved on 12, so only 11 is steam
+        self.assertEqual([(alert.key[1], alert.pinnacle_before, alert.pinnacle_odds, alert.fanduel_odds)
+                          for alert in alerts], [(11, -120, -135, 150)])
+        self.assertAlmostEqual(alerts[0].move, 135 / 235 - 120 / 220)
+        self.assertEqual(alerts[0].since, self.now - 120)
+        self.assertIn("Pinnacle -120 -> -135", alert_text(alerts[0]))
+
+    def test_moves_outside_the_window_are_not_steam(self):
+        self.record((150, -120, 1000, 11))
+        self.record((150, -125, 1000, 11), minutes=20)
+        # Only the move from -125, the price standing when the window started, counts
+        self.assertEqual(self.record((150, -135, 1000, 11), minutes=20), [])
+
+    def test_markets_are_bounded(self):
+        for selection_id in range(5):
+            self.record((150, -120, 1000, selection_id))
+        self.assertEqual(len(self.history), 3)
+        self.assertEqual(self.history.ticks(("42.1", 0, None)), [])
+        self.record((150, -120, 1000, 2))  # seen again, so kept over 3
+        self.record((150, -120, 1000, 5))
+        self.assertEqual(len(self.history.ticks(("42.1", 2, None))), 1)
+        self.assertEqual(self.history.ticks(("42.1", 3, None)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
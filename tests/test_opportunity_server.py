@@ -0,0 +1,110 @@
+import json
+import unittest
+from http.client import HTTPConnection
+from src.opportunity_server import OpportunityBoard, OpportunityFilter, OpportunityServer
+
+
+def record(key, league="NBA", market="Moneyline", ev=3.0, risk_percentage=1.0, fanduel_odds=150):
+    return {"key": key, "league": league, "market": market, "ev": ev, "risk_percentage": risk_percentage,
+            "fanduel_odds": fanduel_odds}
+
+
+def events(delta_list):
+    return [json.loads(delta.event.split(b"data: ", 1)[1]) for delta in delta_list]
+
+
+class TestOpportunityBoard(unittest.TestCase):
+
+    def test_scans_become_add_update_remove_deltas(self):
+        board = OpportunityBoard()
+        board.update_league("NBA", [record("a"), record("b", risk_percentage=2.0)])
+        board.update_league("NHL", [record("c", league="NHL")])
+        version = board.version
+        board.update_league("NBA", [record("a"), record("b", risk_percentage=2.0, fanduel_odds=160)])
+        board.update_league("NBA", [record("b", risk_percentage=2.0, fanduel_odds=160)])
+
+        self.assertEqual([(event["op"], event["bet"]["key"]) for event in events(board.deltas(version, 0))],
+                         [("update", "b"), ("remove", "a")])
+        snapshot = json.loads(board.snapshot()[1])
+        self.assertEqual(snapshot["version"], board.version)
+        self.assertEqual([bet["key"] for bet in snapshot["opportunities"]], ["b", "c"])
+        self.assertEqual(board.deltas(board.version, 0), [])
+        # Too far behind (or from before a restart): the client needs a snapshot
+        small = OpportunityBoard(backlog=1)
+        small.update_league("NBA", [record("a"), record("b")])
+        self.assertEqual(len(small.deltas(1, 0)), 1)
+        self.assertIsNone(small.deltas(0, 0))
+        self.assertIsNone(board.deltas(board.version + 5, 0))
+
+    def test_filtered_snapshot_shares_encoded_records(self):
+        board = OpportunityBoard()
+        board.update_league("NBA", [record("a", ev=1.0), record("b", market="Spread", ev=5.0)])
+        board.update_league("NHL", [record("c", league="NHL", ev=4.0)])
+        _, unfiltered = board.snapshot(OpportunityFilter())
+        self.assertIs(board.snapshot()[1], unfiltered)
+
+        def keys(query):
+            return [bet["key"] for bet in
+                    json.loads(board.snapshot(OpportunityFilter.from_query(query))[1])["opportunities"]]
+
+        self.assertEqual(keys("league=NBA"), ["a", "b"])
+        self.assertEqual(keys("league=NBA,NHL&min_ev=3.5"), ["b", "c"])
+        self.assertEqual(keys("market=Moneyline&min_ev=2"), ["c"])
+        with self.assertRaises(ValueError):
+            OpportunityFilter.from_query("min_ev=high")
+
+
+class TestOpportunityServer(unittest.TestCase):
+
+    def setUp(self):
+        self.board = OpportunityBoard()
+        self.board.update_league("NBA", [record("a"), record("b", league="NBA", ev=1.0)])
+        self.server = OpportunityServer(("127.0.0.1", 0), self.board, keepalive=0.05)
+        self.server.start()
+        self.connection = HTTPConnection(*self.server.server_address, timeout=5)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.stop()
+
+    def get(self, path, headers=None):
+        self.connection.request("GET", path, headers=headers or {})
+        return self.connection.getresponse()
+
+    def test_snapshot_and_metrics(self):
+        response = self.get("/opportunities?min_ev=2")
+        self.assertEqual(response.status, 200)
+        self.assertEqual([bet["key"] for bet in json.loads(response.read())["opportunities"]], ["a"])
+        self.board.metrics = {"event": "cycle", "cycle": 3}
+        self.assertEqual(json.loads(self.get("/metrics").read())["cycle"], 3)
+        self.get("/opportunities?min_ev=x").read()
+        self.assertEqual(self.get("/missing").status, 404)
+
+    def test_stream_sends_snapshot_then_matching_deltas(self):
+        response = self.get("/stream?min_ev=2")
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+
+        def next_event():
+            lines = []
+            while True:
+                line = response.fp.readline().decode().rstrip("\n")
+                if not line:
+                    if lines and not lines[0].startswith(":"):
+                        return lines
+                    lines = []
+                    continue
+                lines.append(line)
+
+        event_id, event, data = next_event()
+        self.assertEqual((event_id, event), (f"id: {self.board.version}", "event: snapshot"))
+        self.assertEqual([bet["key"] for bet in json.loads(data[6:])["opportunities"]], ["a"])
+
+        # b stays under the minimum EV, so only the new c reaches this client
+        self.board.update_league("NBA", [record("a"), record("b", ev=1.5), record("c", ev=2.5)])
+        event_id, event, data = next_event()
+        self.assertEqual((event_id, event), (f"id: {self.board.version}", "event: delta"))
+        self.assertEqual(json.loads(data[6:]), {"op": "add", "bet": record("c", ev=2.5)})
+
+
+if __name__ == '__main__':
+    unittest.main()
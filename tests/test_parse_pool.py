@@ -0,0 +1,57 @@
+import json
+import unittest
+from src.parse_pool import ParsePool, is_parsed, parsed
+from src.scrape import ScrapeResult, pinnacle_nba
+
+MATCHUPS = [
+    {"id": 1, "participants": [{"alignment": "home", "name": "Home Team"}, {"alignment": "away", "name": "Away Team"}]},
+    {"id": 11, "parentId": 1, "special": {"description": "Player (Points)"}},
+]
+MARKETS = [
+    {"key": "s;0;m", "matchupId": 1, "limits": [{"amount": 1000}],
+     "prices": [{"designation": "home", "price": -120}, {"designation": "away", "price": 100}]},
+    {"key": "s;0;ou", "matchupId": 11, "limits": [{"amount": 250}],
+     "prices": [{"participantId": 2, "points": 24.5, "price": -110}, {"participantId": 1, "points": 24.5, "price": -110}]},
+]
+
+
+def fake_request(url, headers, raw=False):
+    payload = MATCHUPS if "matchups" in url else MARKETS
+    return json.dumps(payload).encode() if raw else payload
+
+
+def failed_request(url, headers, raw=False):
+    return None
+
+
+class TestParsePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ParsePool(workers=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_workers_parse_like_the_fetcher(self):
+        future = self.pool.fetch(pinnacle_nba, fake_request)
+        expected = pinnacle_nba(request=fake_request)
+        self.assertEqual(parsed(future), expected)
+        self.assertIsInstance(parsed(future), ScrapeResult)
+        self.assertEqual(parsed(future).start_times, expected.start_times)
+        self.assertTrue(is_parsed(future))
+        self.assertEqual(expected[1]["markets"][0]["prices"][0]["designation"], "over")
+
+    def test_failed_request_is_not_sent_to_workers(self):
+        future = self.pool.fetch(pinnacle_nba, failed_request)
+        self.assertTrue(is_parsed(future))
+        self.assertEqual(parsed(future), {})
+        self.assertIsNone(self.pool._executor)
+
+    def test_plain_results_pass_through(self):
+        self.assertTrue(is_parsed({"a": 1}))
+        self.assertEqual(parsed({"a": 1}), {"a": 1})
+        self.assertIsNone(parsed(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
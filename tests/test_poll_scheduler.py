@@ -0,0 +1,74 @@
+import unittest
+from src.poll_scheduler import PollScheduler, IDLE_INTERVAL, MIN_INTERVAL, DEFAULT_INTERVAL
+
+
+class TestPollScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1_000_000.0
+        self.scheduler = PollScheduler(["NBA", "NHL", "EPL"], budget=9, window=3600,
+                                       requests_per_league=3, clock=lambda: self.now)
+
+    def test_leagues_are_due_immediately_and_rescheduled_provisionally(self):
+        self.assertEqual(self.scheduler.pop_due(), ["NBA", "NHL", "EPL"])
+        self.assertEqual(self.scheduler.pop_due(), [])
+        self.assertEqual(self.scheduler.due_at("NBA"), self.now + DEFAULT_INTERVAL)
+
+    def test_interval_follows_next_start_and_line_movement(self):
+        self.scheduler.pop_due()
+        soon = self.scheduler.observe("NBA", [self.now + 1800, self.now + 7200], {("1", 1, None): -110})
+        later = self.scheduler.observe("NHL", [self.now + 20 * 3600], {})
+        idle = self.scheduler.observe("EPL", [self.now - 600], {})
+        self.assertLess(soon, later)
+        self.assertEqual(idle, IDLE_INTERVAL)
+        self.assertIsNone(self.scheduler.next_start["EPL"])
+
+        # The NBA line moved, so it is polled twice as often
+        moved = self.scheduler.observe("NBA", [self.now + 1800], {("1", 1, None): -120})
+        self.assertEqual(self.scheduler.moved["NBA"], 1)
+        self.assertEqual(moved, max(MIN_INTERVAL, soon / 2))
+        self.assertEqual(self.scheduler.due_at("NBA"), self.now + moved)
+
+    def test_failed_polls_keep_the_schedule(self):
+        self.scheduler.pop_due()
+        soon = self.scheduler.observe("NBA", [self.now + 1800], {("1", 1, None): -110})
+        self.scheduler.observe("EPL", [], {})
+        self.now += 60
+        # NBA games still start within the hour, and an idle league is retried well before IDLE_INTERVAL
+        self.assertEqual(self.scheduler.observe_failure("NBA"), soon)
+        self.assertEqual(self.scheduler.observe_failure("EPL"), DEFAULT_INTERVAL)
+        self.assertEqual(self.scheduler.observe_failure("NHL"), DEFAULT_INTERVAL)
+        self.assertEqual(self.scheduler.next_start["NBA"], self.now + 1740)
+        self.assertEqual(self.scheduler.due_at("NBA"), self.now + soon)
+
+    def test_budget_limits_polls_per_window(self):
+        self.scheduler = PollScheduler(["NBA", "NHL", "EPL"], budget=6, window=3600,
+                                       requests_per_league=3, clock=lambda: self.now)
+        self.assertEqual(self.scheduler.pop_due(), ["NBA", "NHL"])
+        self.assertEqual(self.scheduler.requests_in_window(), 6)
+        # EPL is due but has to wait for the window to free up
+        self.assertEqual(self.scheduler.pop_due(), [])
+        self.assertEqual(self.scheduler.next_delay(), 3600)
+
+        self.now += 3600
+        self.assertEqual(self.scheduler.pop_due(), ["EPL", "NBA"])
+
+    def test_refund_returns_budget(self):
+        self.scheduler.pop_due()
+        self.assertEqual(self.scheduler.requests_in_window(), 9)
+        self.scheduler.refund(3)
+        self.assertEqual(self.scheduler.requests_in_window(), 6)
+        # A skipped league keeps its prices
+        self.scheduler.observe("NBA", [], {("1", 1, None): -110})
+        self.scheduler.observe("NBA", [], None)
+        self.scheduler.observe("NBA", [], {("1", 1, None): -120})
+        self.assertEqual(self.scheduler.moved["NBA"], 1)
+
+
+    def test_charge_counts_against_the_budget(self):
+        self.scheduler.charge(6)
+        self.assertEqual(self.scheduler.pop_due(), ["NBA"])
+        self.assertEqual(self.scheduler.requests_in_window(), 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import threading
+import time
+import unittest
+from src.scan_worker import ScanWorker
+
+
+def wait_for_result(worker, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    raise AssertionError("scan did not finish")
+
+
+class TestScanWorker(unittest.TestCase):
+
+    def test_requests_during_scan_are_coalesced(self):
+        release = threading.Event()
+        calls = []
+
+        def scan():
+            calls.append(1)
+            release.wait(5)
+            return len(calls)
+
+        worker = ScanWorker(scan)
+        self.assertTrue(worker.request("check"))
+        self.assertFalse(worker.request("reload"))
+        self.assertFalse(worker.request("reload"))
+        self.assertIsNone(worker.poll())
+        release.set()
+
+        result = wait_for_result(worker)
+        self.assertEqual(result.kinds, {"check", "reload"})
+        self.assertEqual(result.value, 1)
+        self.assertIsNone(result.error)
+        self.assertGreaterEqual(result.duration, 0)
+        self.assertFalse(worker.busy)
+
+        # A request after the result was polled starts a new scan
+        self.assertTrue(worker.request("reload"))
+        self.assertEqual(wait_for_result(worker).kinds, {"reload"})
+        self.assertEqual(len(calls), 2)
+
+    def test_scan_errors_are_returned(self):
+        def scan():
+            raise ValueError("boom")
+
+        worker = ScanWorker(scan)
+        worker.request("check")
+        result = wait_for_result(worker)
+        self.assertIsInstance(result.error, ValueError)
+        self.assertIn("boom", result.trace)
+        self.assertIsNone(result.value)
+
+    def test_generator_scans_stream_partial_results(self):
+        release = threading.Event()
+
+        def scan():
+            yield "NBA"
+            release.wait(5)
+            yield "NHL"
+            return "done"
+
+        worker = ScanWorker(scan)
+        worker.request("check")
+        first = wait_for_result(worker)
+        self.assertFalse(first.done)
+        self.assertEqual(first.value, "NBA")
+        self.assertEqual(first.kinds, {"check"})
+        self.assertTrue(worker.busy)
+        release.set()
+
+        second = wait_for_result(worker)
+        self.assertEqual((second.value, second.done), ("NHL", False))
+        final = wait_for_result(worker)
+        self.assertTrue(final.done)
+        self.assertEqual(final.value, "done")
+        self.assertFalse(worker.busy)
+
+    def test_scope_is_passed_to_scan(self):
+        worker = ScanWorker(lambda scope=None: scope)
+        worker.request("check", {"NBA", "NHL"})
+        self.assertEqual(worker.scope, {"NBA", "NHL"})
+        result = wait_for_result(worker)
+        self.assertEqual(result.value, {"NBA", "NHL"})
+        self.assertEqual(result.scope, {"NBA", "NHL"})
+        self.assertIsNone(worker.scope)
+
+        worker.request("reload")
+        self.assertIsNone(wait_for_result(worker).value)
+
+
+    def test_requests_outside_the_scope_in_flight_are_queued(self):
+        release = threading.Event()
+
+        def scan(scope=None):
+            release.wait(5)
+            return scope
+
+        worker = ScanWorker(scan)
+        worker.request("check", {"NBA"})
+        self.assertFalse(worker.request("check", {"NBA"}))
+        self.assertTrue(worker.covers({"NBA"}))
+        self.assertFalse(worker.covers(None))
+        self.assertFalse(worker.request("reload"))
+        self.assertFalse(worker.request("check", {"NHL"}))
+        self.assertTrue(worker.covers(None))
+        release.set()
+
+        first = wait_for_result(worker)
+        self.assertEqual((first.kinds, first.scope, first.value), ({"check"}, {"NBA"}, {"NBA"}))
+        # The queued requests share a full scan, started by the poll that returned the first one
+        self.assertTrue(worker.busy)
+        second = wait_for_result(worker)
+        self.assertEqual((second.kinds, second.scope, second.value), ({"reload", "check"}, None, None))
+        self.assertFalse(worker.busy)
+
+if __name__ == '__main__':
+    unittest.main()
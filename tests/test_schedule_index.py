@@ -0,0 +1,49 @@
+import unittest
+from goodbets import fetched_league
+from src.schedule_index import ScheduleIndex
+from src.scrape import ScrapeResult
+
+
+class TestScheduleIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1_000_000.0
+        self.index = ScheduleIndex(window_hours=24, max_age=7200, clock=lambda: self.now)
+
+    def test_unknown_leagues_are_fetched(self):
+        self.assertTrue(self.index.should_fetch("NBA"))
+        self.assertNotIn("NBA", self.index)
+
+    def test_leagues_without_events_in_window_are_skipped_until_stale(self):
+        self.index.update("NFL", [self.now + 3 * 86400])
+        self.index.update("NBA", [self.now + 3600])
+        self.assertFalse(self.index.should_fetch("NFL"))
+        self.assertTrue(self.index.should_fetch("NBA"))
+        self.assertEqual(self.index.skipped, {"NFL": 1})
+
+        self.now += 7201
+        self.assertTrue(self.index.should_fetch("NFL"))
+
+    def test_events_enter_the_window(self):
+        self.index = ScheduleIndex(window_hours=24, max_age=10 * 86400, clock=lambda: self.now)
+        self.index.update("NFL", [self.now + 30 * 3600])
+        self.assertFalse(self.index.has_events("NFL"))
+        self.now += 7 * 3600
+        self.assertTrue(self.index.has_events("NFL"))
+        self.assertTrue(self.index.should_fetch("NFL"))
+
+
+    def test_fetched_leagues_update_the_index_only_when_both_books_came_back(self):
+        past_window = self.now + 30 * 3600
+        fanduel = ScrapeResult(start_times=[past_window])
+        fetched_league("NFL", None, fanduel, False, self.index)
+        fetched_league("NFL", {}, fanduel, False, self.index)
+        self.assertNotIn("NFL", self.index)
+
+        # The events past the window were dropped from the results, but not from the index
+        fetched_league("NFL", ScrapeResult(start_times=[past_window + 3600]), fanduel, False, self.index)
+        self.assertEqual(self.index.start_times("NFL"), [past_window, past_window + 3600])
+        self.assertFalse(self.index.should_fetch("NFL"))
+
+if __name__ == '__main__':
+    unittest.main()
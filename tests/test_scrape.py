@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, Mock
-from src.scrape import get_response, get_response_no_params, process_fanduel_rows, process_fanduel_markets, process_matchups, process_specials, process_markets
+from src.scrape import get_response, get_response_no_params, process_fanduel_rows, process_fanduel_markets, process_matchups, process_specials, process_markets, parse_market_key, MarketKey, preprocess_fanduel_events, normalize_fanduel_name, MarketTypeFilter
+import copy
 
 
 class TestScrape(unittest.TestCase):
@@ -73,6 +74,29 @@ class TestScrape(unittest.TestCase):
         self.assertEqual(result, expected_result)
         self.assertEqual(seen_event_ids, expected_seen_event_ids)
 
+    def test_process_fanduel_rows_window_and_names(self):
+        rows = [{"eventId": 1}, {"eventId": 2}, {"eventId": 3}]
+        data = {"attachments": {"events": {
+            "1": {"name": "Boston Celtics (BOS) @ New York Knicks (NYK)", "openDate": "2025-01-20T00:10:00.000Z"},
+            "2": {"name": "Boston Celtics @ Miami Heat", "openDate": "2025-01-25T00:10:00.000Z"},
+            "3": {"name": "NBA Championship 2025", "openDate": "2025-01-20T00:10:00.000Z"}}}}
+        result, seen_event_ids = process_fanduel_rows(rows, data, shorten_names=True, now=1737331800.0 - 3600)
+
+        self.assertEqual(result, {1: {"name": "Celtics @ Knicks", "start_time": 1737331800.0}})
+        self.assertEqual(seen_event_ids, {1})
+
+    def test_preprocess_fanduel_events_caches_across_cycles(self):
+        cache = {}
+        data = {"attachments": {"events": {
+            "1": {"name": "Home (H) v Away (A)", "openDate": "2025-01-20T00:10:00Z"}}}}
+        self.assertEqual(preprocess_fanduel_events(data, cache=cache), {"1": ("Home v Away", 1737331800.0)})
+        self.assertIn("1", cache)
+
+        # A renamed event is parsed again
+        data["attachments"]["events"]["1"]["name"] = "Home v Away FC"
+        self.assertEqual(preprocess_fanduel_events(data, cache=cache)["1"][0], "Home v Away FC")
+        self.assertIsNone(normalize_fanduel_name("Outright Winner"))
+
     def test_process_fanduel_markets(self):
         markets = {
             "market1": {"eventId": 1, "marketType": "type1", "runners": [{"handicap": 1, "runnerName": "Runner 1", "winRunnerOdds": {"americanDisplayOdds": {"americanOdds": 100}}}]},
@@ -89,6 +113,35 @@ class TestScrape(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_process_fanduel_markets_drops_unread_market_types(self):
+        def market(event_id, market_type):
+            return {"eventId": event_id, "marketType": market_type, "associatedMarkets": [{"externalMarketId": "42.1"}],
+                    "runners": [{"selectionId": 7, "handicap": 0, "runnerName": "Runner",
+                                 "winRunnerOdds": {"americanDisplayOdds": {"americanOdds": 150}}}]}
+        markets = {
+            "m1": market(1, "MONEY_LINE"),
+            "m2": market(1, "TO_SCORE_25+_POINTS"),
+            "m3": market(1, "FIRST_BASKET_(SAME_GAME_MULTIS)"),
+            "m4": market(2, "PLAYER_TO_RECORD_3+_SHOTS_ON_GOAL"),
+        }
+        market_types = MarketTypeFilter(names=["MONEY_LINE"], patterns=[r"TO_SCORE_\d+\+_POINTS"])
+        result = {1: {"name": "Event 1"}, 2: {"name": "Event 2"}}
+        process_fanduel_markets(markets, {1, 2}, result, "NBA", market_types)
+
+        self.assertEqual([m["marketType"] for m in result[1]["markets"]], ["MONEY_LINE", "TO_SCORE_25+_POINTS"])
+        self.assertEqual(result[1]["markets"][0]["runners"][0]["winRunnerOdds"], 150)
+        # An event whose markets were all dropped still has its league and an empty market list
+        self.assertEqual(result[2], {"name": "Event 2", "league": "NBA", "markets": []})
+
+    def test_market_type_filter(self):
+        market_types = MarketTypeFilter(names=["MONEY_LINE"], patterns=[r"\d+\+_MADE_THREES"])
+        self.assertIn("MONEY_LINE", market_types)
+        self.assertIn("3+_MADE_THREES", market_types)
+        self.assertNotIn("TO_RECORD_3+_MADE_THREES", market_types)
+        self.assertNotIn("MONEY_LINE_2", market_types)
+        self.assertNotIn(None, market_types)
+        self.assertNotIn("MONEY_LINE", MarketTypeFilter())
+
     def test_process_matchups(self):
         matchups_data = [
             {"id": 1, "participants": [{"alignment": "home", "name": "Home Team"}, {
@@ -105,22 +158,66 @@ class TestScrape(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_process_matchups_stores_start_time(self):
+        matchups_data = [
+            {"id": 1, "startTime": "2025-01-20T00:10:00Z", "participants": [
+                {"alignment": "home", "name": "Home Team"}, {"alignment": "away", "name": "Away Team"}]}
+        ]
+        result = process_matchups(matchups_data, now=1737331800.0 - 3600)
+
+        self.assertEqual(result[1]["start_time"], 1737331800.0)
+
+    def test_process_matchups_drops_matchups_outside_window(self):
+        matchups_data = [
+            {"id": 1, "startTime": "2025-01-20T00:10:00Z", "participants": [
+                {"alignment": "home", "name": "Home Team"}, {"alignment": "away", "name": "Away Team"}]},
+            {"id": 2, "startTime": "2025-01-25T00:10:00Z", "participants": [
+                {"alignment": "home", "name": "Home Team 2"}, {"alignment": "away", "name": "Away Team 2"}]},
+            {"id": 3, "parentId": 2, "special": {"description": "Special 2"}}
+        ]
+        now = 1737331800.0 - 3600
+        result = process_matchups(matchups_data, now=now)
+        self.assertEqual(list(result), [1])
+        self.assertEqual(process_specials(matchups_data, result), {})
+        self.assertEqual(result[1]["markets"], [])
+
+        # Started games and no window
+        self.assertEqual(process_matchups(matchups_data, now=now + 7200), {})
+        self.assertEqual(list(process_matchups(matchups_data, window_hours=None, now=now)), [1, 2])
+
     def test_process_specials(self):
         matchups_data = [
             {"id": 1, "parentId": 10, "special": {"description": "Special 1"}},
             {"id": 2, "parentId": 20, "special": {"description": "Special 2"}}
         ]
         result = {10: {"markets": []}, 20: {"markets": []}}
-        special_to_parent = process_specials(matchups_data, result)
+        special_markets = process_specials(matchups_data, result)
 
         expected_result = {
             10: {"markets": [{"id": 1, "description": "Special 1"}]},
             20: {"markets": [{"id": 2, "description": "Special 2"}]}
         }
-        expected_special_to_parent = {1: 10, 2: 20}
 
         self.assertEqual(result, expected_result)
-        self.assertEqual(special_to_parent, expected_special_to_parent)
+        self.assertEqual(list(special_markets), [1, 2])
+        self.assertIs(special_markets[1], result[10]["markets"][0])
+        self.assertIs(special_markets[2], result[20]["markets"][0])
+
+    def test_process_markets_attaches_special_prices(self):
+        matchups_data = [{"id": 1, "parentId": 10, "special": {"description": "Player (Points)"}}]
+        result = {10: {"markets": []}}
+        special_markets = process_specials(matchups_data, result)
+        markets_data = [
+            {"key": "s;0;ou", "matchupId": 1, "limits": [{"amount": 250}], "prices": [
+                {"participantId": 2, "points": 20.5, "price": -120},
+                {"participantId": 1, "points": 20.5, "price": 100}]}
+        ]
+        process_markets(markets_data, result, special_markets)
+
+        self.assertEqual(result[10]["markets"], [{
+            "id": 1, "description": "Player (Points)", "limit": 250, "prices": [
+                {"points": 20.5, "price": 100, "designation": "over"},
+                {"points": 20.5, "price": -120, "designation": "under"}]}])
 
     def test_process_markets(self):
         markets_data = [
@@ -130,8 +227,8 @@ class TestScrape(unittest.TestCase):
                 {"price": 100}, {"price": 200}], "limits": [{"amount": 300}]}
         ]
         result = {1: {"markets": []}}
-        special_to_parent = {}
-        process_markets(markets_data, result, special_to_parent)
+        special_markets = {}
+        process_markets(markets_data, result, special_markets)
 
         expected_result = {
             1: {
@@ -146,6 +243,34 @@ class TestScrape(unittest.TestCase):
 
         self.assertEqual(result, expected_result)
 
+    def test_parse_market_key(self):
+        self.assertEqual(parse_market_key("s;0;m"), MarketKey("0", "m", None, None))
+        self.assertEqual(parse_market_key("s;0;tt;111.5;home"), MarketKey("0", "tt", "111.5", "home"))
+        self.assertEqual(parse_market_key("s;0;ou;230.5"), MarketKey("0", "ou", "230.5", None))
+        self.assertIsNone(parse_market_key("x;0;m"))
+
+    def test_process_markets_leaves_payload_untouched(self):
+        markets_data = [
+            {"key": "s;0;s;-1.5", "matchupId": 1, "limits": [{"amount": 3000}], "prices": [
+                {"designation": "home", "points": -1.5, "price": -110},
+                {"designation": "away", "points": 1.5, "price": -110}]},
+            {"key": "s;1;s;-1.5", "matchupId": 1, "limits": [{"amount": 500}], "prices": [
+                {"designation": "home", "points": -1.5, "price": -110},
+                {"designation": "away", "points": 1.5, "price": -110}]},
+            {"key": "s;0;m", "matchupId": 2, "limits": [{"amount": 250}], "prices": [
+                {"participantId": 2, "price": 150}, {"participantId": 1, "price": -190}]}
+        ]
+        payload = copy.deepcopy(markets_data)
+        result = {1: {"markets": []}}
+        special_markets = {2: {"id": 2, "description": "Player (Double+Double)"}}
+        process_markets(markets_data, result, special_markets)
+
+        self.assertEqual(markets_data, payload)
+        self.assertEqual(result[1]["markets"], [{"description": "handicap", "limit": 3000, "prices": [
+            {"price": -110, "handicap": -1.5, "team": "home"}, {"price": -110, "handicap": 1.5, "team": "away"}]}])
+        self.assertEqual(special_markets[2]["prices"], [
+            {"price": -190, "designation": "yes"}, {"price": 150, "designation": "no"}])
+
 
 if __name__ == '__main__':
     unittest.main()
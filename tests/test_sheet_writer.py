@@ -0,0 +1,102 @@
+import threading
+import unittest
+from src.bet_sinks import SheetsSink
+from src.sheet_writer import SheetWriter
+
+
+class FakeWorksheet:
+    """
+    The part of a gspread worksheet the writer uses, kept in memory.
+    """
+
+    def __init__(self, rows=(), failures=()):
+        self.rows = [list(row) for row in rows]
+        self.failures = list(failures)  # method names that raise once, in order
+        self.calls = []
+
+    def _call(self, name):
+        self.calls.append(name)
+        if self.failures and self.failures[0] == name:
+            self.failures.pop(0)
+            raise ConnectionError(f"{name} failed")
+
+    def append_rows(self, values, value_input_option=None):
+        self._call("append_rows")
+        self.rows.extend(list(row) for row in values)
+
+    def col_values(self, column):
+        self._call("col_values")
+        values = [row[column - 1] if len(row) >= column else "" for row in self.rows]
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def batch_update(self, data):
+        self._call("batch_update")
+        for update in data:
+            first, last = update["range"].split(":")
+            column = ord(first[0]) - ord("A") + 1
+            for offset, (value,) in enumerate(update["values"]):
+                row = self.rows[int(first[1:]) - 1 + offset]
+                row.extend([""] * (column - len(row)))
+                row[column - 1] = value
+
+
+class TestSheetWriter(unittest.TestCase):
+
+    def make_writer(self, worksheet, **kwargs):
+        connections = []
+
+        def connect():
+            connections.append(worksheet)
+            return worksheet
+
+        writer = SheetWriter(SheetsSink(connect), batch_delay=0, sleep=lambda seconds: None, **kwargs)
+        return writer, connections
+
+    def test_batch_tracks_next_row(self):
+        worksheet = FakeWorksheet(rows=[["Date"] * 8])
+        # The batch delay lasts until both bets are queued
+        queued = threading.Event()
+        writer = SheetWriter(SheetsSink(lambda: worksheet), batch_delay=1, sleep=lambda seconds: queued.wait(5))
+        writer.write("a", ["1/31", "A @ B"], "NBA")
+        writer.write("b", ["1/31", "C @ D"], "NHL")
+        queued.set()
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(worksheet.calls, ["append_rows", "col_values", "batch_update"])
+        writer.write("c", ["2/1", "E @ F"], "MLB")
+        self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual([row[7] for row in worksheet.rows], ["Date", "NBA", "NHL", "MLB"])
+        self.assertEqual(worksheet.rows[3][:2], ["2/1", "E @ F"])
+        # The column is read once; the next row is tracked after that
+        self.assertEqual(worksheet.calls.count("col_values"), 1)
+        self.assertEqual([(result.token, result.error) for result in writer.poll()],
+                         [("a", None), ("b", None), ("c", None)])
+        self.assertEqual(writer.poll(), [])
+
+    def test_retry_does_not_append_twice(self):
+        worksheet = FakeWorksheet(failures=["batch_update"])
+        writer, connections = self.make_writer(worksheet)
+        writer.write("a", ["1/31", "A @ B"], "NBA")
+        self.assertTrue(writer.flush(timeout=5))
+
+        self.assertEqual(worksheet.rows, [["1/31", "A @ B", "", "", "", "", "", "NBA"]])
+        self.assertEqual(worksheet.calls.count("append_rows"), 1)
+        self.assertEqual(len(connections), 2)
+        self.assertIsNone(writer.poll()[0].error)
+
+    def test_failure_is_reported(self):
+        worksheet = FakeWorksheet(failures=["append_rows"] * 2)
+        writer, _ = self.make_writer(worksheet, attempts=2)
+        writer.write("a", ["1/31", "A @ B"], "NBA")
+        self.assertTrue(writer.flush(timeout=5))
+
+        result, = writer.poll()
+        self.assertEqual(result.token, "a")
+        self.assertIsInstance(result.error, ConnectionError)
+        self.assertEqual(worksheet.rows, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from src.snapshot_store import SnapshotStore
+
+PINNACLE = {
+    1: {"name": "Away @ Home", "markets": [
+        {"description": "moneyline", "limit": 1000,
+         "prices": [{"designation": "home", "price": -120}, {"designation": "away", "price": 100}]},
+        {"description": "handicap", "limit": 500,
+         "prices": [{"team": "home", "handicap": -1.5, "price": 110}, {"team": "away", "handicap": 1.5, "price": -130}]},
+        {"description": "team total", "team": "home", "threshold": 3.5, "limit": 250,
+         "prices": [{"designation": "over", "points": 3.5, "price": -105}, {"designation": "under", "points": 3.5, "price": -115}]},
+        {"id": 11, "description": "Player (Goals)"},
+    ]},
+}
+
+
+def fanduel(odds):
+    return {7: {"name": "Away @ Home", "league": "NHL", "markets": [
+        {"marketType": "MONEY_LINE", "externalMarketId": "42.1", "runners": [
+            {"selectionId": 1, "handicap": 0, "runnerName": "Home", "winRunnerOdds": odds},
+            {"selectionId": 2, "handicap": 0, "runnerName": "Away", "winRunnerOdds": 105}]}]}}
+
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SnapshotStore(":memory:", full_cycles=2, clock=lambda: 1_000_000.0)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_cycle_is_flattened_into_rows(self):
+        self.store.add("NHL", PINNACLE, fanduel(-125))
+        cycle = self.store.commit()
+        self.assertEqual(self.store.cycles(), [(cycle, 1_000_000.0, 0)])
+        rows = self.store.rows(cycle)
+        self.assertEqual(len(rows), 8)
+        self.assertIn((cycle, "pinnacle", "NHL", "Away @ Home", "handicap", "away", 1.5, -130, 500.0), rows)
+        self.assertIn((cycle, "pinnacle", "NHL", "Away @ Home", "team total", "home under", 3.5, -115, 250.0), rows)
+        self.assertIn((cycle, "fanduel", "NHL", "Away @ Home", "MONEY_LINE", "Home", 0, -125, None), rows)
+        self.assertEqual(len(self.store.rows(market="moneyline")), 2)
+        self.assertEqual(len(self.store.rows(event="Away @ Home")), 8)
+
+    def test_nothing_added_writes_nothing(self):
+        self.assertIsNone(self.store.commit())
+        self.assertEqual(self.store.cycles(), [])
+
+    def test_old_cycles_keep_only_changes(self):
+        for odds in (-125, -125, -130, -130, -130):
+            self.store.add("NHL", PINNACLE, fanduel(odds))
+            self.store.commit()
+        self.assertEqual([compacted for _, _, compacted in self.store.cycles()], [1, 1, 1, 0, 0])
+        # The first cycle keeps everything, the next two only the FanDuel price that moved
+        self.assertEqual(len(self.store.rows(1)), 8)
+        self.assertEqual(len(self.store.rows(2)), 0)
+        self.assertEqual([row[7] for row in self.store.rows(3)], [-130])
+        self.assertEqual(len(self.store.rows(4)), 8)
+
+    def test_full_detail_cycles_have_a_row_per_selection_seen(self):
+        self.store.add("NHL", PINNACLE, fanduel(-125))
+        self.store.commit()
+        # Pinnacle's selections weren't seen, FanDuel's didn't move
+        self.store.add("NHL", {}, fanduel(-125))
+        cycle = self.store.commit()
+        self.assertEqual(self.store.rows(cycle), [
+            (cycle, "fanduel", "NHL", "Away @ Home", "MONEY_LINE", "Home", 0, -125, None),
+            (cycle, "fanduel", "NHL", "Away @ Home", "MONEY_LINE", "Away", 0, 105, None)])
+        self.assertEqual(self.store.rows(cycle, market="moneyline"), [])
+        self.assertEqual([row[0] for row in self.store.rows(market="MONEY_LINE")], [1, 1, cycle, cycle])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["tkinter", "requests", "gspread", "oauth2client", "plyer", "multiprocessing"]
+
+
+def loaded_modules(module):
+    """
+    Returns the heavy modules importing a module loads, in a fresh interpreter.
+    """
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                          check=True).stdout.split()
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_headless_scan_loads_no_gui_or_network(self):
+        self.assertEqual(loaded_modules("goodbets"), [])
+
+    def test_gui_loads_only_tkinter(self):
+        self.assertEqual(loaded_modules("main"), ["tkinter"])
+
+
+if __name__ == '__main__':
+    unittest.main()
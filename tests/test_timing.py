@@ -0,0 +1,72 @@
+import threading
+import unittest
+from src import timing
+from src.timing import NO_SPAN, StageTimer, timed
+
+
+class TestStageTimer(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.timer = StageTimer(enabled=True, clock=lambda: self.now)
+
+    def run_span(self, stage, seconds, league=None):
+        with self.timer.span(stage, league):
+            self.now += seconds
+
+    def test_spans_add_up_per_league_and_stage(self):
+        self.run_span("fetch", 0.5, "NBA")
+        self.run_span("fetch", 0.25, "NBA")
+        with self.timer.league("NHL"):
+            self.run_span("parse", 0.125)
+        self.run_span("render", 0.0625)
+        self.assertEqual(self.timer.totals(), {("NBA", "fetch"): (0.75, 2), ("NHL", "parse"): (0.125, 1),
+                                               (None, "render"): (0.0625, 1)})
+        self.timer.reset()
+        self.assertEqual(self.timer.totals(), {})
+
+    def test_current_league_is_per_thread(self):
+        with self.timer.league("NBA"):
+            thread = threading.Thread(target=self.run_span, args=("render", 1.0))
+            thread.start()
+            thread.join()
+        self.assertEqual(self.timer.totals(), {(None, "render"): (1.0, 1)})
+
+    def test_disabled_timer_records_nothing(self):
+        self.timer.enabled = False
+        self.assertIs(self.timer.span("fetch"), NO_SPAN)
+        self.assertIs(self.timer.league("NBA"), NO_SPAN)
+        self.run_span("fetch", 1.0, "NBA")
+        self.assertEqual(self.timer.totals(), {})
+
+    def test_summary(self):
+        self.run_span("parse", 0.002, "NBA")
+        self.run_span("fetch", 0.010, "NBA")
+        self.run_span("fetch", 0.020, "EUROLEAGUE")
+        self.run_span("custom", 0.001, "EUROLEAGUE")
+        lines = self.timer.summary().splitlines()
+        self.assertEqual(lines[0].split(), ["league", "fetch", "parse", "custom", "total"])
+        self.assertEqual(lines[1].split(), ["NBA", "10.0", "2.0", "0.0", "12.0"])
+        self.assertEqual(lines[2].split(), ["EUROLEAGUE", "20.0", "0.0", "1.0", "21.0"])
+        self.assertEqual(lines[3].split(), ["total", "30.0", "2.0", "1.0", "33.0"])
+
+    def test_timed_uses_the_process_timer(self):
+        timer = timing.TIMER
+        timing.TIMER = self.timer
+        try:
+            @timed("match")
+            def match(value):
+                self.now += 1.0
+                return value
+
+            with self.timer.league("NBA"):
+                self.assertEqual(match(3), 3)
+            self.timer.enabled = False
+            self.assertEqual(match(4), 4)
+        finally:
+            timing.TIMER = timer
+        self.assertEqual(self.timer.totals(), {("NBA", "match"): (1.0, 1)})
+
+
+if __name__ == '__main__':
+    unittest.main()
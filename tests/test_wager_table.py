@@ -0,0 +1,86 @@
+import unittest
+from src.devig import DevigMethod, american_to_probability, devig, devig3
+from src.wager import Draw, Moneyline, OverUnder, PlayerProps, StatCategory, TotalPoints, wager_key_str
+from src.wager_table import WagerTable, MONEYLINE, DRAW
+
+
+class TestWagerTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = WagerTable()
+        self.table.add_moneyline("Away @ Home", -150, -200, 5000, "Home", "Away", 170, 0, "42.1", 11, "NBA")
+        self.table.add_moneyline("Away @ Home", 130, 170, 5000, "Away", "Home", -200, 0, "42.1", 12, "NBA")
+        self.table.add_draw("Home v Away", 260, 240, 150, 180, 3000, "42.2", 13, "EPL")
+        self.table.add_total_points("Away @ Home", -110, -105, 2000, OverUnder.OVER, 221.5, -115, "42.3", 14, "NBA")
+        self.table.add_player_props("Away @ Home", None, 110, 250, "Player", StatCategory.POINTS, OverUnder.OVER, 25,
+                                    -140, "42.4", 15, "NBA")
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 5)
+        self.assertEqual(list(self.table.market_type[:3]), [MONEYLINE, MONEYLINE, DRAW])
+        self.assertEqual(self.table.leagues, ["NBA", "EPL"])
+        self.assertEqual(list(self.table.league), [0, 0, 1, 0, 0])
+
+    def test_find_league_code(self):
+        self.assertEqual(self.table.find_league_code("EPL"), 1)
+        self.assertIsNone(self.table.find_league_code("NHL"))
+        self.assertEqual(self.table.leagues, ["NBA", "EPL"])
+
+    def test_wager_materializes_row(self):
+        moneyline = self.table.wager(0)
+        self.assertIsInstance(moneyline, Moneyline)
+        self.assertEqual(moneyline.pretty(), "Home Moneyline Away @ Home")
+        self.assertEqual((moneyline.fanduel_odds, moneyline.pinnacle_limit, moneyline.selection_id), (-150, 5000, 11))
+
+        draw = self.table.wager(2)
+        self.assertIsInstance(draw, Draw)
+        self.assertEqual((draw.pinnacle_home_odds, draw.pinnacle_away_odds), (150, 180))
+
+        total = self.table.wager(3)
+        self.assertIsInstance(total, TotalPoints)
+        self.assertEqual((total.over_under, total.value), (OverUnder.OVER, 221.5))
+
+        props = self.table.wager(4)
+        self.assertIsInstance(props, PlayerProps)
+        self.assertIsNone(props.fanduel_odds)
+        self.assertEqual(props.pretty(), "Player 25+ Points Away @ Home")
+
+    def test_key(self):
+        for i in range(len(self.table)):
+            self.assertEqual(self.table.key(i), self.table.wager(i).key)
+        self.assertEqual(self.table.wager(0).key, ("42.1", 11, None))
+        self.assertEqual(wager_key_str(self.table.key(0)), "42.1:11")
+        self.assertEqual(wager_key_str(self.table.key(3)), "42.3:14:221.5")
+        self.assertEqual(wager_key_str(self.table.key(4)), "42.4:15:25")
+        self.assertEqual(self.table.keys(), [self.table.key(i) for i in range(len(self.table))])
+        self.assertEqual(wager_key_str(self.table.wager(4).key), "42.4:15:25")
+
+    def test_evaluate(self):
+        self.table.evaluate(DevigMethod.POWER)
+        true_prob = devig(-200, 170, DevigMethod.POWER)
+        self.assertAlmostEqual(self.table.fair_prob[0], true_prob)
+        self.assertAlmostEqual(self.table.fair_prob[2], devig3(240, 150, 180, DevigMethod.POWER))
+        implied = american_to_probability(-150)
+        self.assertAlmostEqual(self.table.ev[0], (true_prob - implied) / implied * 100)
+        # Rows without FanDuel odds are never positive EV
+        self.assertEqual(self.table.ev[4], 0)
+        self.assertNotIn(4, self.table.positive_ev())
+
+    def test_evaluate_rows(self):
+        self.table.evaluate(DevigMethod.POWER)
+        full = list(self.table.ev)
+        self.table.evaluate(DevigMethod.POWER, rows=[0, 2])
+        self.assertEqual(list(self.table.ev), [full[0], 0, full[2], 0, 0])
+
+    def test_ranked_bets(self):
+        self.table.evaluate(DevigMethod.POWER)
+        indices = self.table.ranked(self.table.positive_ev())
+        risks = [self.table.risk[i] for i in indices]
+        self.assertEqual(risks, sorted(risks, reverse=True))
+        for wager, ev, risk_percentage in self.table.bets(indices):
+            self.assertGreater(ev, 0)
+            self.assertLessEqual(risk_percentage, 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()